@@ -0,0 +1,106 @@
+import argparse
+import csv
+import json
+
+"""
+Compares gas reports written by the Python test suites when run with GAS_REPORT=1:
+v3-core/brownie_tests/gas_report.json
+v3-core/ape_tests/gas_report.json
+v3-core/wake_tests/gas_report.json
+
+Each report maps a function signature to its calls, min, max and avg gas used.
+Prints avg gas per function for every framework and flags functions whose
+avg gas differs between frameworks.
+"""
+
+DEFAULT_REPORTS = [
+    "brownie=v3-core/brownie_tests/gas_report.json",
+    "ape=v3-core/ape_tests/gas_report.json",
+    "wake=v3-core/wake_tests/gas_report.json",
+]
+
+
+def load_reports(reports):
+    """
+    Loads reports given as framework=path pairs.
+    """
+    loaded = {}
+    for report in reports:
+        framework, path = report.split("=", 1)
+        with open(path, "r") as f:
+            loaded[framework] = json.load(f)
+    return loaded
+
+
+def compare_reports(reports):
+    """
+    Returns rows of (function, {framework: avg gas}, max spread between frameworks)
+    """
+    functions = sorted(set().union(*(report.keys() for report in reports.values())))
+    rows = []
+    for function in functions:
+        gas = {
+            framework: report[function]["avg"]
+            for framework, report in reports.items()
+            if function in report
+        }
+        spread = max(gas.values()) - min(gas.values())
+        rows.append((function, gas, spread))
+    return rows
+
+
+def print_comparison(frameworks, rows):
+    """
+    Prints the comparison in Markdown format to stdout. Prints out frameworks in columns, functions in rows.
+    """
+    print("| function |", end="")
+    for framework in frameworks:
+        print(f" {framework} |", end="")
+    print(" spread |")
+    print("| --- |", end="")
+    for _ in frameworks:
+        print(" --- |", end="")
+    print(" --- |")
+    for function, gas, spread in rows:
+        print(f"| {function} |", end="")
+        for framework in frameworks:
+            print(f" {gas.get(framework, '-')} |", end="")
+        print(f" {spread} |")
+
+
+def write_comparison(frameworks, rows, file):
+    """
+    Writes the comparison to csv file
+    """
+    with open(file, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["function"] + frameworks + ["spread"])
+        for function, gas, spread in rows:
+            writer.writerow(
+                [function]
+                + [gas.get(framework, "") for framework in frameworks]
+                + [spread]
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "reports",
+        nargs="*",
+        default=DEFAULT_REPORTS,
+        help="gas reports as framework=path pairs",
+    )
+    parser.add_argument(
+        "--output", default="gas_comparison.csv", help="csv file to write"
+    )
+    args = parser.parse_args()
+
+    reports = load_reports(args.reports)
+    rows = compare_reports(reports)
+    print_comparison(list(reports), rows)
+    write_comparison(list(reports), rows, args.output)
+
+
+if __name__ == "__main__":
+    main()
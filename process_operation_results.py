@@ -0,0 +1,134 @@
+import argparse
+import csv
+
+from process_results import NETWORK_REPLACEMENTS
+
+"""
+Processes the operation timings collected by test_projects.py from the benchmark
+reports of the operation benchmarks (OPERATION_BENCHMARK_REPEATS), csv with the format
+framework,network,operation,count,total seconds:
+wake,anvil,call balanceOf,1000,0.41
+wake,anvil,deploy TestERC20,1000,2.93
+
+Computes mean latency and operations per second of every operation for each
+framework/network combination over all runs, and the time saved by the fast revert
+assertions of the revert benchmarks (REVERT_BENCHMARK_REPEATS)
+"""
+
+
+def load_operation_results(file):
+    """
+    Loads operation results from csv file and sums counts and times of all runs
+    """
+    results = {}
+    with open(file, newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        for row in reader:
+            if not row:
+                continue
+            framework, network, operation, count, total = row
+            network = NETWORK_REPLACEMENTS.get(network, network)
+            key = (f"{framework} {network}", operation)
+            runs_count, runs_total = results.get(key, (0, 0.0))
+            results[key] = (runs_count + int(count), runs_total + float(total))
+    return results
+
+
+def process_operation_results(results):
+    """
+    Returns {operation: {framework network: {"mean": seconds, "per_second": ops}}}
+    """
+    processed = {}
+    for (cell, operation), (count, total) in results.items():
+        processed.setdefault(operation, {})[cell] = {
+            "mean": total / count,
+            "per_second": count / total,
+        }
+    return processed
+
+
+def print_operation_results(processed):
+    """
+    Prints operations in rows and framework/network combinations in columns with values
+    being the mean latency in milliseconds with operations per second in parentheses
+    """
+    cells = sorted({cell for values in processed.values() for cell in values})
+    print("| operation |", end="")
+    for cell in cells:
+        print(f" {cell} |", end="")
+    print("")
+    print("| --- |", end="")
+    for _ in cells:
+        print(" --- |", end="")
+    print("")
+    for operation in sorted(processed):
+        print(f"| {operation} |", end="")
+        for cell in cells:
+            if cell in processed[operation]:
+                values = processed[operation][cell]
+                print(f" {values['mean'] * 1000:.3f} ({values['per_second']:.1f}) |", end="")
+            else:
+                print(" - |", end="")
+        print("")
+
+
+def print_revert_savings(processed):
+    """
+    Prints the revert benchmark cases in rows and framework/network combinations in
+    columns with values being the time saved by the fast revert assertion in milliseconds
+    with the share of the revert assertion of the framework in parentheses
+    """
+    cases = sorted(operation[len("framework revert "):] for operation in processed if operation.startswith("framework revert "))
+    cases = [case for case in cases if f"fast revert {case}" in processed]
+    if not cases:
+        return
+    cells = sorted({cell for case in cases for cell in processed[f"framework revert {case}"]})
+    print("")
+    print("| revert (saved) |", end="")
+    for cell in cells:
+        print(f" {cell} |", end="")
+    print("")
+    print("| --- |", end="")
+    for _ in cells:
+        print(" --- |", end="")
+    print("")
+    for case in cases:
+        print(f"| {case} |", end="")
+        for cell in cells:
+            framework = processed[f"framework revert {case}"].get(cell)
+            fast = processed[f"fast revert {case}"].get(cell)
+            if framework and fast:
+                saved = framework["mean"] - fast["mean"]
+                print(f" {saved * 1000:.3f} ({saved / framework['mean'] * 100:.1f} %) |", end="")
+            else:
+                print(" - |", end="")
+        print("")
+
+
+def write_operation_results(processed, file):
+    """
+    Writes processed operation results to csv file
+    """
+    with open(file, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["operation", "framework network", "mean", "per_second"])
+        for operation in sorted(processed):
+            for cell, values in processed[operation].items():
+                writer.writerow([operation, cell, values["mean"], values["per_second"]])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("file", nargs="?", default="operation_results.csv", help="file to process")
+    parser.add_argument("--output", default="processed_operation_results.csv", help="csv file to write")
+    args = parser.parse_args()
+
+    results = load_operation_results(args.file)
+    processed = process_operation_results(results)
+    print_operation_results(processed)
+    print_revert_savings(processed)
+    write_operation_results(processed, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import csv
+import re
 import statistics
 import argparse
 
@@ -9,30 +10,41 @@ brownie,anvil,35.53314709663391
 brownie,development,54.45306158065796
 brownie,development,53.407734870910645
 
+Rows of configurations run with multiple workers have the worker count in a 4th column,
+their framework is labeled e.g. "wake x4":
+wake,anvil,12.354660177230835,4
+
 Computes avg, median, and stdev for each framework/network combination
 """
 
+# operation types of the operation benchmarks that the suite time model is built from
+OPERATION_TYPES = ["deploy", "call", "transaction", "revert", "time travel"]
+
+NETWORK_REPLACEMENTS = {
+    "development": "ganache",
+    "ethereum:local:foundry": "anvil",
+    "ethereum:local:hardhat": "hardhat",
+    "ethereum:local:ganache": "ganache"
+}
+
+WORKERS_LABEL = re.compile(r"(.*) x(\d+)")
+
 
 def load_results(file):
     """
     Loads results from csv file.
     """
-    replacements_dir = {
-        "development": "ganache",
-        "ethereum:local:foundry": "anvil",
-        "ethereum:local:hardhat": "hardhat",
-        "ethereum:local:ganache": "ganache"
-    }
-
     results = []
     with open(file, newline="") as csvfile:
         reader = csv.reader(csvfile)
         for row in reader:
             if not row:
                 continue
-            framework, network, time = row
-            if network in replacements_dir:
-                network = replacements_dir[network]
+            framework, network, time = row[:3]
+            if len(row) > 3:
+                framework = f"{framework} x{row[3]}"
+            if network in NETWORK_REPLACEMENTS:
+                network = NETWORK_REPLACEMENTS[network]
             results.append((framework, network, time))
     return results
 
@@ -66,7 +78,8 @@ def print_results(processed_res):
     values being the avg times with stdev in parentheses.
     """
     frameworks = list(processed_res.keys())
-    networks = list(processed_res[frameworks[0]].keys())
+    # not every framework is run on every network, e.g. the networks of the labels
+    networks = list(dict.fromkeys(network for framework in frameworks for network in processed_res[framework]))
     print("| / |", end="")
     for framework in frameworks:
         print(f" {framework} |", end="")
@@ -78,8 +91,230 @@ def print_results(processed_res):
     for network in networks:
         print(f"| {network} |", end="")
         for framework in frameworks:
-            print(f" {processed_res[framework][network]['avg']:.2f} ({processed_res[framework][network]['stdev']:.2f}) |", end="")
+            if network in processed_res[framework]:
+                print(f" {processed_res[framework][network]['avg']:.2f} ({processed_res[framework][network]['stdev']:.2f}) |", end="")
+            else:
+                print(" - |", end="")
+        print("")
+
+def print_overhead(processed_res, baseline):
+    """
+    Prints avg times of the frameworks as multiples of the avg time of the baseline
+    framework on the same network in Markdown format to stdout
+    """
+    if baseline not in processed_res:
+        print("")
+        print(f"No results of the baseline {baseline}, the overhead is not printed")
+        return
+    frameworks = [framework for framework in processed_res if framework != baseline]
+    networks = list(processed_res[baseline].keys())
+    print("")
+    print(f"| / (x {baseline}) |", end="")
+    for framework in frameworks:
+        print(f" {framework} |", end="")
+    print("")
+    print("| --- |", end="")
+    for _ in frameworks:
+        print(" --- |", end="")
+    print("")
+    for network in networks:
+        print(f"| {network} |", end="")
+        for framework in frameworks:
+            if network in processed_res[framework]:
+                ratio = processed_res[framework][network]['avg'] / processed_res[baseline][network]['avg']
+                print(f" {ratio:.2f} |", end="")
+            else:
+                print(" - |", end="")
+        print("")
+
+
+def print_scaling(processed_res):
+    """
+    Prints the speedup of the runs with multiple workers over the single worker run of
+    the same framework and network with the parallel efficiency (speedup / workers) in
+    parentheses in Markdown format to stdout
+    """
+    runs = {}
+    for label in processed_res:
+        match = WORKERS_LABEL.fullmatch(label)
+        if match:
+            runs.setdefault(match.group(1), {})[int(match.group(2))] = label
+    columns = [(framework, workers) for framework in runs for workers in sorted(runs[framework]) if workers > 1 and 1 in runs[framework]]
+    if not columns:
+        return
+    networks = sorted({network for framework, _ in columns for network in processed_res[runs[framework][1]]})
+    print("")
+    print("| / (speedup) |", end="")
+    for framework, workers in columns:
+        print(f" {framework} x{workers} |", end="")
+    print("")
+    print("| --- |", end="")
+    for _ in columns:
+        print(" --- |", end="")
+    print("")
+    for network in networks:
+        print(f"| {network} |", end="")
+        for framework, workers in columns:
+            single = processed_res[runs[framework][1]].get(network)
+            parallel = processed_res[runs[framework][workers]].get(network)
+            if single and parallel:
+                speedup = single['avg'] / parallel['avg']
+                print(f" {speedup:.2f} ({speedup / workers * 100:.0f} %) |", end="")
+            else:
+                print(" - |", end="")
+        print("")
+
+
+def load_operation_costs(file):
+    """
+    Loads mean latency in seconds of each operation type for every framework/network
+    combination from the operation benchmark results (framework,network,operation,count,total).
+    The cost of a type is the mean over its benchmarked operations, e.g. both deploys.
+    """
+    sums = {}
+    with open(file, newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        for row in reader:
+            if not row:
+                continue
+            framework, network, operation, count, total = row
+            network = NETWORK_REPLACEMENTS.get(network, network)
+            operation_type = next((t for t in OPERATION_TYPES if operation == t or operation.startswith(f"{t} ")), None)
+            if operation_type is None:
+                continue
+            key = (framework, network, operation_type, operation)
+            runs_count, runs_total = sums.get(key, (0, 0.0))
+            sums[key] = (runs_count + int(count), runs_total + float(total))
+    latencies = {}
+    for (framework, network, operation_type, _), (count, total) in sums.items():
+        latencies.setdefault((framework, network), {}).setdefault(operation_type, []).append(total / count)
+    return {
+        cell: {operation_type: statistics.mean(values) for operation_type, values in types.items()}
+        for cell, types in latencies.items()
+    }
+
+
+def load_operation_counts(file):
+    """
+    Loads operation counts of the suites (label,framework,network,operation,count) as
+    {(label, network): (framework, {operation type: count})}
+    """
+    counts = {}
+    with open(file, newline="") as csvfile:
+        reader = csv.reader(csvfile)
+        for row in reader:
+            if not row:
+                continue
+            label, framework, network, operation, count = row
+            network = NETWORK_REPLACEMENTS.get(network, network)
+            # the counts of a suite do not change between runs, the last one is kept
+            counts.setdefault((label, network), (framework, {}))[1][operation] = int(count)
+    return counts
+
+
+def single_worker_label(processed_res, label):
+    """
+    Key of the single worker results of a suite label in processed_res, the runs of
+    a configuration with workers are labelled "label x1", "label x2", ... The runs with
+    more workers are left out of the fit, their time is not a sum of the operations.
+    """
+    for key in (label, f"{label} x1"):
+        if key in processed_res:
+            return key
+    return None
+
+
+def fit_suite_times(processed_res, costs, counts):
+    """
+    Fits suite time = sum(operation count * operation cost) + startup. The operation
+    costs come from the operation benchmarks, the startup is fitted by least squares for
+    each framework/network combination, shared by all suites run with that framework on
+    that network. The residual of a suite is out of fit: its time minus the time predicted
+    with the startup fitted to the other suites of the combination, None for a suite run
+    alone. Returns a row for every suite with its avg time, the startup, the time explained
+    by each operation type and the residual.
+    """
+    cells = {}
+    for (label, network), (framework, operation_counts) in counts.items():
+        key = single_worker_label(processed_res, label)
+        if key is None or network not in processed_res[key] or (framework, network) not in costs:
+            continue
+        operation_times = {
+            operation_type: operation_counts.get(operation_type, 0) * costs[(framework, network)].get(operation_type, 0.0)
+            for operation_type in OPERATION_TYPES
+        }
+        cells.setdefault((framework, network), []).append((label, processed_res[key][network]['avg'], operation_times))
+    rows = []
+    for (framework, network), suites in cells.items():
+        # the least squares fit of a constant is the mean of what the operations do not explain
+        unexplained = [time - sum(operation_times.values()) for _, time, operation_times in suites]
+        startup = statistics.mean(unexplained)
+        for i, (label, time, operation_times) in enumerate(suites):
+            others = unexplained[:i] + unexplained[i + 1:]
+            rows.append({
+                "suite": label,
+                "framework": framework,
+                "network": network,
+                "time": time,
+                "startup": startup,
+                "operations": operation_times,
+                "residual": unexplained[i] - statistics.mean(others) if others else None,
+            })
+    return rows
+
+
+def print_suite_time_model(rows):
+    """
+    Prints the time explained by the startup, each operation type and the residual in
+    seconds with the share of the avg suite time in parentheses in Markdown format to stdout.
+    Without a second suite on any framework/network combination the residual column is
+    left out, the startup then absorbs all the time the operations do not explain.
+    """
+    with_residual = any(row['residual'] is not None for row in rows)
+    print("")
+    print("| suite | network | time | startup |", end="")
+    for operation_type in OPERATION_TYPES:
+        print(f" {operation_type} |", end="")
+    print(" residual |" if with_residual else "")
+    print("| --- | --- | --- | --- |", end="")
+    for _ in OPERATION_TYPES:
+        print(" --- |", end="")
+    print(" --- |" if with_residual else "")
+    for row in rows:
+        print(f"| {row['suite']} | {row['network']} | {row['time']:.2f} |", end="")
+        parts = [row['startup']] + [row['operations'][t] for t in OPERATION_TYPES]
+        for part in parts:
+            print(f" {part:.2f} ({part / row['time'] * 100:.1f} %) |", end="")
+        if with_residual:
+            if row['residual'] is None:
+                print(" underdetermined |", end="")
+            else:
+                print(f" {row['residual']:.2f} ({row['residual'] / row['time'] * 100:.1f} %) |", end="")
+        print("")
+    underdetermined = sorted({(row['framework'], row['network']) for row in rows if row['residual'] is None})
+    if underdetermined:
         print("")
+        print(
+            f"The fit is underdetermined for {', '.join(f'{framework} on {network}' for framework, network in underdetermined)}: "
+            "the startup is fitted to a single suite, so it explains the whole remaining time and there is no residual. "
+            "Run at least two suites with different operation counts per framework and network to check the model."
+        )
+
+
+def write_suite_time_model(rows, file):
+    """
+    Writes the suite time model to csv file
+    """
+    with open(file, "w", newline="") as csvfile:
+        writer = csv.writer(csvfile)
+        writer.writerow(["suite", "framework", "network", "time", "startup"] + OPERATION_TYPES + ["residual"])
+        for row in rows:
+            writer.writerow(
+                [row['suite'], row['framework'], row['network'], row['time'], row['startup']]
+                + [row['operations'][t] for t in OPERATION_TYPES]
+                + ["" if row['residual'] is None else row['residual']]
+            )
+
 
 def write_results(processed_res):
     """
@@ -96,11 +331,21 @@ def write_results(processed_res):
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("file", help="file to process")
+    parser.add_argument("--baseline", help="framework (label) whose times the other frameworks are divided by, e.g. rpc")
+    parser.add_argument("--operation-costs", help="operation benchmark results, e.g. operation_results.csv")
+    parser.add_argument("--operation-counts", help="operation counts of the suites, e.g. operation_counts.csv")
     args = parser.parse_args()
 
     res = load_results(args.file)
     processed_res = process_results(res)
     print_results(processed_res)
+    if args.baseline:
+        print_overhead(processed_res, args.baseline)
+    print_scaling(processed_res)
+    if args.operation_costs and args.operation_counts:
+        rows = fit_suite_times(processed_res, load_operation_costs(args.operation_costs), load_operation_counts(args.operation_counts))
+        print_suite_time_model(rows)
+        write_suite_time_model(rows, "suite_time_model.csv")
     write_results(processed_res)
 
 
@@ -1,14 +1,47 @@
 import csv
+import hashlib
 import json
+import os
+import re
+import shutil
 import subprocess
 import toml
 import pathlib
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 CONFIG_FILE = "test_tests_config.json"
 TEST_RUNS = 200
 RESULTS_FILE = "test_results.csv"
+OPERATION_RESULTS_FILE = "operation_results.csv"
+OPERATION_COUNTS_FILE = "operation_counts.csv"
+COMPILE_RESULTS_FILE = "compile_results.csv"
 WAKE_TOML = "wake.toml"
+# build outputs of the compile commands (by their first word) in the project, stored in the
+# cache under a hash of the sources and the compiler settings
+COMPILE_CACHE_DIR = ".compile_cache"
+BUILD_DIRS = {
+    "brownie": ["build"],
+    "ape": [".build"],
+    "wake": [".wake", "pytypes"],
+    "npx": ["artifacts", "cache"],
+}
+# files besides the sources that change the compiler output
+COMPILE_SETTINGS_FILES = {
+    "brownie": ["brownie-config.yaml"],
+    "ape": ["ape-config.yaml"],
+    "wake": ["wake.toml"],
+    "npx": ["hardhat.config.ts"],
+}
+# commands printing the versions of the framework and of the solc binaries it compiles with,
+# an upgrade of either changes the build outputs
+COMPILE_VERSION_COMMANDS = {
+    "brownie": "brownie --version && python -c 'import solcx; print(solcx.get_installed_solc_versions())'",
+    "ape": "ape --version && ape plugins list && python -c 'import solcx; print(solcx.get_installed_solc_versions())'",
+    "wake": "wake --version && wake svm list",
+    # the solc version of Hardhat is pinned in hardhat.config.ts
+    "npx": "npx hardhat --version",
+}
 
 
 def update_wake_toml(network, project_path):
@@ -31,24 +64,44 @@ def update_hardhat_config(project_path, mode):
     config_path.write_text(config)
 
 
-def run_tests(python_venv_path, command, network, framework, project_path):
-    print(f"Running {framework} {network} tests...")
+def run_tests(python_venv_path, command, network, framework, project_path, env=None, workers=1):
+    print(f"Running {framework} {network} tests with {workers} worker(s)...")
     command_with_network = f"{command} {network}"
     if framework == "wake":
         update_wake_toml(network, project_path)
         command_with_network = f"{command}"
+    if workers > 1 and framework in ["brownie", "ape"]:
+        # pytest-xdist, every worker launches its own chain, Ape on the port its conftest
+        # gives the worker
+        command_with_network = f"{command_with_network} -n {workers} --dist loadfile"
+    if env:
+        # e.g. SWAP_TESTS_SCALE to run the scaled swap tests
+        env_assignments = " ".join(f"{name}={value}" for name, value in env.items())
+        command_with_network = f"{env_assignments} {command_with_network}"
     if framework == "hardhat" and network in ["anvil", "ganache"]:
         update_hardhat_config(project_path, 'enable')
 
-    if python_venv_path:
-        source_command = f"source {python_venv_path}/bin/activate" if python_venv_path else ""
-        full_command = f"cd {project_path} && {source_command} && time {command_with_network}"
+    if framework == "wake" and workers > 1:
+        # the wake pytest plugin does not work with pytest-xdist, the suite is split into
+        # shards run by parallel processes instead, see drivers/scheduling.py
+        shard_commands = [f"SHARD_INDEX={index} SHARD_COUNT={workers} {command_with_network}" for index in range(workers)]
     else:
-        full_command = f"cd {project_path} && time {command_with_network}"
+        shard_commands = [command_with_network]
 
-    # Execute the command and capture the output
+    full_commands = []
+    for shard_command in shard_commands:
+        if python_venv_path:
+            source_command = f"source {python_venv_path}/bin/activate" if python_venv_path else ""
+            full_commands.append(f"cd {project_path} && {source_command} && time {shard_command}")
+        else:
+            full_commands.append(f"cd {project_path} && time {shard_command}")
+
+    # Execute the commands in parallel and wait for all of them
     time_before = time.time()
-    subprocess.run(full_command, shell=True, executable="/bin/bash", check=True)
+    processes = [subprocess.Popen(full_command, shell=True, executable="/bin/bash") for full_command in full_commands]
+    for full_command, process in zip(full_commands, processes):
+        if process.wait() != 0:
+            raise subprocess.CalledProcessError(process.returncode, full_command)
     time_elapsed = time.time() - time_before
 
     if framework == "hardhat" and network in ["anvil", "ganache"]:
@@ -57,56 +110,272 @@ def run_tests(python_venv_path, command, network, framework, project_path):
     return time_elapsed
 
 
-def write_data(framework, network, time):
+def write_data(framework, network, time, workers=None):
     with open(RESULTS_FILE, "a", newline="") as csvfile:
         result_writer = csv.writer(
             csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL
         )
-        result_writer.writerow([framework, network, time])
+        if workers is None:
+            result_writer.writerow([framework, network, time])
+        else:
+            result_writer.writerow([framework, network, time, workers])
 
 
-def test_configuration(configuration):
-    # Run the one-time compile command
-    compile_command = f"cd {configuration['project_path']} && {configuration['compile_command']}"
+def write_operation_data(framework, network, report_path):
+    """
+    Appends the operation timings of a benchmark report written by the run
+    """
+    with open(report_path, "r") as report_file:
+        report = json.load(report_file)
+    with open(OPERATION_RESULTS_FILE, "a", newline="") as csvfile:
+        result_writer = csv.writer(
+            csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL
+        )
+        for name, values in report.items():
+            if name.startswith("operation "):
+                result_writer.writerow([framework, network, name[len("operation "):], values["count"], values["total"]])
+
+
+def write_operation_counts(label, framework, network, counts_path):
+    """
+    Appends the operation counts of a suite run with OPERATION_COUNTS=1
+    """
+    with open(counts_path, "r") as counts_file:
+        counts = json.load(counts_file)
+    with open(OPERATION_COUNTS_FILE, "a", newline="") as csvfile:
+        result_writer = csv.writer(
+            csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL
+        )
+        for operation, count in counts["operations"].items():
+            result_writer.writerow([label, framework, network, operation, count])
+
+
+def venv_command(configuration, command):
     if 'python_venv_path' in configuration:
-        compile_command = f"cd {configuration['project_path']} && source {configuration['python_venv_path']}/bin/activate && {configuration['compile_command']}"
+        return f"cd {configuration['project_path']} && source {configuration['python_venv_path']}/bin/activate && {command}"
+    return f"cd {configuration['project_path']} && {command}"
+
+
+SOLIDITY_IMPORT = re.compile(r"""^\s*import\s+(?:[^;]*?\bfrom\s+)?["']([^"']+)["']""", re.M)
+
+
+def settings_bytes(path):
+    """
+    Contents of a compiler settings file, without the [testing] section of wake.toml that
+    update_wake_toml rewrites for every network
+    """
+    if path.name != WAKE_TOML:
+        return path.read_bytes()
+    wake_data = toml.load(path)
+    wake_data.pop("testing", None)
+    return toml.dumps(wake_data).encode()
+
+
+def import_roots(project_path):
+    """
+    Remappings (prefix, directory) and directories the non-relative imports are resolved in,
+    from wake.toml and the default node_modules
+    """
+    remappings = []
+    roots = [project_path, project_path.joinpath("node_modules")]
+    wake_toml_path = project_path.joinpath(WAKE_TOML)
+    if wake_toml_path.exists():
+        solc = toml.load(wake_toml_path).get("compiler", {}).get("solc", {})
+        for remapping in solc.get("remappings", []):
+            prefix, _, target = remapping.rpartition(":")[2].partition("=")
+            remappings.append((prefix, project_path.joinpath(target)))
+        roots += [project_path.joinpath(path) for path in solc.get("include_paths", [])]
+    return remappings, roots
+
+
+def solidity_sources(project_path):
+    """
+    Sources in contracts and every source they import, directly or not, also from outside
+    of contracts, e.g. node_modules
+    """
+    remappings, roots = import_roots(project_path)
+    sources = set()
+    pending = sorted(project_path.joinpath("contracts").rglob("*.sol"))
+    while pending:
+        path = pending.pop().resolve()
+        if path in sources or not path.exists():
+            continue
+        sources.add(path)
+        for imported in SOLIDITY_IMPORT.findall(path.read_text()):
+            if imported.startswith("."):
+                pending.append(path.parent.joinpath(imported))
+                continue
+            candidates = [target.joinpath(imported[len(prefix):]) for prefix, target in remappings if imported.startswith(prefix)]
+            candidates += [root.joinpath(imported) for root in roots]
+            resolved = next((candidate for candidate in candidates if candidate.exists()), None)
+            if resolved is not None:
+                pending.append(resolved)
+    return sorted(sources)
+
 
-    subprocess.Popen(
-        compile_command,
-        shell=True,
-        executable="/bin/bash",
-    ).wait()
+def compile_key(configuration):
+    """
+    Hash of the Solidity sources with everything they import, the compile command, the
+    compiler settings and the versions of the framework and solc
+    """
+    project_path = pathlib.Path(configuration["project_path"])
+    tool = configuration["compile_command"].split()[0]
+    key = hashlib.sha256(configuration["compile_command"].encode())
+    if tool in COMPILE_VERSION_COMMANDS:
+        versions = subprocess.run(venv_command(configuration, COMPILE_VERSION_COMMANDS[tool]), shell=True, executable="/bin/bash", capture_output=True)
+        key.update(versions.stdout)
+    for path in solidity_sources(project_path):
+        key.update(os.path.relpath(path, project_path.resolve()).encode())
+        key.update(path.read_bytes())
+    for name in COMPILE_SETTINGS_FILES.get(tool, []):
+        path = project_path.joinpath(name)
+        if path.exists():
+            key.update(name.encode())
+            key.update(settings_bytes(path))
+    return key.hexdigest()
 
+
+def compile_configuration(configuration):
+    """
+    Restores the build outputs of the compile command from the cache, or runs the command
+    and stores its outputs. Returns the elapsed time and whether the cache was used.
+    """
+    project_path = pathlib.Path(configuration["project_path"])
+    tool = configuration["compile_command"].split()[0]
+    build_dirs = BUILD_DIRS.get(tool, [])
+    cache_path = project_path.joinpath(COMPILE_CACHE_DIR, f"{tool}-{compile_key(configuration)}")
+
+    time_before = time.time()
+    if build_dirs and cache_path.exists():
+        for build_dir in build_dirs:
+            shutil.rmtree(project_path.joinpath(build_dir), ignore_errors=True)
+            if cache_path.joinpath(build_dir).exists():
+                shutil.copytree(cache_path.joinpath(build_dir), project_path.joinpath(build_dir), symlinks=True)
+        return time.time() - time_before, True
+
+    compile_command = venv_command(configuration, configuration["compile_command"])
+    subprocess.run(compile_command, shell=True, executable="/bin/bash", check=True)
+    time_elapsed = time.time() - time_before
+
+    # stored under a temporary name first so that an interrupted copy is never restored
+    partial_path = cache_path.with_name(f"{cache_path.name}.partial")
+    shutil.rmtree(partial_path, ignore_errors=True)
+    for build_dir in build_dirs:
+        if project_path.joinpath(build_dir).exists():
+            shutil.copytree(project_path.joinpath(build_dir), partial_path.joinpath(build_dir), symlinks=True)
+    if partial_path.exists():
+        partial_path.rename(cache_path)
+    return time_elapsed, False
+
+
+def compile_group(configurations):
+    return [compile_configuration(configuration) for configuration in configurations]
+
+
+def compile_configurations(configurations):
+    """
+    Runs the compile commands of all configurations, each distinct command only once, and
+    appends their times to the compile results. Commands of different tools run in parallel,
+    the commands of one tool in a project one after another since they write the same build
+    directories.
+    """
+    unique = {}
+    for configuration in configurations:
+        key = (configuration["project_path"], configuration["compile_command"], configuration.get("python_venv_path"))
+        unique.setdefault(key, configuration)
+    if not unique:
+        return
+    groups = {}
+    for configuration in unique.values():
+        tool = configuration["compile_command"].split()[0]
+        groups.setdefault((configuration["project_path"], tool), []).append(configuration)
+    with ThreadPoolExecutor(max_workers=len(groups)) as executor:
+        group_results = list(executor.map(compile_group, groups.values()))
+    with open(COMPILE_RESULTS_FILE, "a", newline="") as csvfile:
+        result_writer = csv.writer(
+            csvfile, delimiter=",", quotechar="|", quoting=csv.QUOTE_MINIMAL
+        )
+        for group, results in zip(groups.values(), group_results):
+            for configuration, (elapsed_time, cached) in zip(group, results):
+                print(f"Compiled {configuration['framework']} in {elapsed_time:.2f} s{' (cached)' if cached else ''}")
+                result_writer.writerow([configuration["framework"], configuration["compile_command"], elapsed_time, cached])
+
+
+def test_configuration(configuration):
     for network in configuration["networks"]:
         venv_path = None
         if "python_venv_path" in configuration:
             venv_path = configuration["python_venv_path"]
 
+        # e.g. "wake_tests/operation_counts.json", the requests are counted only in the
+        # dry run so that the counting does not affect the measured times
+        dry_run_env = configuration.get("env")
+        counts_path = None
+        if "operation_counts" in configuration:
+            dry_run_env = {**(dry_run_env or {}), "OPERATION_COUNTS": "1"}
+            counts_path = pathlib.Path(configuration["project_path"]).joinpath(configuration["operation_counts"])
+            counts_path.unlink(missing_ok=True)
+        # e.g. "wake_tests/test_durations.json", the test durations are recorded per network
+        # in the single worker dry run and schedule the modules of the runs with multiple workers
+        run_env = configuration.get("env")
+        if "test_durations" in configuration:
+            durations_path = pathlib.Path(configuration["test_durations"])
+            durations_path = durations_path.with_name(f"{durations_path.stem}.{network.replace(':', '_')}{durations_path.suffix}")
+            dry_run_env = {**(dry_run_env or {}), "TEST_DURATIONS_FILE": str(durations_path), "TEST_DURATIONS_RECORD": "1"}
+            run_env = {**(run_env or {}), "TEST_DURATIONS_FILE": str(durations_path)}
         run_tests(
             venv_path,
             configuration["command"],
             network,
             configuration["framework"],
             configuration["project_path"],
+            dry_run_env,
         )  # dry run
-        for _ in range(TEST_RUNS):
-            elapsed_time = run_tests(
-                venv_path,
-                configuration["command"],
-                network,
+        if counts_path is not None and counts_path.exists():
+            write_operation_counts(
+                configuration.get("label", configuration["framework"]),
                 configuration["framework"],
-                configuration["project_path"],
-            )
-            write_data(
-                framework=configuration["framework"],
-                network=network,
-                time=elapsed_time,
+                network,
+                counts_path,
             )
+        # e.g. "wake_tests/benchmark_report.json" of the operation benchmarks
+        report_path = None
+        if "benchmark_report" in configuration:
+            report_path = pathlib.Path(configuration["project_path"]).joinpath(configuration["benchmark_report"])
+        # e.g. [1, 2, 4] to measure how the suite scales with parallel workers, each worker
+        # writes its own report (benchmark_report.gw0.json, ...) so the operation timings
+        # are collected only from the single worker runs
+        for workers in configuration.get("workers", [1]):
+            for _ in range(TEST_RUNS):
+                if report_path is not None:
+                    report_path.unlink(missing_ok=True)
+                elapsed_time = run_tests(
+                    venv_path,
+                    configuration["command"],
+                    network,
+                    configuration["framework"],
+                    configuration["project_path"],
+                    run_env,
+                    workers,
+                )
+                write_data(
+                    framework=configuration.get("label", configuration["framework"]),
+                    network=network,
+                    time=elapsed_time,
+                    workers=workers if "workers" in configuration else None,
+                )
+                if workers == 1 and report_path is not None and report_path.exists():
+                    write_operation_data(
+                        configuration["framework"],
+                        network,
+                        report_path,
+                    )
 
 
 def main():
     with open(CONFIG_FILE, "r") as config_file:
         configurations = json.load(config_file)
+    compile_configurations(configurations)
     for configuration in configurations:
         test_configuration(configuration)
 
@@ -0,0 +1,15 @@
+from driver import send_request
+from drivers.batch_setup import FixtureBatchSetup
+
+
+class ApeFixtureBatchSetup(FixtureBatchSetup):
+    def request(self, method, params=()):
+        return send_request(method, params)
+
+    def creation_code(self, contract_type):
+        return bytes.fromhex(
+            contract_type.contract_type.deployment_bytecode.bytecode[2:]
+        )
+
+
+batch_setup = ApeFixtureBatchSetup()
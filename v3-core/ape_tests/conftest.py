@@ -0,0 +1,210 @@
+import os
+import sys
+import time
+from pathlib import Path
+
+import ape
+import pytest
+
+# the framework-neutral drivers package lives in the project root, which ape does not
+# put on sys.path, the suite modules below import it
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from drivers.approvals import approval_cache, format_approval_cache
+from drivers.benchmarks import format_timings, timings
+from drivers.gas import (GAS_CHECK, GAS_REPORT_ENABLED, GAS_UPDATE_BASELINE,
+                         format_gas_aggregate, format_gas_diff, gas_report,
+                         load_gas_report)
+from drivers.impact import (TEST_IMPACT_RECORD, TEST_IMPACT_SELECT,
+                            impact_recorder, load_impact_index,
+                            select_impacted)
+from drivers.node import free_port
+from drivers.scheduling import (TEST_DURATIONS_RECORD, duration_recorder,
+                                format_schedule, load_test_durations,
+                                longest_modules_first, module_durations,
+                                select_shard)
+from drivers.workers import SHARD_COUNT, worker_count, worker_id, worker_path
+from impact import IMPACT_INDEX_FILE, instrument_contracts
+from operation_counts import (OPERATION_COUNTS_ENABLED, instrument_requests,
+                              operation_counter)
+from state_image import STATE_IMAGE_ENABLED
+
+BENCHMARK_REPORT_FILE = worker_path(Path(__file__).parent / "benchmark_report.json")
+GAS_REPORT_FILE = worker_path(Path(__file__).parent / "gas_report.json")
+GAS_BASELINE_FILE = Path(__file__).parent / "__snapshots__" / "gas_baseline.json"
+
+EXTENDED_TESTS_ENABLED = os.environ.get("EXTENDED_TESTS", "") not in ("", "0")
+
+
+def use_worker_port(network):
+    """
+    Gives the provider of network, e.g. ethereum:local:foundry, a free port in place of
+    the one of ape-config.yaml, so that every pytest-xdist worker launches its own chain
+    """
+    provider_config = ape.config.get_config(network.split(":")[-1])
+    port = free_port()
+    # depending on the plugin version the provider takes the whole URI or only the port
+    if hasattr(provider_config, "host"):
+        provider_config.host = f"http://127.0.0.1:{port}"
+    else:
+        provider_config.port = port
+
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers",
+        "extended: ported tests outside of the measured suite, run with EXTENDED_TESTS=1",
+    )
+    # the provider connects when the collection finishes
+    if "PYTEST_XDIST_WORKER" in os.environ:
+        use_worker_port(config.getoption("network"))
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_IMPACT_SELECT:
+        index = load_impact_index(IMPACT_INDEX_FILE)
+        if index is not None:
+            selected, config._impact_changes = select_impacted(
+                items, index, IMPACT_INDEX_FILE.parent
+            )
+            config.hook.pytest_deselected(items=list(set(items) - set(selected)))
+            items[:] = selected
+    durations = load_test_durations()
+    if SHARD_COUNT > 1:
+        selected = select_shard(items, durations)
+        config.hook.pytest_deselected(items=list(set(items) - set(selected)))
+        items[:] = selected
+    elif durations and worker_id() is not None:
+        # pytest-xdist worker
+        items[:] = longest_modules_first(items, durations)
+    if EXTENDED_TESTS_ENABLED:
+        return
+    skip_extended = pytest.mark.skip(
+        reason="extended tests run only with EXTENDED_TESTS=1"
+    )
+    for item in items:
+        if "extended" in item.keywords:
+            item.add_marker(skip_extended)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def gas_capture(chain, accounts):
+    if not GAS_REPORT_ENABLED:
+        yield
+        return
+    # receipts have to be collected before isolation reverts the test's blocks
+    histories = [chain.history[account.address] for account in accounts[:2]]
+    starts = [len(history.sessional) for history in histories]
+    yield
+    for history, start in zip(histories, starts):
+        for receipt in history.sessional[start:]:
+            if not receipt.failed:
+                gas_report.record_transaction(
+                    receipt.transaction.data,
+                    receipt.gas_used,
+                    not receipt.transaction.receiver,
+                )
+
+
+@pytest.fixture(scope="function", autouse=True)
+def approval_cache_reset():
+    yield
+    # approvals granted in the test are reverted by isolation or a new chain
+    approval_cache.clear()
+
+
+def pytest_sessionstart(session):
+    session.config._startup_time = time.perf_counter()
+    if OPERATION_COUNTS_ENABLED:
+        instrument_requests()
+    if TEST_IMPACT_RECORD:
+        instrument_contracts()
+
+
+def pytest_runtest_setup(item):
+    if TEST_IMPACT_RECORD:
+        impact_recorder.start_test(item.nodeid)
+
+
+def pytest_runtest_teardown(item):
+    if TEST_IMPACT_RECORD:
+        impact_recorder.finish_test(item.nodeid, item.fixturenames)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_fixture_setup(fixturedef, request):
+    if not TEST_IMPACT_RECORD:
+        yield
+        return
+    with impact_recorder.fixture_setup(fixturedef.argname):
+        yield
+
+
+def pytest_runtest_call(item):
+    start = getattr(item.config, "_startup_time", None)
+    if start is None:
+        return
+    # only the first test is measured, it includes the deployment or loading of fixtures
+    item.config._startup_time = None
+    timings.record(
+        "startup to first test (state image)"
+        if STATE_IMAGE_ENABLED
+        else "startup to first test",
+        time.perf_counter() - start,
+    )
+
+
+def pytest_runtest_logreport(report):
+    if TEST_DURATIONS_RECORD:
+        duration_recorder.record(report.nodeid, report.duration)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    if TEST_DURATIONS_RECORD and duration_recorder.seconds:
+        duration_recorder.write()
+    if TEST_IMPACT_RECORD and impact_recorder.tests:
+        impact_recorder.write(IMPACT_INDEX_FILE, IMPACT_INDEX_FILE.parent)
+    if timings.samples:
+        timings.write(BENCHMARK_REPORT_FILE)
+    if OPERATION_COUNTS_ENABLED:
+        operation_counter.write()
+    if not GAS_REPORT_ENABLED or not gas_report.gas_used:
+        return
+    gas_report.write(GAS_REPORT_FILE)
+    if GAS_UPDATE_BASELINE:
+        gas_report.write(GAS_BASELINE_FILE)
+    elif GAS_BASELINE_FILE.exists():
+        rows = gas_report.diff(load_gas_report(GAS_BASELINE_FILE))
+        session.config._gas_diff = rows
+        if GAS_CHECK and any(row[-1] == "regression" for row in rows):
+            session.exitstatus = pytest.ExitCode.TESTS_FAILED
+
+
+def pytest_terminal_summary(terminalreporter):
+    durations = load_test_durations()
+    count = worker_count(terminalreporter.config)
+    if durations and count > 1:
+        terminalreporter.section("test schedule")
+        terminalreporter.write_line(
+            format_schedule(module_durations(durations, durations), count)
+        )
+    changes = getattr(terminalreporter.config, "_impact_changes", None)
+    if changes is not None:
+        terminalreporter.section("test impact")
+        terminalreporter.write_line(
+            "changed since the impact index: " + (", ".join(changes) or "nothing")
+        )
+    if timings.samples:
+        terminalreporter.section("benchmark timings")
+        terminalreporter.write_line(format_timings(timings.summary()))
+    if approval_cache.sent or approval_cache.skipped:
+        terminalreporter.section("approval cache")
+        terminalreporter.write_line(format_approval_cache(approval_cache))
+    if not GAS_REPORT_ENABLED or not gas_report.gas_used:
+        return
+    terminalreporter.section("gas report")
+    terminalreporter.write_line(format_gas_aggregate(gas_report.aggregate()))
+    rows = getattr(terminalreporter.config, "_gas_diff", None)
+    if rows is not None:
+        terminalreporter.section("gas diff")
+        terminalreporter.write_line(format_gas_diff(rows))
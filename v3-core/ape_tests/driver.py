@@ -0,0 +1,45 @@
+import ape
+
+from drivers.base import Driver, normalize
+from drivers.rpc_driver import provider_request
+
+
+def send_request(method, params=()):
+    return provider_request(ape.chain.provider.web3.provider, method, params)
+
+
+class ApeDriver(Driver):
+    name = "ape"
+
+    def __init__(self, project, accounts):
+        self.project = project
+        self._accounts = accounts
+
+    @property
+    def accounts(self):
+        return self._accounts
+
+    def address(self, contract_or_account):
+        return contract_or_account.address
+
+    def deploy(self, contract_name, *args, sender):
+        return getattr(self.project, contract_name).deploy(*args, sender=sender)
+
+    def at(self, contract_name, address):
+        return getattr(self.project, contract_name).at(address)
+
+    def call(self, contract, function, *args):
+        return normalize(getattr(contract, function)(*args))
+
+    def transact(self, contract, function, *args, sender):
+        return getattr(contract, function)(*args, sender=sender)
+
+    def events(self, tx, contract, event_name):
+        return [
+            normalize(dict(log.event_arguments))
+            for log in tx.decode_logs(getattr(contract, event_name))
+            if log.contract_address == contract.address
+        ]
+
+    def reverts(self, reason=None):
+        return ape.reverts(reason)
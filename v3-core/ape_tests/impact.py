@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from ape.contracts.base import ContractContainer
+
+from drivers.impact import impact_recorder
+
+IMPACT_INDEX_FILE = Path(__file__).parent / "impact_index.json"
+
+
+def instrument_contracts():
+    """
+    Reports the contract type of every deployment of Ape and of every contract attached
+    to with ContractContainer.at to the impact recorder
+    """
+    deploy = ContractContainer.deploy
+    at = ContractContainer.at
+
+    def recorded_deploy(self, *args, **kwargs):
+        impact_recorder.used(self.contract_type.name)
+        return deploy(self, *args, **kwargs)
+
+    def recorded_at(self, *args, **kwargs):
+        impact_recorder.used(self.contract_type.name)
+        return at(self, *args, **kwargs)
+
+    ContractContainer.deploy = recorded_deploy
+    ContractContainer.at = recorded_at
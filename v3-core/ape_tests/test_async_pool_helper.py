@@ -0,0 +1,109 @@
+import os
+
+import ape
+import pytest
+
+import utils
+from drivers.async_pool_helper import AsyncPoolHelper
+from drivers.benchmarks import timings
+from drivers.rpc_driver import RpcConnection
+from utils import FeeAmount, TickSpacings
+
+# Compares the setup of initialized_pool_fixture in test_pool.py sent through PoolHelper
+# and through AsyncPoolHelper, ASYNC_POOL_HELPER_REPEATS times each.
+# Skipped by default so that the measured suite stays the same.
+ASYNC_POOL_HELPER_REPEATS = int(os.environ.get("ASYNC_POOL_HELPER_REPEATS", "0"))
+
+pytestmark = pytest.mark.skipif(
+    ASYNC_POOL_HELPER_REPEATS < 1,
+    reason="async pool helper benchmark runs only with ASYNC_POOL_HELPER_REPEATS >= 1",
+)
+
+INITIAL_PRICE = utils.encode_price_sqrt(1, 10)
+LIQUIDITY = 3161
+
+
+def deploy_pool_helper(project, wallet):
+    token0 = project.TestERC20.deploy(2**255, sender=wallet)
+    token1 = project.TestERC20.deploy(2**255, sender=wallet)
+    token0, token1 = sorted([token0, token1], key=lambda token: token.address.lower())
+    factory = project.UniswapV3Factory.deploy(sender=wallet)
+    pool = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token0, token1, factory, wallet
+    )
+    return utils.PoolHelper(
+        token0,
+        token1,
+        factory,
+        pool,
+        TickSpacings.MEDIUM,
+        project.TestUniswapV3Callee.deploy(sender=wallet),
+    )
+
+
+def pool_state(pool_helper):
+    pool = pool_helper.pool
+    return (
+        pool.slot0(),
+        pool.liquidity(),
+        pool_helper.token0.balanceOf(pool),
+        pool_helper.token1.balanceOf(pool),
+    )
+
+
+def setup_pools_async(pool_helpers, wallet):
+    uri = ape.chain.provider.web3.provider.endpoint_uri
+    connection = RpcConnection(uri)
+    try:
+        for pool_helper in pool_helpers:
+            async_pool_helper = AsyncPoolHelper(
+                connection,
+                wallet.address,
+                pool_helper.token0.address,
+                pool_helper.token1.address,
+                pool_helper.pool.address,
+                pool_helper.tick_spacing,
+                pool_helper.swap_target.address,
+            )
+            with timings.measure("initialized pool setup async"):
+                async_pool_helper.initialize(INITIAL_PRICE)
+                async_pool_helper.mint(
+                    wallet.address,
+                    async_pool_helper.min_tick,
+                    async_pool_helper.max_tick,
+                    LIQUIDITY,
+                )
+                async_pool_helper.wait()
+    finally:
+        connection.close()
+
+
+class TestAsyncPoolHelper:
+    def test_initialized_pool_setup(self, project, accounts):
+        """
+        Pools set up by PoolHelper and AsyncPoolHelper end in the same state
+        """
+        wallet = accounts[0]
+        sync_helpers = [
+            deploy_pool_helper(project, wallet)
+            for _ in range(ASYNC_POOL_HELPER_REPEATS)
+        ]
+        async_helpers = [
+            deploy_pool_helper(project, wallet)
+            for _ in range(ASYNC_POOL_HELPER_REPEATS)
+        ]
+
+        for pool_helper in sync_helpers:
+            with timings.measure("initialized pool setup"):
+                pool_helper.pool.initialize(INITIAL_PRICE, sender=wallet)
+                pool_helper.mint(
+                    wallet,
+                    pool_helper.min_tick,
+                    pool_helper.max_tick,
+                    LIQUIDITY,
+                    sender=wallet,
+                )
+        setup_pools_async(async_helpers, wallet)
+
+        for sync_helper, async_helper in zip(sync_helpers, async_helpers):
+            assert pool_state(sync_helper) == pool_state(async_helper)
@@ -0,0 +1,20 @@
+import os
+
+import pytest
+
+from driver import ApeDriver
+from drivers.scenarios import SCENARIOS
+
+# Framework-neutral scenarios of drivers/scenarios.py, the same operations in every
+# suite and in the web3 baseline. Skipped by default so that the measured suite stays
+# the same.
+DRIVER_SCENARIOS = os.environ.get("DRIVER_SCENARIOS", "") not in ("", "0")
+
+pytestmark = pytest.mark.skipif(
+    not DRIVER_SCENARIOS, reason="driver scenarios run only with DRIVER_SCENARIOS=1"
+)
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_scenario(name, project, accounts):
+    SCENARIOS[name](ApeDriver(project, accounts))
@@ -0,0 +1,276 @@
+import ape
+import pytest
+
+import utils
+from utils import FeeAmount, TickSpacings
+
+pytestmark = pytest.mark.extended
+
+TEST_ADDRESSES = [
+    "0x1000000000000000000000000000000000000000",
+    "0x2000000000000000000000000000000000000000",
+]
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+# EIP-170 limit, the TypeScript snapshots of exact bytecode sizes depend on
+# compiler settings that differ between the frameworks
+MAX_CODE_SIZE = 24576
+
+
+@pytest.fixture(scope="function")
+def factory(project, accounts):
+    return project.UniswapV3Factory.deploy(sender=accounts[0])
+
+
+def pool_bytecode(project):
+    return bytes.fromhex(
+        project.UniswapV3Pool.contract_type.deployment_bytecode.bytecode[2:]
+    )
+
+
+def create_and_check_pool(project, factory, tokens, fee_amount, tick_spacing, sender):
+    create2_address = utils.get_create2_address(
+        factory.address,
+        tokens,
+        fee_amount,
+        pool_bytecode(project),
+    )
+    tx = factory.createPool(tokens[0], tokens[1], fee_amount, sender=sender)
+    log = tx.decode_logs(factory.PoolCreated)[0]
+    assert log.token0 == TEST_ADDRESSES[0]
+    assert log.token1 == TEST_ADDRESSES[1]
+    assert log.fee == fee_amount
+    assert log.tickSpacing == tick_spacing
+    assert log.pool == create2_address
+
+    with ape.reverts():
+        factory.createPool(tokens[0], tokens[1], fee_amount, sender=sender)
+    with ape.reverts():
+        factory.createPool(tokens[1], tokens[0], fee_amount, sender=sender)
+    # getPool in order and in reverse
+    assert factory.getPool(tokens[0], tokens[1], fee_amount) == create2_address
+    assert factory.getPool(tokens[1], tokens[0], fee_amount) == create2_address
+
+    pool = project.UniswapV3Pool.at(create2_address)
+    assert pool.factory() == factory.address
+    assert pool.token0() == TEST_ADDRESSES[0]
+    assert pool.token1() == TEST_ADDRESSES[1]
+    assert pool.fee() == fee_amount
+    assert pool.tickSpacing() == tick_spacing
+
+
+class TestFactory:
+    def test_owner_is_deployer(self, accounts, factory):
+        """
+        owner is deployer
+        """
+        assert factory.owner() == accounts[0].address
+
+    def test_factory_bytecode_size(self, factory):
+        """
+        factory bytecode size
+        """
+        assert 0 < len(ape.chain.provider.get_code(factory.address)) <= MAX_CODE_SIZE
+
+    def test_pool_bytecode_size(self, project, accounts, factory):
+        """
+        pool bytecode size
+        """
+        factory.createPool(
+            TEST_ADDRESSES[0],
+            TEST_ADDRESSES[1],
+            FeeAmount.MEDIUM,
+            sender=accounts[0],
+        )
+        pool_address = utils.get_create2_address(
+            factory.address,
+            TEST_ADDRESSES,
+            FeeAmount.MEDIUM,
+            pool_bytecode(project),
+        )
+        assert 0 < len(ape.chain.provider.get_code(pool_address)) <= MAX_CODE_SIZE
+
+    def test_initial_enabled_fee_amounts(self, factory):
+        """
+        initial enabled fee amounts
+        """
+        assert factory.feeAmountTickSpacing(FeeAmount.LOW) == TickSpacings.LOW
+        assert factory.feeAmountTickSpacing(FeeAmount.MEDIUM) == TickSpacings.MEDIUM
+        assert factory.feeAmountTickSpacing(FeeAmount.HIGH) == TickSpacings.HIGH
+
+
+class TestCreatePool:
+    @pytest.mark.parametrize(
+        "fee_amount,tick_spacing",
+        [
+            (FeeAmount.LOW, TickSpacings.LOW),
+            (FeeAmount.MEDIUM, TickSpacings.MEDIUM),
+            (FeeAmount.HIGH, TickSpacings.HIGH),
+        ],
+        ids=["low", "medium", "high"],
+    )
+    def test_succeeds_for_fee_pool(
+        self, project, accounts, factory, fee_amount, tick_spacing
+    ):
+        """
+        succeeds for low/medium/high fee pool
+        """
+        create_and_check_pool(
+            project, factory, TEST_ADDRESSES, fee_amount, tick_spacing, accounts[0]
+        )
+
+    def test_succeeds_if_tokens_are_passed_in_reverse(self, project, accounts, factory):
+        """
+        succeeds if tokens are passed in reverse
+        """
+        create_and_check_pool(
+            project,
+            factory,
+            [TEST_ADDRESSES[1], TEST_ADDRESSES[0]],
+            FeeAmount.MEDIUM,
+            TickSpacings.MEDIUM,
+            accounts[0],
+        )
+
+    def test_fails_if_token_a_equals_token_b(self, accounts, factory):
+        """
+        fails if token a == token b
+        """
+        with ape.reverts():
+            factory.createPool(
+                TEST_ADDRESSES[0],
+                TEST_ADDRESSES[0],
+                FeeAmount.LOW,
+                sender=accounts[0],
+            )
+
+    def test_fails_if_token_a_is_0_or_token_b_is_0(self, accounts, factory):
+        """
+        fails if token a is 0 or token b is 0
+        """
+        with ape.reverts():
+            factory.createPool(
+                TEST_ADDRESSES[0],
+                ZERO_ADDRESS,
+                FeeAmount.LOW,
+                sender=accounts[0],
+            )
+        with ape.reverts():
+            factory.createPool(
+                ZERO_ADDRESS,
+                TEST_ADDRESSES[0],
+                FeeAmount.LOW,
+                sender=accounts[0],
+            )
+        with ape.reverts():
+            factory.createPool(
+                ZERO_ADDRESS,
+                ZERO_ADDRESS,
+                FeeAmount.LOW,
+                sender=accounts[0],
+            )
+
+    def test_fails_if_fee_amount_is_not_enabled(self, accounts, factory):
+        """
+        fails if fee amount is not enabled
+        """
+        with ape.reverts():
+            factory.createPool(
+                TEST_ADDRESSES[0],
+                TEST_ADDRESSES[1],
+                250,
+                sender=accounts[0],
+            )
+
+
+class TestSetOwner:
+    def test_fails_if_caller_is_not_owner(self, accounts, factory):
+        """
+        fails if caller is not owner
+        """
+        with ape.reverts():
+            factory.setOwner(accounts[0], sender=accounts[1])
+
+    def test_updates_owner(self, accounts, factory):
+        """
+        updates owner
+        """
+        factory.setOwner(accounts[1], sender=accounts[0])
+        assert factory.owner() == accounts[1].address
+
+    def test_emits_event(self, accounts, factory):
+        """
+        emits event
+        """
+        tx = factory.setOwner(accounts[1], sender=accounts[0])
+        log = tx.decode_logs(factory.OwnerChanged)[0]
+        assert log.oldOwner == accounts[0].address
+        assert log.newOwner == accounts[1].address
+
+    def test_cannot_be_called_by_original_owner(self, accounts, factory):
+        """
+        cannot be called by original owner
+        """
+        factory.setOwner(accounts[1], sender=accounts[0])
+        with ape.reverts():
+            factory.setOwner(accounts[0], sender=accounts[0])
+
+
+class TestEnableFeeAmount:
+    def test_fails_if_caller_is_not_owner(self, accounts, factory):
+        """
+        fails if caller is not owner
+        """
+        with ape.reverts():
+            factory.enableFeeAmount(100, 2, sender=accounts[1])
+
+    def test_fails_if_fee_is_too_great(self, accounts, factory):
+        """
+        fails if fee is too great
+        """
+        with ape.reverts():
+            factory.enableFeeAmount(1000000, 10, sender=accounts[0])
+
+    def test_fails_if_tick_spacing_is_too_small(self, accounts, factory):
+        """
+        fails if tick spacing is too small
+        """
+        with ape.reverts():
+            factory.enableFeeAmount(500, 0, sender=accounts[0])
+
+    def test_fails_if_tick_spacing_is_too_large(self, accounts, factory):
+        """
+        fails if tick spacing is too large
+        """
+        with ape.reverts():
+            factory.enableFeeAmount(500, 16834, sender=accounts[0])
+
+    def test_fails_if_already_initialized(self, accounts, factory):
+        """
+        fails if already initialized
+        """
+        factory.enableFeeAmount(100, 5, sender=accounts[0])
+        with ape.reverts():
+            factory.enableFeeAmount(100, 10, sender=accounts[0])
+
+    def test_sets_the_fee_amount_in_the_mapping(self, accounts, factory):
+        """
+        sets the fee amount in the mapping
+        """
+        factory.enableFeeAmount(100, 5, sender=accounts[0])
+        assert factory.feeAmountTickSpacing(100) == 5
+
+    def test_emits_an_event(self, accounts, factory):
+        """
+        emits an event
+        """
+        tx = factory.enableFeeAmount(100, 5, sender=accounts[0])
+        log = tx.decode_logs(factory.FeeAmountEnabled)[0]
+        assert log.fee == 100
+        assert log.tickSpacing == 5
+
+    def test_enables_pool_creation(self, project, accounts, factory):
+        """
+        enables pool creation
+        """
+        factory.enableFeeAmount(250, 15, sender=accounts[0])
+        create_and_check_pool(project, factory, TEST_ADDRESSES, 250, 15, accounts[0])
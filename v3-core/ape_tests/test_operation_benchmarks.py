@@ -0,0 +1,91 @@
+import os
+
+import ape
+import pytest
+
+import utils
+from drivers.benchmarks import timings
+
+# Times every framework primitive OPERATION_BENCHMARK_REPEATS times in isolation:
+# deploys, calls, transactions, reverts, event decoding and time travel.
+# Skipped by default so that the measured suite stays the same.
+OPERATION_BENCHMARK_REPEATS = int(os.environ.get("OPERATION_BENCHMARK_REPEATS", "0"))
+
+pytestmark = pytest.mark.skipif(
+    OPERATION_BENCHMARK_REPEATS < 1,
+    reason="operation benchmarks run only with OPERATION_BENCHMARK_REPEATS >= 1",
+)
+
+
+@pytest.fixture(scope="module")
+def contracts(project, accounts):
+    token = project.TestERC20.deploy(2**255, sender=accounts[0])
+    other_token = project.TestERC20.deploy(2**255, sender=accounts[0])
+    bit_math = project.BitMathTest.deploy(sender=accounts[0])
+    factory = project.UniswapV3Factory.deploy(sender=accounts[0])
+    pool = utils.create_pool(
+        utils.FeeAmount.MEDIUM,
+        utils.TickSpacings.MEDIUM,
+        token,
+        other_token,
+        factory,
+        accounts[0],
+    )
+    # changes made by the tests are reverted by ape's function isolation
+    return token, bit_math, pool
+
+
+class TestOperationBenchmarks:
+    def test_deploy(self, project, accounts):
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation deploy TestERC20"):
+                project.TestERC20.deploy(2**255, sender=accounts[0])
+            with timings.measure("operation deploy BitMathTest"):
+                project.BitMathTest.deploy(sender=accounts[0])
+
+    def test_call(self, accounts, contracts):
+        token, bit_math, _ = contracts
+        for i in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation call mostSignificantBit"):
+                result = bit_math.mostSignificantBit(2 ** (i % 256))
+            assert result == i % 256
+            with timings.measure("operation call balanceOf"):
+                balance = token.balanceOf(accounts[0])
+            assert balance == 2**255
+
+    def test_transaction(self, accounts, contracts):
+        token, _, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation transaction transfer"):
+                token.transfer(accounts[1], 1, sender=accounts[0])
+        assert token.balanceOf(accounts[1]) == OPERATION_BENCHMARK_REPEATS
+
+    def test_revert(self, accounts, contracts):
+        token, bit_math, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation revert call"):
+                with ape.reverts():
+                    bit_math.mostSignificantBit(0)
+            with timings.measure("operation revert transaction with reason"):
+                with ape.reverts("insufficient balance"):
+                    token.transfer(accounts[0], 1, sender=accounts[1])
+
+    def test_event_decoding(self, accounts, contracts):
+        token, _, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            tx = token.transfer(accounts[1], 1, sender=accounts[0])
+            with timings.measure("operation event decoding"):
+                log = tx.decode_logs(token.Transfer)[0]
+                assert log.event_arguments == {
+                    "from": accounts[0].address,
+                    "to": accounts[1].address,
+                    "value": 1,
+                }
+
+    def test_time_travel(self, accounts, contracts):
+        _, _, pool = contracts
+        start = pool.time()
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation time travel"):
+                pool.advanceTime(1, sender=accounts[0])
+        assert pool.time() == start + OPERATION_BENCHMARK_REPEATS
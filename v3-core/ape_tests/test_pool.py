@@ -2,15 +2,24 @@ import ape
 import pytest
 
 import utils
+from batch_setup import batch_setup
+from drivers.approvals import approval_cache
+from drivers.batch_setup import BATCH_SETUP_ENABLED
+from state_image import (STATE_IMAGE_ENABLED, load_state_image,
+                         state_image_supported)
 from utils import (MAX_SQRT_RATIO, MAX_UINT_128, MIN_SQRT_RATIO,
                    TEST_POOL_START_TIME)
 
 
-@pytest.fixture(scope="function")
-def tokens(project, accounts):
-    token0 = project.TestERC20.deploy(2**255, sender=accounts[0])
-    token1 = project.TestERC20.deploy(2**255, sender=accounts[0])
-    token2 = project.TestERC20.deploy(2**255, sender=accounts[0])
+def deploy_tokens(project, accounts):
+    deployer = utils.get_deployer(accounts[0])
+    token0 = project.TestERC20.deploy(2**255, sender=deployer)
+    token1 = project.TestERC20.deploy(2**255, sender=deployer)
+    token2 = project.TestERC20.deploy(2**255, sender=deployer)
+    if utils.DETERMINISTIC_ADDRESSES:
+        # the tests expect the whole supply in the first test account
+        for token in (token0, token1, token2):
+            token.transfer(accounts[0], 2**255, sender=deployer)
 
     token0, token1, token2 = sorted(
         [token0, token1, token2], key=lambda token: token.address.lower()
@@ -18,30 +27,152 @@ def tokens(project, accounts):
     return token0, token1, token2
 
 
-@pytest.fixture(scope="function")
-def factory(project, accounts):
-    return project.UniswapV3Factory.deploy(sender=accounts[0])
+def deploy_factory(project, accounts):
+    deployer = utils.get_deployer(accounts[0])
+    factory = project.UniswapV3Factory.deploy(sender=deployer)
+    if utils.DETERMINISTIC_ADDRESSES:
+        factory.setOwner(accounts[0], sender=deployer)
+    return factory
 
 
-@pytest.fixture(scope="function")
-def pool_fixture(project, accounts, tokens, factory):
-    token0, token1, token2 = tokens
-    factory = factory
+def deploy_pool(project, accounts, token0, token1, factory):
+    deployer = utils.get_deployer(accounts[0])
     pool = utils.create_pool(
         utils.FeeAmount.MEDIUM,
         utils.TickSpacings.MEDIUM,
         token0,
         token1,
         factory,
-        accounts[0],
+        deployer,
+    )
+    return pool, project.TestUniswapV3Callee.deploy(sender=deployer)
+
+
+def deploy_fixture_contracts(project, accounts):
+    token0, token1, token2 = deploy_tokens(project, accounts)
+    factory = deploy_factory(project, accounts)
+    pool, swap_target = deploy_pool(project, accounts, token0, token1, factory)
+    return {
+        "token0": token0,
+        "token1": token1,
+        "token2": token2,
+        "factory": factory,
+        "pool": pool,
+        "swap_target": swap_target,
+    }
+
+
+@pytest.fixture(scope="module")
+def state_image(project, accounts):
+    """
+    Addresses of the fixture contracts if the chain is booted from the state image,
+    None if the fixtures deploy them
+    """
+    if not STATE_IMAGE_ENABLED or not state_image_supported():
+        return None
+    # loaded once, changes made by the tests are reverted by ape's function isolation
+    return load_state_image(
+        lambda: deploy_fixture_contracts(project, accounts),
+        [
+            project.TestERC20,
+            project.UniswapV3Factory,
+            project.MockTimeUniswapV3PoolDeployer,
+            project.TestUniswapV3Callee,
+        ],
+    )
+
+
+@pytest.fixture(scope="function")
+def fixture_contracts(project, accounts, state_image):
+    """
+    Addresses of the fixture contracts if the chain is booted from the state image or
+    they are deployed in a single block in batch setup mode, None if the fixtures
+    deploy them one by one
+    """
+    if state_image is not None:
+        return state_image
+    # the fixed deployer of DETERMINISTIC_ADDRESSES is not unlocked in the node
+    if not BATCH_SETUP_ENABLED or utils.DETERMINISTIC_ADDRESSES:
+        return None
+    return batch_setup.deploy_fixture_contracts(
+        accounts[0].address,
+        {
+            "TestERC20": project.TestERC20,
+            "UniswapV3Factory": project.UniswapV3Factory,
+            "MockTimeUniswapV3PoolDeployer": project.MockTimeUniswapV3PoolDeployer,
+            "MockTimeUniswapV3Pool": project.MockTimeUniswapV3Pool,
+            "TestUniswapV3Callee": project.TestUniswapV3Callee,
+        },
+        utils.FeeAmount.MEDIUM,
+        utils.TickSpacings.MEDIUM,
+    )
+
+
+def initialize_pool(accounts, pool_helper, sqrt_price_x96, liquidity):
+    """
+    Initializes the pool and mints full range liquidity of the first test account,
+    in a single block in batch setup mode
+    """
+    wallet = accounts[0]
+    if not BATCH_SETUP_ENABLED:
+        pool_helper.pool.initialize(sqrt_price_x96, sender=wallet)
+        pool_helper.mint(
+            wallet,
+            pool_helper.min_tick,
+            pool_helper.max_tick,
+            liquidity,
+            sender=wallet,
+        )
+        return
+    batch_setup.initialize_pool(
+        wallet.address,
+        pool_helper.pool.address,
+        pool_helper.token0.address,
+        pool_helper.token1.address,
+        pool_helper.swap_target.address,
+        sqrt_price_x96,
+        pool_helper.min_tick,
+        pool_helper.max_tick,
+        liquidity,
     )
+    for token in (pool_helper.token0, pool_helper.token1):
+        approval_cache.grant(
+            token.address, pool_helper.swap_target.address, wallet.address
+        )
+
+
+@pytest.fixture(scope="function")
+def tokens(project, accounts, fixture_contracts):
+    if fixture_contracts is not None:
+        return tuple(
+            project.TestERC20.at(fixture_contracts[name])
+            for name in ("token0", "token1", "token2")
+        )
+    return deploy_tokens(project, accounts)
+
+
+@pytest.fixture(scope="function")
+def factory(project, accounts, fixture_contracts):
+    if fixture_contracts is not None:
+        return project.UniswapV3Factory.at(fixture_contracts["factory"])
+    return deploy_factory(project, accounts)
+
+
+@pytest.fixture(scope="function")
+def pool_fixture(project, accounts, fixture_contracts, tokens, factory):
+    token0, token1, token2 = tokens
+    if fixture_contracts is not None:
+        pool = project.MockTimeUniswapV3Pool.at(fixture_contracts["pool"])
+        swap_target = project.TestUniswapV3Callee.at(fixture_contracts["swap_target"])
+    else:
+        pool, swap_target = deploy_pool(project, accounts, token0, token1, factory)
     pool_functions = utils.PoolHelper(
         token0,
         token1,
         factory,
         pool,
         utils.TickSpacings.MEDIUM,
-        project.TestUniswapV3Callee.deploy(sender=accounts[0]),
+        swap_target,
     )
     return token0, token1, factory, pool, pool_functions
 
@@ -234,14 +365,7 @@ class TestMint:
         @pytest.fixture(scope="function")
         def initialized_pool_fixture(self, accounts, pool_fixture):
             token0, token1, factory, pool, pool_helper = pool_fixture
-            pool.initialize(utils.encode_price_sqrt(1, 10), sender=accounts[0])
-            pool_helper.mint(
-                accounts[0],
-                pool_helper.min_tick,
-                pool_helper.max_tick,
-                3161,
-                sender=accounts[0],
-            )
+            initialize_pool(accounts, pool_helper, utils.encode_price_sqrt(1, 10), 3161)
             return token0, token1, factory, pool, pool_helper
 
         class TestFailureCases:
@@ -397,10 +521,12 @@ class TestMint:
                     tx = pool_helper.mint(
                         accounts[0], -22980, 0, 10000, sender=accounts[0]
                     )
-                    log = tx.decode_logs(token0.Transfer)[0]
-                    assert log["from"] == accounts[0]
-                    assert log.to == pool.address
-                    assert log.value == 21549
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 21549},
+                    )
                     assert token0.balanceOf(pool.address) == 9996 + 21549
                     assert token1.balanceOf(pool.address) == 1000
 
@@ -444,10 +570,12 @@ class TestMint:
                         accounts[0], -22980, max_tick, 10000, sender=accounts[0]
                     )
 
-                    log = tx.decode_logs(token0.Transfer)[0]
-                    assert log["from"] == accounts[0]
-                    assert log.to == pool.address
-                    assert log.value == 31549
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 31549},
+                    )
                     assert token0.balanceOf(pool.address) == 9996 + 31549
                     assert token1.balanceOf(pool.address) == 1000
 
@@ -684,10 +812,12 @@ class TestMint:
                         100,
                         sender=accounts[0],
                     )
-                    log = tx.decode_logs(token0.Transfer)[0]
-                    assert log["from"] == accounts[0]
-                    assert log.to == pool.address
-                    assert log.value == 317
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 317},
+                    )
                     assert token0.balanceOf(pool.address) == 9996 + 317
                     assert token1.balanceOf(pool.address) == 1000 + 32
 
@@ -764,10 +894,12 @@ class TestMint:
                     tx = pool_helper.mint(
                         accounts[0], min_tick, max_tick, 10000, sender=accounts[0]
                     )
-                    log = tx.decode_logs(token0.Transfer)[0]
-                    assert log["from"] == accounts[0]
-                    assert log.to == pool.address
-                    assert log.value == 31623
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 31623},
+                    )
                     assert token0.balanceOf(pool.address) == 9996 + 31623
                     assert token1.balanceOf(pool.address) == 1000 + 3163
 
@@ -865,11 +997,12 @@ class TestMint:
                     tx = pool_helper.mint(
                         accounts[0], -46080, -23040, 10000, sender=accounts[0]
                     )
-                    logs = tx.decode_logs(token1.Transfer)
-                    transfer_log = logs[0]
-                    assert transfer_log["from"] == accounts[0]
-                    assert transfer_log["to"] == pool.address
-                    assert transfer_log["value"] == 2162
+                    assert utils.event_emitted(
+                        tx,
+                        token1,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 2162},
+                    )
                     assert token0.balanceOf(pool.address) == 9996
                     assert token1.balanceOf(pool.address) == 1000 + 2162
 
@@ -913,10 +1046,12 @@ class TestMint:
                     tx = pool_helper.mint(
                         accounts[0], min_tick, -23040, 10000, sender=accounts[0]
                     )
-                    log = tx.decode_logs(token0.Transfer)[0]
-                    assert log["from"] == accounts[0]
-                    assert log["to"] == pool.address
-                    assert log["value"] == 3161
+                    assert utils.event_emitted(
+                        tx,
+                        token1,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 3161},
+                    )
                     assert token0.balanceOf(pool.address) == 9996
                     assert token1.balanceOf(pool.address) == 1000 + 3161
 
@@ -1109,13 +1244,11 @@ class TestBurn:
     @pytest.fixture(scope="function")
     def initialized_pool_fixture(self, accounts, pool_fixture):
         token0, token1, factory, pool, pool_helper = pool_fixture
-        pool.initialize(utils.encode_price_sqrt(1, 1), sender=accounts[0])
-        pool_helper.mint(
-            accounts[0],
-            pool_helper.min_tick,
-            pool_helper.max_tick,
+        initialize_pool(
+            accounts,
+            pool_helper,
+            utils.encode_price_sqrt(1, 1),
             utils.expand_to_18_decimals(2),
-            sender=accounts[0],
         )
         return token0, token1, factory, pool, pool_helper
 
@@ -1243,13 +1376,11 @@ class TestObserve:
     @pytest.fixture(scope="function")
     def initialized_pool_fixture(self, accounts, pool_fixture):
         token0, token1, factory, pool, pool_helper = pool_fixture
-        pool.initialize(utils.encode_price_sqrt(1, 1), sender=accounts[0])
-        pool_helper.mint(
-            accounts[0],
-            pool_helper.min_tick,
-            pool_helper.max_tick,
+        initialize_pool(
+            accounts,
+            pool_helper,
+            utils.encode_price_sqrt(1, 1),
             utils.expand_to_18_decimals(2),
-            sender=accounts[0],
         )
         return token0, token1, factory, pool, pool_helper
 
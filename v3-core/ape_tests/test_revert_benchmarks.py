@@ -0,0 +1,75 @@
+import os
+
+import ape
+import pytest
+
+import utils
+from driver import send_request
+from drivers.benchmarks import timings
+from drivers.reverts import assert_reverts
+
+# Times the revert assertions of the framework against assert_reverts, which decodes the
+# reason from a plain eth_call, REVERT_BENCHMARK_REPEATS times for a reverting
+# transaction (LOK of an uninitialized pool) and a reverting call (T of TickMath).
+# Skipped by default so that the measured suite stays the same.
+REVERT_BENCHMARK_REPEATS = int(os.environ.get("REVERT_BENCHMARK_REPEATS", "0"))
+
+MIN_TICK = -887272
+
+pytestmark = pytest.mark.skipif(
+    REVERT_BENCHMARK_REPEATS < 1,
+    reason="revert benchmarks run only with REVERT_BENCHMARK_REPEATS >= 1",
+)
+
+
+@pytest.fixture(scope="module")
+def contracts(project, accounts):
+    token = project.TestERC20.deploy(2**255, sender=accounts[0])
+    other_token = project.TestERC20.deploy(2**255, sender=accounts[0])
+    factory = project.UniswapV3Factory.deploy(sender=accounts[0])
+    pool = utils.create_pool(
+        utils.FeeAmount.MEDIUM,
+        utils.TickSpacings.MEDIUM,
+        token,
+        other_token,
+        factory,
+        accounts[0],
+    )
+    tick_math = project.TickMathTest.deploy(sender=accounts[0])
+    return pool, tick_math
+
+
+class TestRevertBenchmarks:
+    def test_transaction_revert(self, accounts, contracts):
+        pool, _ = contracts
+        for _ in range(REVERT_BENCHMARK_REPEATS):
+            with timings.measure("operation framework revert transaction LOK"):
+                with ape.reverts("LOK"):
+                    pool.increaseObservationCardinalityNext(2, sender=accounts[0])
+            with timings.measure("operation fast revert transaction LOK"):
+                assert_reverts(
+                    send_request,
+                    accounts[0].address,
+                    pool.address,
+                    "increaseObservationCardinalityNext(uint16)",
+                    ["uint16"],
+                    [2],
+                    "LOK",
+                )
+
+    def test_call_revert(self, accounts, contracts):
+        _, tick_math = contracts
+        for _ in range(REVERT_BENCHMARK_REPEATS):
+            with timings.measure("operation framework revert call T"):
+                with ape.reverts("T"):
+                    tick_math.getSqrtRatioAtTick(MIN_TICK - 1)
+            with timings.measure("operation fast revert call T"):
+                assert_reverts(
+                    send_request,
+                    accounts[0].address,
+                    tick_math.address,
+                    "getSqrtRatioAtTick(int24)",
+                    ["int24"],
+                    [MIN_TICK - 1],
+                    "T",
+                )
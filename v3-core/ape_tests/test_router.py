@@ -0,0 +1,117 @@
+import pytest
+
+import utils
+from utils import FeeAmount, TickSpacings
+
+pytestmark = pytest.mark.extended
+
+
+@pytest.fixture(scope="function")
+def router_fixture(project, accounts):
+    wallet = accounts[0]
+    token0 = project.TestERC20.deploy(2**255, sender=wallet)
+    token1 = project.TestERC20.deploy(2**255, sender=wallet)
+    token2 = project.TestERC20.deploy(2**255, sender=wallet)
+    token0, token1, token2 = sorted(
+        [token0, token1, token2], key=lambda token: token.address.lower()
+    )
+    factory = project.UniswapV3Factory.deploy(sender=wallet)
+    swap_target_callee = project.TestUniswapV3Callee.deploy(sender=wallet)
+    swap_target_router = project.TestUniswapV3Router.deploy(sender=wallet)
+
+    # default to the 30 bips pool
+    pool0 = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token0, token1, factory, wallet
+    )
+    pool1 = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token1, token2, factory, wallet
+    )
+    pool0_helper = utils.PoolHelper(
+        token0, token1, factory, pool0, TickSpacings.MEDIUM, swap_target_callee
+    )
+    pool1_helper = utils.PoolHelper(
+        token1, token2, factory, pool1, TickSpacings.MEDIUM, swap_target_callee
+    )
+    return (
+        token0,
+        token1,
+        token2,
+        factory,
+        pool0,
+        pool1,
+        pool0_helper,
+        pool1_helper,
+        swap_target_router,
+    )
+
+
+class TestRouter:
+    def test_constructor_initializes_immutables(self, router_fixture):
+        """
+        constructor initializes immutables
+        """
+        token0, token1, token2, factory, pool0, pool1 = router_fixture[:6]
+        assert pool0.factory() == factory.address
+        assert pool0.token0() == token0.address
+        assert pool0.token1() == token1.address
+        assert pool1.factory() == factory.address
+        assert pool1.token0() == token1.address
+        assert pool1.token1() == token2.address
+
+
+class TestMultiSwaps:
+    def test_multi_swap(self, accounts, router_fixture):
+        """
+        multi-swap
+        """
+        (
+            token0,
+            token1,
+            token2,
+            factory,
+            pool0,
+            pool1,
+            pool0_helper,
+            pool1_helper,
+            swap_target_router,
+        ) = router_fixture
+        wallet = accounts[0]
+        input_token = token0
+        output_token = token2
+
+        # initialize both pools
+        pool0.initialize(utils.encode_price_sqrt(1, 1), sender=wallet)
+        pool1.initialize(utils.encode_price_sqrt(1, 1), sender=wallet)
+        pool0_helper.mint(
+            wallet,
+            pool0_helper.min_tick,
+            pool0_helper.max_tick,
+            utils.expand_to_18_decimals(1),
+            sender=wallet,
+        )
+        pool1_helper.mint(
+            wallet,
+            pool1_helper.min_tick,
+            pool1_helper.max_tick,
+            utils.expand_to_18_decimals(1),
+            sender=wallet,
+        )
+
+        for_exact_0 = output_token.address == pool1.token0()
+        multi_pool_helper = utils.MultiPoolHelper(
+            input_token, swap_target_router, pool0, pool1
+        )
+        method = (
+            multi_pool_helper.swap_for_exact_0_multi
+            if for_exact_0
+            else multi_pool_helper.swap_for_exact_1_multi
+        )
+
+        tx = method(100, wallet, sender=wallet)
+        transfers = [
+            (log["from"], log["to"], log["value"])
+            for log in tx.decode_logs(output_token.Transfer)
+        ]
+        assert (pool1.address, wallet.address, 100) in transfers
+        assert (pool0.address, pool1.address, 102) in transfers
+        assert (wallet.address, pool0.address, 104) in transfers
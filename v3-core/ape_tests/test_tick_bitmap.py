@@ -0,0 +1,426 @@
+import pytest
+
+from drivers.gas import GAS_REPORT_ENABLED
+from snapshots import match_gas_snapshot
+
+pytestmark = pytest.mark.extended
+
+gas_test = pytest.mark.skipif(
+    not GAS_REPORT_ENABLED, reason="gas snapshots are checked only with GAS_REPORT=1"
+)
+
+
+@pytest.fixture(scope="function")
+def tick_bitmap(project, accounts):
+    return project.TickBitmapTest.deploy(sender=accounts[0])
+
+
+@pytest.fixture(scope="function")
+def initialized_tick_bitmap(accounts, tick_bitmap):
+    # word boundaries are at multiples of 256
+    init_ticks(
+        tick_bitmap, [-200, -55, -4, 70, 78, 84, 139, 240, 535], sender=accounts[0]
+    )
+    return tick_bitmap
+
+
+def init_ticks(tick_bitmap, ticks, sender):
+    for tick in ticks:
+        tick_bitmap.flipTick(tick, sender=sender)
+
+
+class TestIsInitialized:
+    def test_is_false_at_first(self, tick_bitmap):
+        """
+        Is false at first
+        """
+        assert tick_bitmap.isInitialized(1) is False
+
+    def test_is_flipped_by_flip_tick(self, accounts, tick_bitmap):
+        """
+        Is flipped by #flipTick
+        """
+        tick_bitmap.flipTick(1, sender=accounts[0])
+        assert tick_bitmap.isInitialized(1) is True
+
+    def test_is_flipped_back_by_flip_tick(self, accounts, tick_bitmap):
+        """
+        Is flipped back by #flipTick
+        """
+        tick_bitmap.flipTick(1, sender=accounts[0])
+        tick_bitmap.flipTick(1, sender=accounts[0])
+        assert tick_bitmap.isInitialized(1) is False
+
+    def test_is_not_changed_by_another_flip_to_a_different_tick(
+        self, accounts, tick_bitmap
+    ):
+        """
+        Is not changed by another flip to a different tick
+        """
+        tick_bitmap.flipTick(2, sender=accounts[0])
+        assert tick_bitmap.isInitialized(1) is False
+
+    def test_is_not_changed_by_another_flip_to_a_different_tick_on_another_word(
+        self, accounts, tick_bitmap
+    ):
+        """
+        Is not changed by another flip to a different tick on another word
+        """
+        tick_bitmap.flipTick(1 + 256, sender=accounts[0])
+        assert tick_bitmap.isInitialized(257) is True
+        assert tick_bitmap.isInitialized(1) is False
+
+
+class TestFlipTick:
+    def test_flips_only_the_specified_tick(self, accounts, tick_bitmap):
+        """
+        Flips only the specified tick
+        """
+        tick_bitmap.flipTick(-230, sender=accounts[0])
+        assert tick_bitmap.isInitialized(-230) is True
+        assert tick_bitmap.isInitialized(-231) is False
+        assert tick_bitmap.isInitialized(-229) is False
+        assert tick_bitmap.isInitialized(-230 + 256) is False
+        assert tick_bitmap.isInitialized(-230 - 256) is False
+        tick_bitmap.flipTick(-230, sender=accounts[0])
+        assert tick_bitmap.isInitialized(-230) is False
+        assert tick_bitmap.isInitialized(-231) is False
+        assert tick_bitmap.isInitialized(-229) is False
+        assert tick_bitmap.isInitialized(-230 + 256) is False
+        assert tick_bitmap.isInitialized(-230 - 256) is False
+
+    def test_reverts_only_itself(self, accounts, tick_bitmap):
+        """
+        Reverts only itself
+        """
+        init_ticks(
+            tick_bitmap, [-230, -259, -229, 500, -259, -229, -259], sender=accounts[0]
+        )
+        assert tick_bitmap.isInitialized(-259) is True
+        assert tick_bitmap.isInitialized(-229) is False
+
+    @gas_test
+    def test_gas_cost_of_flipping_first_tick_in_word_to_initialized(
+        self, accounts, tick_bitmap
+    ):
+        """
+        Gas cost of flipping first tick in word to initialized
+        """
+        tx = tick_bitmap.getGasCostOfFlipTick(1, sender=accounts[0])
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            "flip_tick_gas_cost_of_flipping_first_tick_in_word_to_initialized",
+        )
+
+    @gas_test
+    def test_gas_cost_of_flipping_second_tick_in_word_to_initialized(
+        self, accounts, tick_bitmap
+    ):
+        """
+        Gas cost of flipping second tick in word to initialized
+        """
+        tick_bitmap.flipTick(0, sender=accounts[0])
+        tx = tick_bitmap.getGasCostOfFlipTick(1, sender=accounts[0])
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            "flip_tick_gas_cost_of_flipping_second_tick_in_word_to_initialized",
+        )
+
+    @gas_test
+    def test_gas_cost_of_flipping_a_tick_that_results_in_deleting_a_word(
+        self, accounts, tick_bitmap
+    ):
+        """
+        Gas cost of flipping a tick that results in deleting a word
+        """
+        tick_bitmap.flipTick(0, sender=accounts[0])
+        tx = tick_bitmap.getGasCostOfFlipTick(0, sender=accounts[0])
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            "flip_tick_gas_cost_of_flipping_a_tick_that_results_in_deleting_a_word",
+        )
+
+
+class TestNextInitializedTickWithinOneWord:
+    class TestLteFalse:
+        @pytest.mark.parametrize(
+            "tick, expected_next",
+            [(78, 84), (-55, -4)],
+        )
+        def test_returns_tick_to_right_if_at_initialized_tick(
+            self, initialized_tick_bitmap, tick, expected_next
+        ):
+            """
+            Returns tick to right if at initialized tick
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(tick, False)
+            assert next_tick == expected_next
+            assert initialized is True
+
+        @pytest.mark.parametrize(
+            "tick, expected_next",
+            [(77, 78), (-56, -55)],
+        )
+        def test_returns_the_tick_directly_to_the_right(
+            self, initialized_tick_bitmap, tick, expected_next
+        ):
+            """
+            Returns the tick directly to the right
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(tick, False)
+            assert next_tick == expected_next
+            assert initialized is True
+
+        @pytest.mark.parametrize(
+            "tick, expected_next, expected_initialized",
+            [(255, 511, False), (-257, -200, True)],
+        )
+        def test_returns_the_next_words_initialized_tick_if_on_the_right_boundary(
+            self, initialized_tick_bitmap, tick, expected_next, expected_initialized
+        ):
+            """
+            Returns the next words initialized tick if on the right boundary
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(tick, False)
+            assert next_tick == expected_next
+            assert initialized is expected_initialized
+
+        def test_returns_the_next_initialized_tick_from_the_next_word(
+            self, accounts, initialized_tick_bitmap
+        ):
+            """
+            Returns the next initialized tick from the next word
+            """
+            initialized_tick_bitmap.flipTick(340, sender=accounts[0])
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(328, False)
+            assert next_tick == 340
+            assert initialized is True
+
+        def test_does_not_exceed_boundary(self, initialized_tick_bitmap):
+            """
+            Does not exceed boundary
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(508, False)
+            assert next_tick == 511
+            assert initialized is False
+
+        def test_skips_entire_word(self, initialized_tick_bitmap):
+            """
+            Skips entire word
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(255, False)
+            assert next_tick == 511
+            assert initialized is False
+
+        def test_skips_half_word(self, initialized_tick_bitmap):
+            """
+            Skips half word
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(383, False)
+            assert next_tick == 511
+            assert initialized is False
+
+        @gas_test
+        def test_gas_cost_on_boundary(self, initialized_tick_bitmap):
+            """
+            Gas cost on boundary
+            """
+            match_gas_snapshot(
+                initialized_tick_bitmap.getGasCostOfNextInitializedTickWithinOneWord(
+                    255, False
+                ),
+                __file__,
+                "next_initialized_tick_within_one_word_lte_false_gas_cost_on_boundary",
+            )
+
+        @gas_test
+        def test_gas_cost_just_below_boundary(self, initialized_tick_bitmap):
+            """
+            Gas cost just below boundary
+            """
+            match_gas_snapshot(
+                initialized_tick_bitmap.getGasCostOfNextInitializedTickWithinOneWord(
+                    254, False
+                ),
+                __file__,
+                "next_initialized_tick_within_one_word_lte_false_gas_cost_just_below_boundary",
+            )
+
+        @gas_test
+        def test_gas_cost_for_entire_word(self, initialized_tick_bitmap):
+            """
+            Gas cost for entire word
+            """
+            match_gas_snapshot(
+                initialized_tick_bitmap.getGasCostOfNextInitializedTickWithinOneWord(
+                    768, False
+                ),
+                __file__,
+                "next_initialized_tick_within_one_word_lte_false_gas_cost_for_entire_word",
+            )
+
+    class TestLteTrue:
+        def test_returns_same_tick_if_initialized(self, initialized_tick_bitmap):
+            """
+            Returns same tick if initialized
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(78, True)
+            assert next_tick == 78
+            assert initialized is True
+
+        def test_returns_tick_directly_to_the_left_of_input_tick_if_not_initialized(
+            self, initialized_tick_bitmap
+        ):
+            """
+            Returns tick directly to the left of input tick if not initialized
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(79, True)
+            assert next_tick == 78
+            assert initialized is True
+
+        def test_will_not_exceed_the_word_boundary(self, initialized_tick_bitmap):
+            """
+            Will not exceed the word boundary
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(258, True)
+            assert next_tick == 256
+            assert initialized is False
+
+        def test_at_the_word_boundary(self, initialized_tick_bitmap):
+            """
+            At the word boundary
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(256, True)
+            assert next_tick == 256
+            assert initialized is False
+
+        def test_word_boundary_less_1(self, initialized_tick_bitmap):
+            """
+            Word boundary less 1 (next initialized tick in next word)
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(72, True)
+            assert next_tick == 70
+            assert initialized is True
+
+        def test_word_boundary(self, initialized_tick_bitmap):
+            """
+            Word boundary
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(-257, True)
+            assert next_tick == -512
+            assert initialized is False
+
+        def test_entire_empty_word(self, initialized_tick_bitmap):
+            """
+            Entire empty word
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(1023, True)
+            assert next_tick == 768
+            assert initialized is False
+
+        def test_halfway_through_empty_word(self, initialized_tick_bitmap):
+            """
+            Halfway through empty word
+            """
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(900, True)
+            assert next_tick == 768
+            assert initialized is False
+
+        def test_boundary_is_initialized(self, accounts, initialized_tick_bitmap):
+            """
+            Boundary is initialized
+            """
+            initialized_tick_bitmap.flipTick(329, sender=accounts[0])
+            (
+                next_tick,
+                initialized,
+            ) = initialized_tick_bitmap.nextInitializedTickWithinOneWord(456, True)
+            assert next_tick == 329
+            assert initialized is True
+
+        @gas_test
+        def test_gas_cost_on_boundary(self, initialized_tick_bitmap):
+            """
+            Gas cost on boundary
+            """
+            match_gas_snapshot(
+                initialized_tick_bitmap.getGasCostOfNextInitializedTickWithinOneWord(
+                    256, True
+                ),
+                __file__,
+                "next_initialized_tick_within_one_word_lte_true_gas_cost_on_boundary",
+            )
+
+        @gas_test
+        def test_gas_cost_just_below_boundary(self, initialized_tick_bitmap):
+            """
+            Gas cost just below boundary
+            """
+            match_gas_snapshot(
+                initialized_tick_bitmap.getGasCostOfNextInitializedTickWithinOneWord(
+                    255, True
+                ),
+                __file__,
+                "next_initialized_tick_within_one_word_lte_true_gas_cost_just_below_boundary",
+            )
+
+        @gas_test
+        def test_gas_cost_for_entire_word(self, initialized_tick_bitmap):
+            """
+            Gas cost for entire word
+            """
+            match_gas_snapshot(
+                initialized_tick_bitmap.getGasCostOfNextInitializedTickWithinOneWord(
+                    1024, True
+                ),
+                __file__,
+                "next_initialized_tick_within_one_word_lte_true_gas_cost_for_entire_word",
+            )
@@ -0,0 +1,133 @@
+import bisect
+import os
+import random
+
+import pytest
+
+from drivers.benchmarks import timings
+
+# Flips TICK_BITMAP_WORKLOAD_TICKS ticks one transaction at a time and queries
+# nextInitializedTickWithinOneWord TICK_BITMAP_WORKLOAD_QUERIES times in each direction.
+# Skipped by default so that the measured suite stays the same.
+TICK_BITMAP_WORKLOAD_TICKS = int(os.environ.get("TICK_BITMAP_WORKLOAD_TICKS", "0"))
+TICK_BITMAP_WORKLOAD_QUERIES = int(
+    os.environ.get("TICK_BITMAP_WORKLOAD_QUERIES", "1000")
+)
+TICK_BITMAP_WORKLOAD_SEED = int(os.environ.get("TICK_BITMAP_WORKLOAD_SEED", "0"))
+
+pytestmark = pytest.mark.skipif(
+    TICK_BITMAP_WORKLOAD_TICKS < 1,
+    reason="tick bitmap workload runs only with TICK_BITMAP_WORKLOAD_TICKS >= 1",
+)
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+LAYOUTS = ["dense", "sparse"]
+
+
+def generate_ticks(layout, count, seed):
+    """
+    Returns count distinct ticks. Dense ticks fill consecutive words around tick 0,
+    sparse ticks are spread over the whole tick range.
+    """
+    if layout == "dense":
+        return list(range(-(count // 2), count - count // 2))
+    return random.Random(seed).sample(range(MIN_TICK, MAX_TICK + 1), count)
+
+
+def generate_queries(ticks, count, seed):
+    """
+    Returns count ticks to query, alternating initialized ticks and random ticks
+    around the initialized ones
+    """
+    rng = random.Random(seed)
+    low, high = min(ticks) - 256, max(ticks) + 256
+    return [
+        rng.choice(ticks) if i % 2 == 0 else rng.randint(low, high)
+        for i in range(count)
+    ]
+
+
+class TickBitmapModel:
+    """
+    Python reference of TickBitmapTest (tick spacing 1)
+    """
+
+    def __init__(self, ticks):
+        self.ticks = sorted(ticks)
+
+    def words(self):
+        words = {}
+        for tick in self.ticks:
+            words[tick >> 8] = words.get(tick >> 8, 0) | 1 << (tick % 256)
+        return words
+
+    def next_initialized_tick_within_one_word(self, tick, lte):
+        if lte:
+            word_start = (tick >> 8) << 8
+            i = bisect.bisect_right(self.ticks, tick) - 1
+            if i >= 0 and self.ticks[i] >= word_start:
+                return self.ticks[i], True
+            return word_start, False
+
+        # start from the next tick
+        tick += 1
+        word_end = ((tick >> 8) << 8) + 255
+        i = bisect.bisect_left(self.ticks, tick)
+        if i < len(self.ticks) and self.ticks[i] <= word_end:
+            return self.ticks[i], True
+        return word_end, False
+
+
+@pytest.fixture(scope="module", params=LAYOUTS)
+def workload(request, project, accounts):
+    layout = request.param
+    ticks = generate_ticks(
+        layout, TICK_BITMAP_WORKLOAD_TICKS, TICK_BITMAP_WORKLOAD_SEED
+    )
+    tick_bitmap = project.TickBitmapTest.deploy(sender=accounts[0])
+    for tick in ticks:
+        with timings.measure(f"flipTick {layout}"):
+            tick_bitmap.flipTick(tick, sender=accounts[0])
+    # changes made by the tests are reverted by ape's function isolation
+    return layout, tick_bitmap, TickBitmapModel(ticks)
+
+
+class TestTickBitmapWorkload:
+    def test_bitmap_words_match_model(self, workload):
+        """
+        Every touched word of the bitmap matches the reference model
+        """
+        layout, tick_bitmap, model = workload
+        for word, bits in model.words().items():
+            assert tick_bitmap.bitmap(word) == bits
+
+    @pytest.mark.parametrize("lte", [False, True], ids=["lte_false", "lte_true"])
+    def test_next_initialized_tick_within_one_word_matches_model(self, workload, lte):
+        """
+        nextInitializedTickWithinOneWord matches the reference model
+        """
+        layout, tick_bitmap, model = workload
+        queries = generate_queries(
+            model.ticks, TICK_BITMAP_WORKLOAD_QUERIES, TICK_BITMAP_WORKLOAD_SEED + lte
+        )
+        for tick in queries:
+            with timings.measure(f"nextInitializedTickWithinOneWord {layout}"):
+                next_tick, initialized = tick_bitmap.nextInitializedTickWithinOneWord(
+                    tick, lte
+                )
+            assert (
+                next_tick,
+                initialized,
+            ) == model.next_initialized_tick_within_one_word(tick, lte), tick
+
+    def test_flipping_every_tick_back_clears_the_bitmap(self, accounts, workload):
+        """
+        Flipping every tick back clears all touched words
+        """
+        layout, tick_bitmap, model = workload
+        for tick in model.ticks:
+            with timings.measure(f"flipTick {layout} back"):
+                tick_bitmap.flipTick(tick, sender=accounts[0])
+        for word in model.words():
+            assert tick_bitmap.bitmap(word) == 0
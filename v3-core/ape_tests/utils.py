@@ -1,12 +1,19 @@
 import decimal
 import math
+import os
 from decimal import Decimal
 from enum import IntEnum
 
 from ape import project
 from ape.types import ContractLog
+from ape_test.accounts import TestAccount
 from eth_abi.packed import encode_packed
-from eth_utils import keccak
+from eth_account import Account as EthAccount
+from eth_utils import keccak, to_checksum_address
+
+from drivers.approvals import approval_cache
+from drivers.codec import position_key
+from drivers.events import event_codec, receipt_logs
 
 decimal.setcontext(decimal.Context(prec=40))
 
@@ -16,6 +23,13 @@ MIN_SQRT_RATIO = 4295128739
 MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
 TEST_POOL_START_TIME = 1601906400
 
+DETERMINISTIC_ADDRESSES = os.environ.get("DETERMINISTIC_ADDRESSES", "") not in ("", "0")
+# fixed key shared by all suites, it is not one of the test accounts of any framework
+DEPLOYER_PRIVATE_KEY = (
+    "0x0b2b0d2b7b0339bcc642812ca0ed6e83daf15e5f5c77fc845156a6b30d94fe71"
+)
+DEPLOYER_BALANCE = 100 * 10**18
+
 
 class FeeAmount(IntEnum):
     LOW = 500
@@ -47,17 +61,73 @@ def expand_to_18_decimals(n):
     return n * 10**18
 
 
+def get_deployer(funder):
+    """
+    Account that deploys the fixture contracts. With DETERMINISTIC_ADDRESSES it is an
+    account with a fixed private key and no other transactions, so the addresses of
+    the contracts depend only on the order of the deployments and are the same in
+    every run and framework.
+    """
+    if not DETERMINISTIC_ADDRESSES:
+        return funder
+    deployer = TestAccount(
+        index=-1,
+        address_str=EthAccount.from_key(DEPLOYER_PRIVATE_KEY).address,
+        private_key=DEPLOYER_PRIVATE_KEY,
+    )
+    if deployer.balance == 0:
+        funder.transfer(deployer, DEPLOYER_BALANCE)
+    return deployer
+
+
 def encode_price_sqrt(reserve1, reserve0):
     return int(
         (Decimal.from_float(reserve1) / Decimal.from_float(reserve0)).sqrt() * 2**96
     )
 
 
+def to_precision(value, precision=5):
+    """
+    Formats a Decimal the same way as decimal.js toPrecision does in the TypeScript snapshots
+    """
+    if not value.is_finite():
+        return str(value)
+    rounded = decimal.Context(prec=precision, rounding=decimal.ROUND_HALF_UP).plus(
+        value
+    )
+    exponent = rounded.adjusted()
+    if exponent >= precision:
+        digits = "".join(map(str, rounded.as_tuple().digits)).ljust(precision, "0")
+        sign = "-" if rounded.is_signed() else ""
+        return f"{sign}{digits[0]}.{digits[1:]}e+{exponent}"
+    return f"{rounded:.{precision - 1 - exponent}f}"
+
+
+def format_token_amount(amount):
+    return to_precision(Decimal(amount) / 10**18)
+
+
+def format_price(sqrt_price_x96):
+    return to_precision((Decimal(sqrt_price_x96) / 2**96) ** 2)
+
+
 def get_position_key(address: str, lower_tick: int, upper_tick: int) -> bytes:
-    packed_data = encode_packed(
-        ["address", "int24", "int24"], [address, lower_tick, upper_tick]
+    return position_key(address, lower_tick, upper_tick)
+
+
+def get_create2_address(factory_address: str, tokens, fee: int, bytecode: bytes) -> str:
+    token0, token1 = sorted(tokens, key=lambda token: token.lower())
+    # abi.encode(token0, token1, fee) pads every value to 32 bytes
+    salt = keccak(
+        encode_packed(
+            ["uint256", "uint256", "uint256"], [int(token0, 16), int(token1, 16), fee]
+        )
+    )
+    create2_input = encode_packed(
+        ["bytes1", "address", "bytes32", "bytes32"],
+        [b"\xff", factory_address, salt, keccak(bytecode)],
     )
-    return keccak(packed_data)
+    return to_checksum_address(keccak(create2_input)[12:])
 
 
 def check_observation_equals(observation, expected_observation):
@@ -65,6 +135,17 @@ def check_observation_equals(observation, expected_observation):
         assert observation[key] == value
 
 
+def approve_max(token, spender, sender):
+    """
+    Approves spender to transfer all tokens of sender, unless this has already been
+    done in the current test
+    """
+    if approval_cache.is_granted(token.address, spender.address, sender.address):
+        return
+    token.approve(spender.address, MAX_UINT_256, sender=sender)
+    approval_cache.grant(token.address, spender.address, sender.address)
+
+
 def create_pool(fee, tick_spacing, first_token, second_token, factory, deployer_acc):
     mock_time_pool_deployer = project.MockTimeUniswapV3PoolDeployer.deploy(
         sender=deployer_acc
@@ -99,6 +180,28 @@ def check_tick_is_not_clear(pool, tick):
     assert liquidity_gross != 0
 
 
+def transaction_logs(tx):
+    return receipt_logs(
+        tx,
+        lambda: [(log["address"], log["topics"], log["data"]) for log in tx.logs],
+    )
+
+
+def events(tx, contract, event_name):
+    """
+    Arguments of the logs of an event emitted by the contract in the transaction by
+    their ABI names, only the logs of that event are decoded
+    """
+    abi = getattr(contract, event_name).abi.dict()
+    return transaction_logs(tx).events(event_codec(abi), contract.address)
+
+
+def event_emitted(tx, contract, event_name, args) -> bool:
+    abi = getattr(contract, event_name).abi.dict()
+    args = {name: getattr(value, "address", value) for name, value in args.items()}
+    return transaction_logs(tx).emitted(event_codec(abi), args, contract.address)
+
+
 # Checks if one event in events data that has ContractLog instances for specific event data
 def check_raised_event(events, *args):
     for event in events:
@@ -153,7 +256,7 @@ class PoolHelper:
             sqrt_price_limit_x96 = (
                 MIN_SQRT_RATIO + 1 if input_token == self.token0 else MAX_SQRT_RATIO - 1
             )
-        input_token.approve(self.swap_target.address, MAX_UINT_256, sender=sender)
+        approve_max(input_token, self.swap_target, sender)
         to_address = to if isinstance(to, str) else to.address
         return method(
             self.pool.address,
@@ -164,8 +267,8 @@ class PoolHelper:
         )
 
     def mint(self, recipient, tick_lower, tick_upper, liquidity, sender):
-        self.token0.approve(self.swap_target.address, MAX_UINT_256, sender=sender)
-        self.token1.approve(self.swap_target.address, MAX_UINT_256, sender=sender)
+        approve_max(self.token0, self.swap_target, sender)
+        approve_max(self.token1, self.swap_target, sender)
         return self.swap_target.mint(
             self.pool.address,
             recipient,
@@ -175,7 +278,7 @@ class PoolHelper:
             sender=sender,
         )
 
-    def flash(self, amount0, amount1, to, pay0=None, pay1=None):
+    def flash(self, amount0, amount1, to, sender, pay0=None, pay1=None):
         fee = self.pool.fee()
         if pay0 is None:
             pay0 = (amount0 * fee + 10**6 - 1) // 10**6 + amount0
@@ -188,23 +291,24 @@ class PoolHelper:
             amount1,
             pay0,
             pay1,
+            sender=sender,
         )
 
-    def swap_to_sqrt_price(self, input_token, target_price, to):
+    def swap_to_sqrt_price(self, input_token, target_price, to, sender):
         method = (
             self.swap_target.swapToLowerSqrtPrice
             if input_token == self.token0
             else self.swap_target.swapToHigherSqrtPrice
         )
-        input_token.approve(self.swap_target.address, MAX_UINT_256)
+        approve_max(input_token, self.swap_target, sender)
         to_address = to if isinstance(to, str) else to.address
-        return method(self.pool.address, target_price, to_address)
+        return method(self.pool.address, target_price, to_address, sender=sender)
 
-    def swap_to_lower_price(self, sqrt_price_x96, to):
-        return self.swap_to_sqrt_price(self.token0, sqrt_price_x96, to)
+    def swap_to_lower_price(self, sqrt_price_x96, to, sender):
+        return self.swap_to_sqrt_price(self.token0, sqrt_price_x96, to, sender)
 
-    def swap_to_higher_price(self, sqrt_price_x96, to):
-        return self.swap_to_sqrt_price(self.token1, sqrt_price_x96, to)
+    def swap_to_higher_price(self, sqrt_price_x96, to, sender):
+        return self.swap_to_sqrt_price(self.token1, sqrt_price_x96, to, sender)
 
     def swap_exact_0_for_1(self, amount, to, sender, sqrt_price_limit_x96=None):
         return self.swap(self.token0, amount, 0, to, sender, sqrt_price_limit_x96)
@@ -217,3 +321,38 @@ class PoolHelper:
 
     def swap_1_for_exact_0(self, amount, to, sender, sqrt_price_limit_x96=None):
         return self.swap(self.token1, 0, amount, to, sender, sqrt_price_limit_x96)
+
+
+class MultiPoolHelper:
+    def __init__(
+        self,
+        input_token: project.TestERC20,
+        swap_target: project.TestUniswapV3Router,
+        pool_input: project.UniswapV3Pool,
+        pool_output: project.UniswapV3Pool,
+    ):
+        self.input_token = input_token
+        self.swap_target = swap_target
+        self.pool_input = pool_input
+        self.pool_output = pool_output
+
+    def swap_for_exact_multi(self, method, amount_out, to, sender):
+        approve_max(self.input_token, self.swap_target, sender)
+        to_address = to if isinstance(to, str) else to.address
+        return method(
+            to_address,
+            self.pool_input.address,
+            self.pool_output.address,
+            amount_out,
+            sender=sender,
+        )
+
+    def swap_for_exact_0_multi(self, amount_out, to, sender):
+        return self.swap_for_exact_multi(
+            self.swap_target.swapForExact0Multi, amount_out, to, sender
+        )
+
+    def swap_for_exact_1_multi(self, amount_out, to, sender):
+        return self.swap_for_exact_multi(
+            self.swap_target.swapForExact1Multi, amount_out, to, sender
+        )
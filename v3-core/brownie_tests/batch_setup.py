@@ -0,0 +1,13 @@
+from brownie_tests.driver import send_request
+from drivers.batch_setup import FixtureBatchSetup
+
+
+class BrownieFixtureBatchSetup(FixtureBatchSetup):
+    def request(self, method, params=()):
+        return send_request(method, params)
+
+    def creation_code(self, contract_type):
+        return bytes.fromhex(contract_type.bytecode)
+
+
+batch_setup = BrownieFixtureBatchSetup()
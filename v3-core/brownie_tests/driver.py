@@ -0,0 +1,55 @@
+import brownie
+from brownie import (MockTimeUniswapV3Pool, MockTimeUniswapV3PoolDeployer,
+                     TestERC20, TestUniswapV3Callee, UniswapV3Factory,
+                     accounts)
+
+from brownie_utils import brownie_reverts_fix
+from drivers.base import Driver, normalize
+from drivers.rpc_driver import provider_request
+
+CONTRACTS = {
+    "MockTimeUniswapV3Pool": MockTimeUniswapV3Pool,
+    "MockTimeUniswapV3PoolDeployer": MockTimeUniswapV3PoolDeployer,
+    "TestERC20": TestERC20,
+    "TestUniswapV3Callee": TestUniswapV3Callee,
+    "UniswapV3Factory": UniswapV3Factory,
+}
+
+
+def send_request(method, params=()):
+    return provider_request(brownie.web3.provider, method, params)
+
+
+class BrownieDriver(Driver):
+    name = "brownie"
+
+    @property
+    def accounts(self):
+        return accounts
+
+    def address(self, contract_or_account):
+        return contract_or_account.address
+
+    def deploy(self, contract_name, *args, sender):
+        return CONTRACTS[contract_name].deploy(*args, {"from": sender})
+
+    def at(self, contract_name, address):
+        return CONTRACTS[contract_name].at(address)
+
+    def call(self, contract, function, *args):
+        return normalize(getattr(contract, function).call(*args))
+
+    def transact(self, contract, function, *args, sender):
+        return getattr(contract, function)(*args, {"from": sender})
+
+    def events(self, tx, contract, event_name):
+        if event_name not in tx.events:
+            return []
+        return [
+            normalize(dict(event))
+            for event in tx.events[event_name]
+            if event.address == contract.address
+        ]
+
+    def reverts(self, reason=None):
+        return brownie.reverts() if reason is None else brownie_reverts_fix(reason)
@@ -0,0 +1,29 @@
+from pathlib import Path
+
+from brownie.network.account import _PrivateKeyAccount
+from brownie.network.contract import ContractContainer
+
+from drivers.impact import impact_recorder
+
+IMPACT_INDEX_FILE = Path(__file__).parent / "impact_index.json"
+
+
+def instrument_contracts():
+    """
+    Reports the contract container of every deployment of Brownie and of every contract
+    attached to with ContractContainer.at to the impact recorder,
+    ContractContainer.deploy deploys through the account as well
+    """
+    deploy = _PrivateKeyAccount.deploy
+    at = ContractContainer.at
+
+    def recorded_deploy(self, contract, *args, **kwargs):
+        impact_recorder.used(contract._name)
+        return deploy(self, contract, *args, **kwargs)
+
+    def recorded_at(self, *args, **kwargs):
+        impact_recorder.used(self._name)
+        return at(self, *args, **kwargs)
+
+    _PrivateKeyAccount.deploy = recorded_deploy
+    ContractContainer.at = recorded_at
@@ -0,0 +1,58 @@
+import json
+import os
+from pathlib import Path
+
+from eth_utils import keccak
+
+from brownie_tests.driver import send_request
+from drivers.impact import impact_recorder
+from drivers.workers import worker_path
+
+STATE_IMAGE_ENABLED = os.environ.get("STATE_IMAGE", "") not in ("", "0")
+
+STATE_IMAGE_FILE = worker_path(Path(__file__).parent / "state_image.json")
+
+
+def state_image_supported() -> bool:
+    # Hardhat and Ganache have no RPC methods to dump and load the whole chain state
+    return send_request("web3_clientVersion").lower().startswith("anvil")
+
+
+def bytecode_hash(contract_types) -> str:
+    """
+    Hash of the creation code of the contracts in the image, an image built from
+    a different compilation is rebuilt
+    """
+    return keccak(
+        b"".join(
+            bytes.fromhex(contract_type.bytecode) for contract_type in contract_types
+        )
+    ).hex()
+
+
+def load_state_image(build, contract_types, path=STATE_IMAGE_FILE):
+    """
+    Loads the chain state from the image and returns the addresses of its contracts
+    by name. If the image does not exist yet or is stale, build is called to deploy
+    the contracts (returned by name) and the resulting chain state is stored.
+    """
+    # the image holds the contracts even if the tests attach only to some of them
+    for contract_type in contract_types:
+        impact_recorder.used(contract_type._name)
+    code_hash = bytecode_hash(contract_types)
+    if path.exists():
+        with open(path, "r") as f:
+            image = json.load(f)
+        if image["bytecode_hash"] == code_hash:
+            send_request("anvil_loadState", [image["state"]])
+            return image["contracts"]
+
+    contracts = {name: contract.address for name, contract in build().items()}
+    image = {
+        "bytecode_hash": code_hash,
+        "contracts": contracts,
+        "state": send_request("anvil_dumpState"),
+    }
+    with open(path, "w") as f:
+        json.dump(image, f, indent=2)
+    return contracts
@@ -0,0 +1,25 @@
+import os
+
+import pytest
+
+from brownie_tests.driver import BrownieDriver
+from drivers.scenarios import SCENARIOS
+
+# Framework-neutral scenarios of drivers/scenarios.py, the same operations in every
+# suite and in the web3 baseline. Skipped by default so that the measured suite stays
+# the same.
+DRIVER_SCENARIOS = os.environ.get("DRIVER_SCENARIOS", "") not in ("", "0")
+
+pytestmark = pytest.mark.skipif(
+    not DRIVER_SCENARIOS, reason="driver scenarios run only with DRIVER_SCENARIOS=1"
+)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolation(fn_isolation):
+    pass
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_scenario(name):
+    SCENARIOS[name](BrownieDriver())
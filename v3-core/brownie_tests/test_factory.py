@@ -0,0 +1,265 @@
+import pytest
+from brownie import UniswapV3Factory, UniswapV3Pool, accounts, web3
+
+import utils
+from brownie_utils import brownie_reverts_fix
+from utils import FeeAmount, TickSpacings
+
+pytestmark = pytest.mark.extended
+
+TEST_ADDRESSES = [
+    "0x1000000000000000000000000000000000000000",
+    "0x2000000000000000000000000000000000000000",
+]
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+# EIP-170 limit, the TypeScript snapshots of exact bytecode sizes depend on
+# compiler settings that differ between the frameworks
+MAX_CODE_SIZE = 24576
+
+
+@pytest.fixture(scope="function")
+def factory():
+    return UniswapV3Factory.deploy({"from": accounts[0]})
+
+
+def create_and_check_pool(factory, tokens, fee_amount, tick_spacing):
+    create2_address = utils.get_create2_address(
+        factory.address,
+        tokens,
+        fee_amount,
+        bytes.fromhex(UniswapV3Pool.bytecode),
+    )
+    tx = factory.createPool(tokens[0], tokens[1], fee_amount, {"from": accounts[0]})
+    assert "PoolCreated" in tx.events
+    assert tx.events["PoolCreated"]["token0"] == TEST_ADDRESSES[0]
+    assert tx.events["PoolCreated"]["token1"] == TEST_ADDRESSES[1]
+    assert tx.events["PoolCreated"]["fee"] == fee_amount
+    assert tx.events["PoolCreated"]["tickSpacing"] == tick_spacing
+    assert tx.events["PoolCreated"]["pool"] == create2_address
+
+    with brownie_reverts_fix():
+        factory.createPool(tokens[0], tokens[1], fee_amount, {"from": accounts[0]})
+    with brownie_reverts_fix():
+        factory.createPool(tokens[1], tokens[0], fee_amount, {"from": accounts[0]})
+    # getPool in order and in reverse
+    assert factory.getPool(tokens[0], tokens[1], fee_amount) == create2_address
+    assert factory.getPool(tokens[1], tokens[0], fee_amount) == create2_address
+
+    pool = UniswapV3Pool.at(create2_address)
+    assert pool.factory() == factory.address
+    assert pool.token0() == TEST_ADDRESSES[0]
+    assert pool.token1() == TEST_ADDRESSES[1]
+    assert pool.fee() == fee_amount
+    assert pool.tickSpacing() == tick_spacing
+
+
+class TestFactory:
+    def test_owner_is_deployer(self, factory):
+        """
+        owner is deployer
+        """
+        assert factory.owner() == accounts[0].address
+
+    def test_factory_bytecode_size(self, factory):
+        """
+        factory bytecode size
+        """
+        assert 0 < len(web3.eth.get_code(factory.address)) <= MAX_CODE_SIZE
+
+    def test_pool_bytecode_size(self, factory):
+        """
+        pool bytecode size
+        """
+        factory.createPool(
+            TEST_ADDRESSES[0],
+            TEST_ADDRESSES[1],
+            FeeAmount.MEDIUM,
+            {"from": accounts[0]},
+        )
+        pool_address = utils.get_create2_address(
+            factory.address,
+            TEST_ADDRESSES,
+            FeeAmount.MEDIUM,
+            bytes.fromhex(UniswapV3Pool.bytecode),
+        )
+        assert 0 < len(web3.eth.get_code(pool_address)) <= MAX_CODE_SIZE
+
+    def test_initial_enabled_fee_amounts(self, factory):
+        """
+        initial enabled fee amounts
+        """
+        assert factory.feeAmountTickSpacing(FeeAmount.LOW) == TickSpacings.LOW
+        assert factory.feeAmountTickSpacing(FeeAmount.MEDIUM) == TickSpacings.MEDIUM
+        assert factory.feeAmountTickSpacing(FeeAmount.HIGH) == TickSpacings.HIGH
+
+
+class TestCreatePool:
+    @pytest.mark.parametrize(
+        "fee_amount,tick_spacing",
+        [
+            (FeeAmount.LOW, TickSpacings.LOW),
+            (FeeAmount.MEDIUM, TickSpacings.MEDIUM),
+            (FeeAmount.HIGH, TickSpacings.HIGH),
+        ],
+        ids=["low", "medium", "high"],
+    )
+    def test_succeeds_for_fee_pool(self, factory, fee_amount, tick_spacing):
+        """
+        succeeds for low/medium/high fee pool
+        """
+        create_and_check_pool(factory, TEST_ADDRESSES, fee_amount, tick_spacing)
+
+    def test_succeeds_if_tokens_are_passed_in_reverse(self, factory):
+        """
+        succeeds if tokens are passed in reverse
+        """
+        create_and_check_pool(
+            factory,
+            [TEST_ADDRESSES[1], TEST_ADDRESSES[0]],
+            FeeAmount.MEDIUM,
+            TickSpacings.MEDIUM,
+        )
+
+    def test_fails_if_token_a_equals_token_b(self, factory):
+        """
+        fails if token a == token b
+        """
+        with brownie_reverts_fix():
+            factory.createPool(
+                TEST_ADDRESSES[0],
+                TEST_ADDRESSES[0],
+                FeeAmount.LOW,
+                {"from": accounts[0]},
+            )
+
+    def test_fails_if_token_a_is_0_or_token_b_is_0(self, factory):
+        """
+        fails if token a is 0 or token b is 0
+        """
+        with brownie_reverts_fix():
+            factory.createPool(
+                TEST_ADDRESSES[0],
+                ZERO_ADDRESS,
+                FeeAmount.LOW,
+                {"from": accounts[0]},
+            )
+        with brownie_reverts_fix():
+            factory.createPool(
+                ZERO_ADDRESS,
+                TEST_ADDRESSES[0],
+                FeeAmount.LOW,
+                {"from": accounts[0]},
+            )
+        with brownie_reverts_fix():
+            factory.createPool(
+                ZERO_ADDRESS,
+                ZERO_ADDRESS,
+                FeeAmount.LOW,
+                {"from": accounts[0]},
+            )
+
+    def test_fails_if_fee_amount_is_not_enabled(self, factory):
+        """
+        fails if fee amount is not enabled
+        """
+        with brownie_reverts_fix():
+            factory.createPool(
+                TEST_ADDRESSES[0],
+                TEST_ADDRESSES[1],
+                250,
+                {"from": accounts[0]},
+            )
+
+
+class TestSetOwner:
+    def test_fails_if_caller_is_not_owner(self, factory):
+        """
+        fails if caller is not owner
+        """
+        with brownie_reverts_fix():
+            factory.setOwner(accounts[0], {"from": accounts[1]})
+
+    def test_updates_owner(self, factory):
+        """
+        updates owner
+        """
+        factory.setOwner(accounts[1], {"from": accounts[0]})
+        assert factory.owner() == accounts[1].address
+
+    def test_emits_event(self, factory):
+        """
+        emits event
+        """
+        tx = factory.setOwner(accounts[1], {"from": accounts[0]})
+        assert "OwnerChanged" in tx.events
+        assert tx.events["OwnerChanged"]["oldOwner"] == accounts[0]
+        assert tx.events["OwnerChanged"]["newOwner"] == accounts[1]
+
+    def test_cannot_be_called_by_original_owner(self, factory):
+        """
+        cannot be called by original owner
+        """
+        factory.setOwner(accounts[1], {"from": accounts[0]})
+        with brownie_reverts_fix():
+            factory.setOwner(accounts[0], {"from": accounts[0]})
+
+
+class TestEnableFeeAmount:
+    def test_fails_if_caller_is_not_owner(self, factory):
+        """
+        fails if caller is not owner
+        """
+        with brownie_reverts_fix():
+            factory.enableFeeAmount(100, 2, {"from": accounts[1]})
+
+    def test_fails_if_fee_is_too_great(self, factory):
+        """
+        fails if fee is too great
+        """
+        with brownie_reverts_fix():
+            factory.enableFeeAmount(1000000, 10, {"from": accounts[0]})
+
+    def test_fails_if_tick_spacing_is_too_small(self, factory):
+        """
+        fails if tick spacing is too small
+        """
+        with brownie_reverts_fix():
+            factory.enableFeeAmount(500, 0, {"from": accounts[0]})
+
+    def test_fails_if_tick_spacing_is_too_large(self, factory):
+        """
+        fails if tick spacing is too large
+        """
+        with brownie_reverts_fix():
+            factory.enableFeeAmount(500, 16834, {"from": accounts[0]})
+
+    def test_fails_if_already_initialized(self, factory):
+        """
+        fails if already initialized
+        """
+        factory.enableFeeAmount(100, 5, {"from": accounts[0]})
+        with brownie_reverts_fix():
+            factory.enableFeeAmount(100, 10, {"from": accounts[0]})
+
+    def test_sets_the_fee_amount_in_the_mapping(self, factory):
+        """
+        sets the fee amount in the mapping
+        """
+        factory.enableFeeAmount(100, 5, {"from": accounts[0]})
+        assert factory.feeAmountTickSpacing(100) == 5
+
+    def test_emits_an_event(self, factory):
+        """
+        emits an event
+        """
+        tx = factory.enableFeeAmount(100, 5, {"from": accounts[0]})
+        assert "FeeAmountEnabled" in tx.events
+        assert tx.events["FeeAmountEnabled"]["fee"] == 100
+        assert tx.events["FeeAmountEnabled"]["tickSpacing"] == 5
+
+    def test_enables_pool_creation(self, factory):
+        """
+        enables pool creation
+        """
+        factory.enableFeeAmount(250, 15, {"from": accounts[0]})
+        create_and_check_pool(factory, TEST_ADDRESSES, 250, 15)
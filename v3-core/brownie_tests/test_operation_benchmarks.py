@@ -0,0 +1,95 @@
+import os
+
+import brownie
+import pytest
+from brownie import BitMathTest, TestERC20, UniswapV3Factory, accounts
+
+import utils
+from brownie_utils import brownie_reverts_fix
+from drivers.benchmarks import timings
+
+# Times every framework primitive OPERATION_BENCHMARK_REPEATS times in isolation:
+# deploys, calls, transactions, reverts, event decoding and time travel.
+# Skipped by default so that the measured suite stays the same.
+OPERATION_BENCHMARK_REPEATS = int(os.environ.get("OPERATION_BENCHMARK_REPEATS", "0"))
+
+pytestmark = pytest.mark.skipif(
+    OPERATION_BENCHMARK_REPEATS < 1,
+    reason="operation benchmarks run only with OPERATION_BENCHMARK_REPEATS >= 1",
+)
+
+
+@pytest.fixture(scope="module")
+def contracts(module_isolation):
+    token = TestERC20.deploy(2**255, {"from": accounts[0]})
+    other_token = TestERC20.deploy(2**255, {"from": accounts[0]})
+    bit_math = BitMathTest.deploy({"from": accounts[0]})
+    factory = UniswapV3Factory.deploy({"from": accounts[0]})
+    pool = utils.create_pool(
+        utils.FeeAmount.MEDIUM,
+        utils.TickSpacings.MEDIUM,
+        token,
+        other_token,
+        factory,
+        accounts[0],
+    )
+    return token, bit_math, pool
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolation(contracts, fn_isolation):
+    pass
+
+
+class TestOperationBenchmarks:
+    def test_deploy(self):
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation deploy TestERC20"):
+                TestERC20.deploy(2**255, {"from": accounts[0]})
+            with timings.measure("operation deploy BitMathTest"):
+                BitMathTest.deploy({"from": accounts[0]})
+
+    def test_call(self, contracts):
+        token, bit_math, _ = contracts
+        for i in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation call mostSignificantBit"):
+                result = bit_math.mostSignificantBit(2 ** (i % 256))
+            assert result == i % 256
+            with timings.measure("operation call balanceOf"):
+                balance = token.balanceOf(accounts[0])
+            assert balance == 2**255
+
+    def test_transaction(self, contracts):
+        token, _, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation transaction transfer"):
+                token.transfer(accounts[1], 1, {"from": accounts[0]})
+        assert token.balanceOf(accounts[1]) == OPERATION_BENCHMARK_REPEATS
+
+    def test_revert(self, contracts):
+        token, bit_math, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation revert call"):
+                with brownie.reverts():
+                    bit_math.mostSignificantBit(0)
+            with timings.measure("operation revert transaction with reason"):
+                with brownie_reverts_fix("insufficient balance"):
+                    token.transfer(accounts[0], 1, {"from": accounts[1]})
+
+    def test_event_decoding(self, contracts):
+        token, _, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            tx = token.transfer(accounts[1], 1, {"from": accounts[0]})
+            with timings.measure("operation event decoding"):
+                assert "Transfer" in tx.events
+                assert tx.events["Transfer"]["from"] == accounts[0]
+                assert tx.events["Transfer"]["to"] == accounts[1]
+                assert tx.events["Transfer"]["value"] == 1
+
+    def test_time_travel(self, contracts):
+        _, _, pool = contracts
+        start = pool.time()
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation time travel"):
+                pool.advanceTime(1, {"from": accounts[0]})
+        assert pool.time() == start + OPERATION_BENCHMARK_REPEATS
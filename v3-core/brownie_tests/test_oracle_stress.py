@@ -0,0 +1,228 @@
+import bisect
+import os
+
+import brownie
+import pytest
+from brownie import OracleTest, accounts
+
+from drivers.benchmarks import timings
+from utils import TEST_POOL_START_TIME
+
+# Grows the oracle to ORACLE_STRESS_CARDINALITY observations (65535 is the maximum)
+# and fills every slot before observing it.
+# Skipped by default so that the measured suite stays the same.
+ORACLE_STRESS_CARDINALITY = int(os.environ.get("ORACLE_STRESS_CARDINALITY", "0"))
+ORACLE_STRESS_BATCH_SIZE = int(os.environ.get("ORACLE_STRESS_BATCH_SIZE", "300"))
+ORACLE_STRESS_REPEATS = int(os.environ.get("ORACLE_STRESS_REPEATS", "10"))
+OBSERVE_BATCH_SIZES = [
+    int(size)
+    for size in os.environ.get("ORACLE_STRESS_OBSERVE_BATCHES", "1,10,100,1000").split(
+        ","
+    )
+]
+
+pytestmark = pytest.mark.skipif(
+    ORACLE_STRESS_CARDINALITY < 2,
+    reason="oracle stress tests run only with ORACLE_STRESS_CARDINALITY >= 2",
+)
+
+SECONDS_PER_UPDATE = 13
+# time covered by the observations of the maxed out oracle
+OBSERVATION_WINDOW = SECONDS_PER_UPDATE * (ORACLE_STRESS_CARDINALITY - 1)
+
+OBSERVE_POINTS = [
+    seconds_ago
+    for seconds_ago in [
+        0,
+        100 * SECONDS_PER_UPDATE,
+        100 * SECONDS_PER_UPDATE + 5,
+        200 * SECONDS_PER_UPDATE,
+        200 * SECONDS_PER_UPDATE + 5,
+        OBSERVATION_WINDOW,
+    ]
+    if seconds_ago <= OBSERVATION_WINDOW
+]
+OBSERVE_POINTS_AFTER_5_SECONDS = [3, 5, OBSERVATION_WINDOW + 5]
+
+
+def truncating_div(a, b):
+    # Solidity signed division rounds towards zero
+    q = abs(a) // abs(b)
+    return q if (a >= 0) == (b > 0) else -q
+
+
+class OracleModel:
+    """
+    Python reference of OracleTest used to check observe results of a grown oracle.
+    Assumes block timestamps do not overflow uint32.
+    """
+
+    def __init__(self, time, tick, liquidity, cardinality):
+        self.time = time
+        self.tick = tick
+        self.liquidity = liquidity
+        self.cardinality = cardinality
+        # (blockTimestamp, tickCumulative, secondsPerLiquidityCumulativeX128), oldest first
+        self.observations = [(time, 0, 0)]
+
+    def transform(self, last, block_timestamp):
+        delta = block_timestamp - last[0]
+        return (
+            block_timestamp,
+            last[1] + self.tick * delta,
+            (last[2] + (delta << 128) // max(self.liquidity, 1)) % 2**160,
+        )
+
+    def update(self, advance_time_by, tick, liquidity):
+        self.time += advance_time_by
+        if self.observations[-1][0] != self.time:
+            self.observations.append(self.transform(self.observations[-1], self.time))
+            if len(self.observations) > self.cardinality:
+                del self.observations[0]
+        self.tick = tick
+        self.liquidity = liquidity
+
+    def observe_single(self, seconds_ago):
+        target = self.time - seconds_ago
+        newest = self.observations[-1]
+        if target >= newest[0]:
+            if target != newest[0]:
+                newest = self.transform(newest, target)
+            return newest[1], newest[2]
+        if target < self.observations[0][0]:
+            raise ValueError("OLD")
+
+        i = bisect.bisect_right(self.observations, (target, float("inf"), 0)) - 1
+        before_or_at = self.observations[i]
+        if before_or_at[0] == target:
+            return before_or_at[1], before_or_at[2]
+        at_or_after = self.observations[i + 1]
+        observation_time_delta = at_or_after[0] - before_or_at[0]
+        target_delta = target - before_or_at[0]
+        return (
+            before_or_at[1]
+            + truncating_div(at_or_after[1] - before_or_at[1], observation_time_delta)
+            * target_delta,
+            (
+                before_or_at[2]
+                + (at_or_after[2] - before_or_at[2])
+                % 2**160
+                * target_delta
+                // observation_time_delta
+            )
+            % 2**160,
+        )
+
+    def observe(self, seconds_agos):
+        results = [self.observe_single(seconds_ago) for seconds_ago in seconds_agos]
+        return [result[0] for result in results], [result[1] for result in results]
+
+
+def observe(oracle, seconds_agos):
+    tick_cumulatives, seconds_per_liquidity_cumulative_x128s = oracle.observe(
+        seconds_agos
+    )
+    return list(tick_cumulatives), list(seconds_per_liquidity_cumulative_x128s)
+
+
+def spread_seconds_agos(size):
+    """
+    Returns size secondsAgos evenly spread over the observation window, newest first
+    """
+    return [OBSERVATION_WINDOW * i // size for i in range(size)]
+
+
+@pytest.fixture(scope="module")
+def maxed_out_oracle(module_isolation):
+    oracle = OracleTest.deploy({"from": accounts[0]})
+    oracle.initialize((TEST_POOL_START_TIME, 0, 0), {"from": accounts[0]})
+    model = OracleModel(TEST_POOL_START_TIME, 0, 0, ORACLE_STRESS_CARDINALITY)
+
+    cardinality_next = oracle.cardinalityNext()
+    while cardinality_next < ORACLE_STRESS_CARDINALITY:
+        grow_to = min(
+            ORACLE_STRESS_CARDINALITY, cardinality_next + ORACLE_STRESS_BATCH_SIZE
+        )
+        with timings.measure("oracle grow"):
+            oracle.grow(grow_to, {"from": accounts[0]})
+        cardinality_next = grow_to
+
+    for i in range(0, ORACLE_STRESS_CARDINALITY, ORACLE_STRESS_BATCH_SIZE):
+        batch = [
+            (SECONDS_PER_UPDATE, -i - j, i + j) for j in range(ORACLE_STRESS_BATCH_SIZE)
+        ]
+        with timings.measure("oracle batchUpdate"):
+            oracle.batchUpdate(batch, {"from": accounts[0]})
+        for update in batch:
+            model.update(*update)
+
+    return oracle, model
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolation(maxed_out_oracle, fn_isolation):
+    pass
+
+
+class TestFullOracle:
+    def test_has_max_cardinality_next(self, maxed_out_oracle):
+        """
+        Has max cardinality next
+        """
+        oracle, model = maxed_out_oracle
+        assert oracle.cardinalityNext() == ORACLE_STRESS_CARDINALITY
+
+    def test_has_max_cardinality(self, maxed_out_oracle):
+        """
+        Has max cardinality
+        """
+        oracle, model = maxed_out_oracle
+        assert oracle.cardinality() == ORACLE_STRESS_CARDINALITY
+
+    def test_index_wrapped_around(self, maxed_out_oracle):
+        """
+        Index wrapped around
+        """
+        oracle, model = maxed_out_oracle
+        writes = len(range(0, ORACLE_STRESS_CARDINALITY, ORACLE_STRESS_BATCH_SIZE))
+        writes *= ORACLE_STRESS_BATCH_SIZE
+        assert oracle.index() == writes % ORACLE_STRESS_CARDINALITY
+
+    @pytest.mark.parametrize("seconds_ago", OBSERVE_POINTS)
+    def test_observe_matches_model(self, maxed_out_oracle, seconds_ago):
+        """
+        Observe matches the reference model
+        """
+        oracle, model = maxed_out_oracle
+        assert observe(oracle, [seconds_ago]) == model.observe([seconds_ago])
+
+    @pytest.mark.parametrize("seconds_ago", OBSERVE_POINTS_AFTER_5_SECONDS)
+    def test_observe_after_5_seconds_matches_model(self, maxed_out_oracle, seconds_ago):
+        """
+        Observe after some time passes matches the reference model
+        """
+        oracle, model = maxed_out_oracle
+        oracle.advanceTime(5, {"from": accounts[0]})
+        # the model is shared by the whole module, so the elapsed time is
+        # subtracted from secondsAgo instead of advancing the model
+        assert observe(oracle, [seconds_ago]) == model.observe([seconds_ago - 5])
+
+    def test_observe_older_than_oldest_reverts(self, maxed_out_oracle):
+        """
+        Observe older than the oldest observation reverts
+        """
+        oracle, model = maxed_out_oracle
+        with brownie.reverts("OLD"):
+            oracle.observe([OBSERVATION_WINDOW + 1])
+
+    @pytest.mark.parametrize("size", OBSERVE_BATCH_SIZES)
+    def test_observe_batch_latency(self, maxed_out_oracle, size):
+        """
+        Observe latency for a batch of secondsAgos spread over the whole window
+        """
+        oracle, model = maxed_out_oracle
+        seconds_agos = spread_seconds_agos(size)
+        for _ in range(ORACLE_STRESS_REPEATS):
+            with timings.measure(f"observe batch {size}"):
+                result = observe(oracle, seconds_agos)
+        assert result == model.observe(seconds_agos)
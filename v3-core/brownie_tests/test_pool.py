@@ -1,19 +1,34 @@
 import brownie
 import pytest
-from brownie import (MockTimeUniswapV3Pool, TestERC20, TestUniswapV3Callee,
-                     UniswapV3Factory, accounts)
+from brownie import (MockTimeUniswapV3Pool, MockTimeUniswapV3PoolDeployer,
+                     TestERC20, TestUniswapV3Callee, UniswapV3Factory,
+                     accounts)
 
 import utils
+from brownie_tests.batch_setup import batch_setup
+from brownie_tests.state_image import (STATE_IMAGE_ENABLED, load_state_image,
+                                       state_image_supported)
 from brownie_utils import brownie_reverts_fix
+from drivers.approvals import approval_cache
+from drivers.batch_setup import BATCH_SETUP_ENABLED
 from utils import (MAX_SQRT_RATIO, MAX_UINT_128, MIN_SQRT_RATIO,
                    TEST_POOL_START_TIME)
 
 
-@pytest.fixture(scope="function")
-def tokens():
-    token0 = TestERC20.deploy(2**255, {"from": accounts[0]})
-    token1 = TestERC20.deploy(2**255, {"from": accounts[0]})
-    token2 = TestERC20.deploy(2**255, {"from": accounts[0]})
+def deploy_tokens():
+    deployer = utils.get_deployer()
+    token0 = TestERC20.deploy(2**255, {"from": deployer})
+    token1 = TestERC20.deploy(2**255, {"from": deployer})
+    token2 = TestERC20.deploy(2**255, {"from": deployer})
+    if utils.DETERMINISTIC_ADDRESSES:
+        # the tests expect the whole supply in the first test account
+        for token in (token0, token1, token2):
+            token.transfer(accounts[0], 2**255, {"from": deployer})
+        # transactions without "from" are sent by the owner of the contract object
+        token0, token1, token2 = (
+            TestERC20.at(token.address, owner=accounts[0])
+            for token in (token0, token1, token2)
+        )
 
     token0, token1, token2 = sorted(
         [token0, token1, token2], key=lambda token: token.address.lower()
@@ -21,25 +36,158 @@ def tokens():
     return token0, token1, token2
 
 
+def deploy_factory():
+    deployer = utils.get_deployer()
+    factory = UniswapV3Factory.deploy({"from": deployer})
+    if utils.DETERMINISTIC_ADDRESSES:
+        factory.setOwner(accounts[0], {"from": deployer})
+        factory = UniswapV3Factory.at(factory.address, owner=accounts[0])
+    return factory
+
+
+def deploy_pool(token0, token1, factory):
+    deployer = utils.get_deployer()
+    pool = utils.create_pool(
+        utils.FeeAmount.MEDIUM,
+        utils.TickSpacings.MEDIUM,
+        token0,
+        token1,
+        factory,
+        deployer,
+    )
+    swap_target = TestUniswapV3Callee.deploy({"from": deployer})
+    if utils.DETERMINISTIC_ADDRESSES:
+        swap_target = TestUniswapV3Callee.at(swap_target.address, owner=accounts[0])
+    return pool, swap_target
+
+
+def deploy_fixture_contracts():
+    token0, token1, token2 = deploy_tokens()
+    factory = deploy_factory()
+    pool, swap_target = deploy_pool(token0, token1, factory)
+    return {
+        "token0": token0,
+        "token1": token1,
+        "token2": token2,
+        "factory": factory,
+        "pool": pool,
+        "swap_target": swap_target,
+    }
+
+
+@pytest.fixture(scope="module")
+def state_image():
+    """
+    Addresses of the fixture contracts if the chain is booted from the state image,
+    None if the fixtures deploy them
+    """
+    if not STATE_IMAGE_ENABLED or not state_image_supported():
+        return None
+    return load_state_image(
+        deploy_fixture_contracts,
+        [
+            TestERC20,
+            UniswapV3Factory,
+            MockTimeUniswapV3PoolDeployer,
+            TestUniswapV3Callee,
+        ],
+    )
+
+
+@pytest.fixture(scope="function", autouse=True)
+def fixture_isolation(request, state_image):
+    # the contracts of the image are shared by all tests and the deterministic
+    # addresses are free only if every test starts from the same state
+    if state_image is not None or utils.DETERMINISTIC_ADDRESSES:
+        request.getfixturevalue("fn_isolation")
+
+
+@pytest.fixture(scope="function")
+def fixture_contracts(state_image):
+    """
+    Addresses of the fixture contracts if the chain is booted from the state image or
+    they are deployed in a single block in batch setup mode, None if the fixtures
+    deploy them one by one
+    """
+    if state_image is not None:
+        return state_image
+    # the fixed deployer of DETERMINISTIC_ADDRESSES is not unlocked in the node
+    if not BATCH_SETUP_ENABLED or utils.DETERMINISTIC_ADDRESSES:
+        return None
+    return batch_setup.deploy_fixture_contracts(
+        accounts[0].address,
+        {
+            "TestERC20": TestERC20,
+            "UniswapV3Factory": UniswapV3Factory,
+            "MockTimeUniswapV3PoolDeployer": MockTimeUniswapV3PoolDeployer,
+            "MockTimeUniswapV3Pool": MockTimeUniswapV3Pool,
+            "TestUniswapV3Callee": TestUniswapV3Callee,
+        },
+        utils.FeeAmount.MEDIUM,
+        utils.TickSpacings.MEDIUM,
+    )
+
+
+def initialize_pool(pool_helper, sqrt_price_x96, liquidity):
+    """
+    Initializes the pool and mints full range liquidity of the first test account,
+    in a single block in batch setup mode
+    """
+    if not BATCH_SETUP_ENABLED:
+        pool_helper.pool.initialize(sqrt_price_x96, {"from": accounts[0]})
+        pool_helper.mint(
+            accounts[0], pool_helper.min_tick, pool_helper.max_tick, liquidity
+        )
+        return
+    batch_setup.initialize_pool(
+        accounts[0].address,
+        pool_helper.pool.address,
+        pool_helper.token0.address,
+        pool_helper.token1.address,
+        pool_helper.swap_target.address,
+        sqrt_price_x96,
+        pool_helper.min_tick,
+        pool_helper.max_tick,
+        liquidity,
+    )
+    for token in (pool_helper.token0, pool_helper.token1):
+        approval_cache.grant(token.address, pool_helper.swap_target.address)
+
+
+@pytest.fixture(scope="function")
+def tokens(fixture_contracts):
+    if fixture_contracts is not None:
+        return tuple(
+            TestERC20.at(fixture_contracts[name], owner=accounts[0])
+            for name in ("token0", "token1", "token2")
+        )
+    return deploy_tokens()
+
+
 @pytest.fixture(scope="function")
-def factory():
-    return UniswapV3Factory.deploy({"from": accounts[0]})
+def factory(fixture_contracts):
+    if fixture_contracts is not None:
+        return UniswapV3Factory.at(fixture_contracts["factory"], owner=accounts[0])
+    return deploy_factory()
 
 
 @pytest.fixture(scope="function")
-def pool_fixture(tokens, factory):
+def pool_fixture(fixture_contracts, tokens, factory):
     token0, token1, token2 = tokens
-    factory = factory
-    pool = utils.create_pool(
-        utils.FeeAmount.MEDIUM, utils.TickSpacings.MEDIUM, token0, token1, factory
-    )
+    if fixture_contracts is not None:
+        pool = MockTimeUniswapV3Pool.at(fixture_contracts["pool"])
+        swap_target = TestUniswapV3Callee.at(
+            fixture_contracts["swap_target"], owner=accounts[0]
+        )
+    else:
+        pool, swap_target = deploy_pool(token0, token1, factory)
     pool_functions = utils.PoolHelper(
         token0,
         token1,
         factory,
         pool,
         utils.TickSpacings.MEDIUM,
-        TestUniswapV3Callee.deploy({"from": accounts[0]}),
+        swap_target,
     )
     return token0, token1, factory, pool, pool_functions
 
@@ -225,10 +373,7 @@ class TestMint:
         @pytest.fixture
         def initialized_pool_fixture(self, pool_fixture):
             token0, token1, factory, pool, pool_helper = pool_fixture
-            pool.initialize(utils.encode_price_sqrt(1, 10), {"from": accounts[0]})
-            pool_helper.mint(
-                accounts[0], pool_helper.min_tick, pool_helper.max_tick, 3161
-            )
+            initialize_pool(pool_helper, utils.encode_price_sqrt(1, 10), 3161)
             return token0, token1, factory, pool, pool_helper
 
         class TestFailureCases:
@@ -370,10 +515,12 @@ class TestMint:
                         pool_helper,
                     ) = initialized_pool_fixture
                     tx = pool_helper.mint(accounts[0], -22980, 0, 10000)
-                    assert "Transfer" in tx.events
-                    assert tx.events["Transfer"]["from"] == accounts[0]
-                    assert tx.events["Transfer"]["to"] == pool.address
-                    assert tx.events["Transfer"]["value"] == 21549
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 21549},
+                    )
                     assert token0.balanceOf(pool.address) == 9996 + 21549
                     assert token1.balanceOf(pool.address) == 1000
 
@@ -411,10 +558,12 @@ class TestMint:
                     ) = initialized_pool_fixture
                     max_tick = utils.get_max_tick(pool_helper.tick_spacing)
                     tx = pool_helper.mint(accounts[0], -22980, max_tick, 10000)
-                    assert "Transfer" in tx.events
-                    assert tx.events["Transfer"]["from"] == accounts[0]
-                    assert tx.events["Transfer"]["to"] == pool.address
-                    assert tx.events["Transfer"]["value"] == 31549
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 31549},
+                    )
                     assert token0.balanceOf(pool.address) == 9996 + 31549
                     assert token1.balanceOf(pool.address) == 1000
 
@@ -442,8 +591,9 @@ class TestMint:
                         {"from": accounts[0]},
                     )
 
-                    amount0 = tx.events["Collect"]["amount0"]
-                    amount1 = tx.events["Collect"]["amount1"]
+                    collect = utils.events(tx, pool, "Collect")[0]
+                    amount0 = collect["amount0"]
+                    amount1 = collect["amount1"]
                     assert amount0 == 120
                     assert amount1 == 0
 
@@ -632,10 +782,12 @@ class TestMint:
                         max_tick - tick_spacing,
                         100,
                     )
-                    assert "Transfer" in tx.events
-                    assert tx.events["Transfer"]["from"] == accounts[0]
-                    assert tx.events["Transfer"]["to"] == pool.address
-                    assert tx.events["Transfer"]["value"] == 317
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 317},
+                    )
                     assert token0.balanceOf(pool.address) == 9996 + 317
                     assert token1.balanceOf(pool.address) == 1000 + 32
 
@@ -702,10 +854,12 @@ class TestMint:
                     max_tick = utils.get_max_tick(pool_helper.tick_spacing)
 
                     tx = pool_helper.mint(accounts[0], min_tick, max_tick, 10000)
-                    assert "Transfer" in tx.events
-                    assert tx.events["Transfer"]["from"] == accounts[0]
-                    assert tx.events["Transfer"]["to"] == pool.address
-                    assert tx.events["Transfer"]["value"] == 31623
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 31623},
+                    )
                     assert token0.balanceOf(pool.address) == 9996 + 31623
                     assert token1.balanceOf(pool.address) == 1000 + 3163
 
@@ -745,8 +899,9 @@ class TestMint:
                         MAX_UINT_128,
                         {"from": accounts[0]},
                     )
-                    amount0 = tx.events["Collect"]["amount0"]
-                    amount1 = tx.events["Collect"]["amount1"]
+                    collect = utils.events(tx, pool, "Collect")[0]
+                    amount0 = collect["amount0"]
+                    amount1 = collect["amount1"]
                     assert amount0 == 316
                     assert amount1 == 31
 
@@ -797,10 +952,12 @@ class TestMint:
                         pool_helper,
                     ) = initialized_pool_fixture
                     tx = pool_helper.mint(accounts[0], -46080, -23040, 10000)
-                    assert "Transfer" in tx.events
-                    assert tx.events["Transfer"]["from"] == accounts[0]
-                    assert tx.events["Transfer"]["to"] == pool.address
-                    assert tx.events["Transfer"]["value"] == 2162
+                    assert utils.event_emitted(
+                        tx,
+                        token1,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 2162},
+                    )
                     assert token0.balanceOf(pool.address) == 9996
                     assert token1.balanceOf(pool.address) == 1000 + 2162
 
@@ -836,10 +993,12 @@ class TestMint:
                     ) = initialized_pool_fixture
                     min_tick = utils.get_min_tick(pool_helper.tick_spacing)
                     tx = pool_helper.mint(accounts[0], min_tick, -23040, 10000)
-                    assert "Transfer" in tx.events
-                    assert tx.events["Transfer"]["from"] == accounts[0]
-                    assert tx.events["Transfer"]["to"] == pool.address
-                    assert tx.events["Transfer"]["value"] == 3161
+                    assert utils.event_emitted(
+                        tx,
+                        token1,
+                        "Transfer",
+                        {"from": accounts[0], "to": pool.address, "value": 3161},
+                    )
                     assert token0.balanceOf(pool.address) == 9996
                     assert token1.balanceOf(pool.address) == 1000 + 3161
 
@@ -866,8 +1025,9 @@ class TestMint:
                         {"from": accounts[0]},
                     )
 
-                    amount0 = tx.events["Collect"]["amount0"]
-                    amount1 = tx.events["Collect"]["amount1"]
+                    collect = utils.events(tx, pool, "Collect")[0]
+                    amount0 = collect["amount0"]
+                    amount1 = collect["amount1"]
                     assert amount0 == 0
                     assert amount1 == 3
 
@@ -1026,12 +1186,8 @@ class TestBurn:
     @pytest.fixture
     def initialized_pool_fixture(self, pool_fixture):
         token0, token1, factory, pool, pool_helper = pool_fixture
-        pool.initialize(utils.encode_price_sqrt(1, 1), {"from": accounts[0]})
-        pool_helper.mint(
-            accounts[0],
-            pool_helper.min_tick,
-            pool_helper.max_tick,
-            utils.expand_to_18_decimals(2),
+        initialize_pool(
+            pool_helper, utils.encode_price_sqrt(1, 1), utils.expand_to_18_decimals(2)
         )
         return token0, token1, factory, pool, pool_helper
 
@@ -1141,12 +1297,8 @@ class TestObserve:
     @pytest.fixture
     def initialized_pool_fixture(self, pool_fixture):
         token0, token1, factory, pool, pool_helper = pool_fixture
-        pool.initialize(utils.encode_price_sqrt(1, 1), {"from": accounts[0]})
-        pool_helper.mint(
-            accounts[0],
-            pool_helper.min_tick,
-            pool_helper.max_tick,
-            utils.expand_to_18_decimals(2),
+        initialize_pool(
+            pool_helper, utils.encode_price_sqrt(1, 1), utils.expand_to_18_decimals(2)
         )
         return token0, token1, factory, pool, pool_helper
 
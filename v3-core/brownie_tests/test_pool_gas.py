@@ -0,0 +1,578 @@
+import pytest
+from brownie import TestERC20, TestUniswapV3Callee, UniswapV3Factory, accounts
+
+import utils
+from brownie_tests.snapshots import match_gas_snapshot
+from drivers.gas import GAS_REPORT_ENABLED
+from utils import MAX_SQRT_RATIO, MAX_UINT_128, MIN_SQRT_RATIO
+
+pytestmark = pytest.mark.skipif(
+    not GAS_REPORT_ENABLED, reason="gas snapshots are checked only with GAS_REPORT=1"
+)
+
+STARTING_PRICE = utils.encode_price_sqrt(100001, 100000)
+STARTING_TICK = 0
+TICK_SPACING = utils.TickSpacings.MEDIUM
+MIN_TICK = utils.get_min_tick(TICK_SPACING)
+MAX_TICK = utils.get_max_tick(TICK_SPACING)
+
+POSITIONS = {
+    "around_current_price": (
+        STARTING_TICK - TICK_SPACING,
+        STARTING_TICK + TICK_SPACING,
+    ),
+    "below_current_price": (
+        STARTING_TICK - 2 * TICK_SPACING,
+        STARTING_TICK - TICK_SPACING,
+    ),
+    "above_current_price": (
+        STARTING_TICK + TICK_SPACING,
+        STARTING_TICK + 2 * TICK_SPACING,
+    ),
+}
+
+
+@pytest.fixture(scope="function")
+def tokens():
+    token0 = TestERC20.deploy(2**255, {"from": accounts[0]})
+    token1 = TestERC20.deploy(2**255, {"from": accounts[0]})
+
+    token0, token1 = sorted([token0, token1], key=lambda token: token.address.lower())
+    return token0, token1
+
+
+@pytest.fixture(scope="function", params=[0, 6], ids=["fee_is_off", "fee_is_on"])
+def gas_test_fixture(request, tokens):
+    wallet = accounts[0]
+    token0, token1 = tokens
+    factory = UniswapV3Factory.deploy({"from": wallet})
+    pool = utils.create_pool(
+        utils.FeeAmount.MEDIUM, TICK_SPACING, token0, token1, factory
+    )
+    pool_helper = utils.PoolHelper(
+        token0,
+        token1,
+        factory,
+        pool,
+        TICK_SPACING,
+        TestUniswapV3Callee.deploy({"from": wallet}),
+    )
+
+    fee_protocol = request.param
+    pool.initialize(utils.encode_price_sqrt(1, 1), {"from": wallet})
+    pool.setFeeProtocol(fee_protocol, fee_protocol, {"from": wallet})
+    pool.increaseObservationCardinalityNext(4, {"from": wallet})
+    pool.advanceTime(1, {"from": wallet})
+    pool_helper.mint(wallet, MIN_TICK, MAX_TICK, utils.expand_to_18_decimals(2))
+
+    pool_helper.swap_exact_0_for_1(utils.expand_to_18_decimals(1), wallet)
+    pool.advanceTime(1, {"from": wallet})
+    pool_helper.swap_to_higher_price(STARTING_PRICE, wallet)
+    pool.advanceTime(1, {"from": wallet})
+    assert pool.slot0()[1] == STARTING_TICK
+    assert pool.slot0()[0] == STARTING_PRICE
+
+    prefix = "fee_is_on" if fee_protocol > 0 else "fee_is_off"
+    return prefix, pool, pool_helper
+
+
+def mint_two_positions_below(pool_helper, wallet):
+    pool_helper.mint(
+        wallet,
+        STARTING_TICK - 3 * TICK_SPACING,
+        STARTING_TICK - TICK_SPACING,
+        utils.expand_to_18_decimals(1),
+    )
+    pool_helper.mint(
+        wallet,
+        STARTING_TICK - 4 * TICK_SPACING,
+        STARTING_TICK - 2 * TICK_SPACING,
+        utils.expand_to_18_decimals(1),
+    )
+
+
+class TestSwapExact0For1:
+    def test_first_swap_in_block_with_no_tick_movement(self, gas_test_fixture):
+        """
+        first swap in block with no tick movement
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        tx = pool_helper.swap_exact_0_for_1(2000, wallet)
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_first_swap_in_block_with_no_tick_movement",
+        )
+        assert pool.slot0()[0] != STARTING_PRICE
+        assert pool.slot0()[1] == STARTING_TICK
+
+    def test_first_swap_in_block_moves_tick_no_initialized_crossings(
+        self, gas_test_fixture
+    ):
+        """
+        first swap in block moves tick, no initialized crossings
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1) // 10000, wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_first_swap_in_block_moves_tick_no_initialized_crossings",
+        )
+        assert pool.slot0()[1] == STARTING_TICK - 1
+
+    def test_second_swap_in_block_with_no_tick_movement(self, gas_test_fixture):
+        """
+        second swap in block with no tick movement
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1) // 10000, wallet, wallet
+        )
+        assert pool.slot0()[1] == STARTING_TICK - 1
+        tx = pool_helper.swap_exact_0_for_1(2000, wallet)
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_second_swap_in_block_with_no_tick_movement",
+        )
+        assert pool.slot0()[1] == STARTING_TICK - 1
+
+    def test_second_swap_in_block_moves_tick_no_initialized_crossings(
+        self, gas_test_fixture
+    ):
+        """
+        second swap in block moves tick, no initialized crossings
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        pool_helper.swap_exact_0_for_1(1000, wallet)
+        assert pool.slot0()[1] == STARTING_TICK
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1) // 10000, wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_second_swap_in_block_moves_tick_no_initialized_crossings",
+        )
+        assert pool.slot0()[1] == STARTING_TICK - 1
+
+    def test_first_swap_in_block_large_swap_no_initialized_crossings(
+        self, gas_test_fixture
+    ):
+        """
+        first swap in block, large swap, no initialized crossings
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(10), wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_first_swap_in_block_large_swap_no_initialized_crossings",
+        )
+        assert pool.slot0()[1] == -35787
+
+    def test_first_swap_in_block_large_swap_crossing_several_initialized_ticks(
+        self, gas_test_fixture
+    ):
+        """
+        first swap in block, large swap crossing several initialized ticks
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        mint_two_positions_below(pool_helper, wallet)
+        assert pool.slot0()[1] == STARTING_TICK
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1), wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_first_swap_in_block_large_swap_crossing_several_initialized_ticks",
+        )
+        assert pool.slot0()[1] < STARTING_TICK - 4 * TICK_SPACING
+
+    def test_first_swap_in_block_large_swap_crossing_a_single_initialized_tick(
+        self, gas_test_fixture
+    ):
+        """
+        first swap in block, large swap crossing a single initialized tick
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        pool_helper.mint(
+            wallet,
+            MIN_TICK,
+            STARTING_TICK - 2 * TICK_SPACING,
+            utils.expand_to_18_decimals(1),
+        )
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1), wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_first_swap_in_block_large_swap_crossing_a_single_initialized_tick",
+        )
+        assert pool.slot0()[1] < STARTING_TICK - 2 * TICK_SPACING
+
+    def test_second_swap_in_block_large_swap_crossing_several_initialized_ticks(
+        self, gas_test_fixture
+    ):
+        """
+        second swap in block, large swap crossing several initialized ticks
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        mint_two_positions_below(pool_helper, wallet)
+        pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1) // 10000, wallet, wallet
+        )
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1), wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_second_swap_in_block_large_swap_crossing_several_initialized_ticks",
+        )
+        assert pool.slot0()[1] < STARTING_TICK - 4 * TICK_SPACING
+
+    def test_second_swap_in_block_large_swap_crossing_a_single_initialized_tick(
+        self, gas_test_fixture
+    ):
+        """
+        second swap in block, large swap crossing a single initialized tick
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        pool_helper.mint(
+            wallet,
+            MIN_TICK,
+            STARTING_TICK - 2 * TICK_SPACING,
+            utils.expand_to_18_decimals(1),
+        )
+        pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1) // 10000, wallet, wallet
+        )
+        assert pool.slot0()[1] > STARTING_TICK - 2 * TICK_SPACING
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1), wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_second_swap_in_block_large_swap_crossing_a_single_initialized_tick",
+        )
+        assert pool.slot0()[1] < STARTING_TICK - 2 * TICK_SPACING
+
+    def test_large_swap_crossing_several_initialized_ticks_after_some_time_passes(
+        self, gas_test_fixture
+    ):
+        """
+        large swap crossing several initialized ticks after some time passes
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        mint_two_positions_below(pool_helper, wallet)
+        pool_helper.swap_exact_0_for_1(2, wallet)
+        pool.advanceTime(1, {"from": wallet})
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1), wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_large_swap_crossing_several_initialized_ticks_after_some_time_passes",
+        )
+        assert pool.slot0()[1] < STARTING_TICK - 4 * TICK_SPACING
+
+    def test_large_swap_crossing_several_initialized_ticks_second_time_after_some_time_passes(
+        self, gas_test_fixture
+    ):
+        """
+        large swap crossing several initialized ticks second time after some time passes
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        mint_two_positions_below(pool_helper, wallet)
+        pool_helper.swap_exact_0_for_1(utils.expand_to_18_decimals(1), wallet)
+        pool_helper.swap_to_higher_price(STARTING_PRICE, wallet)
+        pool.advanceTime(1, {"from": wallet})
+        tx = pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1), wallet, wallet
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_swapExact0For1_large_swap_crossing_several_initialized_ticks_second_time_after_some_time_passes",
+        )
+        assert pool.slot0()[1] < TICK_SPACING * -4
+
+
+@pytest.mark.parametrize("position", list(POSITIONS))
+class TestMint:
+    def test_new_position_mint_first_in_range(self, gas_test_fixture, position):
+        """
+        new position mint first in range
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        tick_lower, tick_upper = POSITIONS[position]
+        tx = pool_helper.mint(
+            wallet, tick_lower, tick_upper, utils.expand_to_18_decimals(1)
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_mint_{position}_new_position_mint_first_in_range",
+        )
+
+    def test_add_to_position_existing(self, gas_test_fixture, position):
+        """
+        add to position existing
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        tick_lower, tick_upper = POSITIONS[position]
+        pool_helper.mint(wallet, tick_lower, tick_upper, utils.expand_to_18_decimals(1))
+        tx = pool_helper.mint(
+            wallet, tick_lower, tick_upper, utils.expand_to_18_decimals(1)
+        )
+        match_gas_snapshot(
+            tx.gas_used, __file__, f"{prefix}_mint_{position}_add_to_position_existing"
+        )
+
+    def test_second_position_in_same_range(self, gas_test_fixture, position):
+        """
+        second position in same range
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet, other = accounts[0], accounts[1]
+        tick_lower, tick_upper = POSITIONS[position]
+        pool_helper.mint(wallet, tick_lower, tick_upper, utils.expand_to_18_decimals(1))
+        tx = pool_helper.mint(
+            other, tick_lower, tick_upper, utils.expand_to_18_decimals(1)
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_mint_{position}_second_position_in_same_range",
+        )
+
+    def test_add_to_position_after_some_time_passes(self, gas_test_fixture, position):
+        """
+        add to position after some time passes
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        tick_lower, tick_upper = POSITIONS[position]
+        pool_helper.mint(wallet, tick_lower, tick_upper, utils.expand_to_18_decimals(1))
+        pool.advanceTime(1, {"from": wallet})
+        tx = pool_helper.mint(
+            wallet, tick_lower, tick_upper, utils.expand_to_18_decimals(1)
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_mint_{position}_add_to_position_after_some_time_passes",
+        )
+
+
+@pytest.mark.parametrize("position", list(POSITIONS))
+class TestBurn:
+    @pytest.fixture(scope="function")
+    def minted_position_fixture(self, gas_test_fixture, position):
+        prefix, pool, pool_helper = gas_test_fixture
+        tick_lower, tick_upper = POSITIONS[position]
+        pool_helper.mint(
+            accounts[0], tick_lower, tick_upper, utils.expand_to_18_decimals(1)
+        )
+        return prefix, pool, pool_helper, tick_lower, tick_upper
+
+    def test_burn_when_only_position_using_ticks(
+        self, minted_position_fixture, position
+    ):
+        """
+        burn when only position using ticks
+        """
+        prefix, pool, pool_helper, tick_lower, tick_upper = minted_position_fixture
+        tx = pool.burn(
+            tick_lower,
+            tick_upper,
+            utils.expand_to_18_decimals(1),
+            {"from": accounts[0]},
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_burn_{position}_burn_when_only_position_using_ticks",
+        )
+
+    def test_partial_position_burn(self, minted_position_fixture, position):
+        """
+        partial position burn
+        """
+        prefix, pool, pool_helper, tick_lower, tick_upper = minted_position_fixture
+        tx = pool.burn(
+            tick_lower,
+            tick_upper,
+            utils.expand_to_18_decimals(1) // 2,
+            {"from": accounts[0]},
+        )
+        match_gas_snapshot(
+            tx.gas_used, __file__, f"{prefix}_burn_{position}_partial_position_burn"
+        )
+
+    def test_entire_position_burn_but_other_positions_are_using_the_ticks(
+        self, minted_position_fixture, position
+    ):
+        """
+        entire position burn but other positions are using the ticks
+        """
+        prefix, pool, pool_helper, tick_lower, tick_upper = minted_position_fixture
+        pool_helper.mint(
+            accounts[1], tick_lower, tick_upper, utils.expand_to_18_decimals(1)
+        )
+        tx = pool.burn(
+            tick_lower,
+            tick_upper,
+            utils.expand_to_18_decimals(1),
+            {"from": accounts[0]},
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_burn_{position}_entire_position_burn_but_other_positions_are_using_the_ticks",
+        )
+
+    def test_burn_entire_position_after_some_time_passes(
+        self, minted_position_fixture, position
+    ):
+        """
+        burn entire position after some time passes
+        """
+        prefix, pool, pool_helper, tick_lower, tick_upper = minted_position_fixture
+        pool.advanceTime(1, {"from": accounts[0]})
+        tx = pool.burn(
+            tick_lower,
+            tick_upper,
+            utils.expand_to_18_decimals(1),
+            {"from": accounts[0]},
+        )
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_burn_{position}_burn_entire_position_after_some_time_passes",
+        )
+
+
+class TestPoke:
+    def test_best_case(self, gas_test_fixture):
+        """
+        best case
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        tick_lower, tick_upper = POSITIONS["around_current_price"]
+        pool_helper.mint(wallet, tick_lower, tick_upper, utils.expand_to_18_decimals(1))
+        pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1) // 100, wallet, wallet
+        )
+        pool.burn(tick_lower, tick_upper, 0, {"from": wallet})
+        pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1) // 100, wallet, wallet
+        )
+        tx = pool.burn(tick_lower, tick_upper, 0, {"from": wallet})
+        match_gas_snapshot(tx.gas_used, __file__, f"{prefix}_poke_best_case")
+
+
+class TestCollect:
+    def test_close_to_worst_case(self, gas_test_fixture):
+        """
+        close to worst case
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        wallet = accounts[0]
+        tick_lower, tick_upper = POSITIONS["around_current_price"]
+        pool_helper.mint(wallet, tick_lower, tick_upper, utils.expand_to_18_decimals(1))
+        pool_helper.swap_exact_0_for_1(
+            utils.expand_to_18_decimals(1) // 100, wallet, wallet
+        )
+        pool.burn(tick_lower, tick_upper, 0, {"from": wallet})
+        tx = pool.collect(
+            wallet, tick_lower, tick_upper, MAX_UINT_128, MAX_UINT_128, {"from": wallet}
+        )
+        match_gas_snapshot(
+            tx.gas_used, __file__, f"{prefix}_collect_close_to_worst_case"
+        )
+
+
+class TestIncreaseObservationCardinalityNext:
+    def test_grow_by_1_slot(self, gas_test_fixture):
+        """
+        grow by 1 slot
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        tx = pool.increaseObservationCardinalityNext(5, {"from": accounts[0]})
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            f"{prefix}_increaseObservationCardinalityNext_grow_by_1_slot",
+        )
+
+    def test_no_op(self, gas_test_fixture):
+        """
+        no op
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        tx = pool.increaseObservationCardinalityNext(3, {"from": accounts[0]})
+        match_gas_snapshot(
+            tx.gas_used, __file__, f"{prefix}_increaseObservationCardinalityNext_no_op"
+        )
+
+
+class TestSnapshotCumulativesInside:
+    def test_tick_inside(self, gas_test_fixture):
+        """
+        tick inside
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        match_gas_snapshot(
+            pool.snapshotCumulativesInside.estimate_gas(MIN_TICK, MAX_TICK),
+            __file__,
+            f"{prefix}_snapshotCumulativesInside_tick_inside",
+        )
+
+    def test_tick_above(self, gas_test_fixture):
+        """
+        tick above
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        pool_helper.swap_to_higher_price(MAX_SQRT_RATIO - 1, accounts[0])
+        match_gas_snapshot(
+            pool.snapshotCumulativesInside.estimate_gas(MIN_TICK, MAX_TICK),
+            __file__,
+            f"{prefix}_snapshotCumulativesInside_tick_above",
+        )
+
+    def test_tick_below(self, gas_test_fixture):
+        """
+        tick below
+        """
+        prefix, pool, pool_helper = gas_test_fixture
+        pool_helper.swap_to_lower_price(MIN_SQRT_RATIO + 1, accounts[0])
+        match_gas_snapshot(
+            pool.snapshotCumulativesInside.estimate_gas(MIN_TICK, MAX_TICK),
+            __file__,
+            f"{prefix}_snapshotCumulativesInside_tick_below",
+        )
@@ -0,0 +1,161 @@
+import os
+import random
+
+import pytest
+from brownie import TestERC20, TestUniswapV3Callee, UniswapV3Factory, accounts
+
+import utils
+from drivers.benchmarks import timings
+from utils import MAX_UINT_128, FeeAmount, TickSpacings
+
+# Replays POOL_SIMULATION_OPERATIONS seeded random swaps, backruns, mints, burns and
+# time advances against a single pool, in the spirit of UniswapV3Pool.arbitrage.spec.ts.
+# Skipped by default so that the measured suite stays the same.
+POOL_SIMULATION_OPERATIONS = int(os.environ.get("POOL_SIMULATION_OPERATIONS", "0"))
+POOL_SIMULATION_SEED = int(os.environ.get("POOL_SIMULATION_SEED", "0"))
+
+pytestmark = pytest.mark.skipif(
+    POOL_SIMULATION_OPERATIONS < 1,
+    reason="pool simulation runs only with POOL_SIMULATION_OPERATIONS >= 1",
+)
+
+PASSIVE_LIQUIDITY = utils.expand_to_18_decimals(1000)
+# relative weights of the simulated operations
+OPERATIONS = {"swap": 50, "backrun": 20, "mint": 15, "burn": 10, "advance_time": 5}
+# bounds of the random walk of the true price
+MIN_TRUE_PRICE = utils.encode_price_sqrt(1, 10)
+MAX_TRUE_PRICE = utils.encode_price_sqrt(10, 1)
+
+
+class PoolSimulation:
+    """
+    Seeded sequence of pool operations. Positions are tracked so that the in-range
+    liquidity of the pool can be checked after every operation.
+    """
+
+    def __init__(self, pool_helper, wallet, arbitrageur, seed):
+        self.pool_helper = pool_helper
+        self.pool = pool_helper.pool
+        self.wallet = wallet
+        self.arbitrageur = arbitrageur
+        self.rng = random.Random(seed)
+        self.true_price = self.pool.slot0()[0]
+        # (tick_lower, tick_upper) -> liquidity of the positions minted by the simulation
+        self.positions = {}
+
+    def step(self):
+        operation = self.rng.choices(
+            list(OPERATIONS), weights=list(OPERATIONS.values())
+        )[0]
+        if operation == "burn" and not self.positions:
+            operation = "mint"
+        with timings.measure("simulation operation"):
+            with timings.measure(f"simulation {operation}"):
+                getattr(self, operation)()
+
+    def swap(self):
+        method = self.rng.choice(
+            [
+                self.pool_helper.swap_exact_0_for_1,
+                self.pool_helper.swap_0_for_exact_1,
+                self.pool_helper.swap_exact_1_for_0,
+                self.pool_helper.swap_1_for_exact_0,
+            ]
+        )
+        method(self.rng.randint(10**15, 10**19), self.wallet)
+
+    def backrun(self):
+        # the true price moves by up to 1% and the arbitrageur swaps the pool to it
+        self.true_price = self.true_price * self.rng.randint(990, 1010) // 1000
+        self.true_price = min(MAX_TRUE_PRICE, max(MIN_TRUE_PRICE, self.true_price))
+        sqrt_price_x96 = self.pool.slot0()[0]
+        if self.true_price < sqrt_price_x96:
+            self.pool_helper.swap_to_lower_price(self.true_price, self.arbitrageur)
+        elif self.true_price > sqrt_price_x96:
+            self.pool_helper.swap_to_higher_price(self.true_price, self.arbitrageur)
+
+    def mint(self):
+        tick_spacing = self.pool_helper.tick_spacing
+        tick = self.pool.slot0()[1] // tick_spacing * tick_spacing
+        tick_lower = max(
+            self.pool_helper.min_tick, tick - self.rng.randint(1, 50) * tick_spacing
+        )
+        tick_upper = min(
+            self.pool_helper.max_tick, tick + self.rng.randint(1, 50) * tick_spacing
+        )
+        liquidity = self.rng.randint(10**15, 10**19)
+        self.pool_helper.mint(self.wallet, tick_lower, tick_upper, liquidity)
+        key = (tick_lower, tick_upper)
+        self.positions[key] = self.positions.get(key, 0) + liquidity
+
+    def burn(self):
+        (tick_lower, tick_upper), liquidity = self.rng.choice(
+            sorted(self.positions.items())
+        )
+        burn_position(self.pool, self.wallet, tick_lower, tick_upper, liquidity)
+        del self.positions[(tick_lower, tick_upper)]
+
+    def advance_time(self):
+        self.pool.advanceTime(self.rng.randint(1, 3600), {"from": self.wallet})
+
+    def in_range_liquidity(self, tick):
+        return PASSIVE_LIQUIDITY + sum(
+            liquidity
+            for (tick_lower, tick_upper), liquidity in self.positions.items()
+            if tick_lower <= tick < tick_upper
+        )
+
+
+def burn_position(pool, wallet, tick_lower, tick_upper, liquidity):
+    pool.burn(tick_lower, tick_upper, liquidity, {"from": wallet})
+    pool.collect(
+        wallet, tick_lower, tick_upper, MAX_UINT_128, MAX_UINT_128, {"from": wallet}
+    )
+
+
+@pytest.fixture(scope="function", params=[0, 6], ids=lambda fee: f"protocol fee {fee}")
+def pool_helper(request):
+    wallet = accounts[0]
+    token0 = TestERC20.deploy(2**255, {"from": wallet})
+    token1 = TestERC20.deploy(2**255, {"from": wallet})
+    token0, token1 = sorted([token0, token1], key=lambda token: token.address.lower())
+
+    factory = UniswapV3Factory.deploy({"from": wallet})
+    pool = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token0, token1, factory
+    )
+    pool_helper = utils.PoolHelper(
+        token0,
+        token1,
+        factory,
+        pool,
+        TickSpacings.MEDIUM,
+        TestUniswapV3Callee.deploy({"from": wallet}),
+    )
+    pool.initialize(utils.encode_price_sqrt(1, 1), {"from": wallet})
+    if request.param != 0:
+        pool.setFeeProtocol(request.param, request.param, {"from": wallet})
+    pool_helper.mint(
+        wallet, pool_helper.min_tick, pool_helper.max_tick, PASSIVE_LIQUIDITY
+    )
+    return pool_helper
+
+
+class TestPoolSimulation:
+    def test_simulation(self, pool_helper):
+        """
+        In-range liquidity matches the tracked positions after every operation
+        and all positions can be burned at the end
+        """
+        pool = pool_helper.pool
+        wallet = accounts[0]
+        simulation = PoolSimulation(
+            pool_helper, wallet, accounts[1], POOL_SIMULATION_SEED
+        )
+        for _ in range(POOL_SIMULATION_OPERATIONS):
+            simulation.step()
+            assert pool.liquidity() == simulation.in_range_liquidity(pool.slot0()[1])
+
+        for (tick_lower, tick_upper), liquidity in simulation.positions.items():
+            burn_position(pool, wallet, tick_lower, tick_upper, liquidity)
+        assert pool.liquidity() == PASSIVE_LIQUIDITY
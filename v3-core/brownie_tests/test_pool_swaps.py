@@ -0,0 +1,428 @@
+import math
+import os
+import re
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import List, Optional, Tuple
+
+import pytest
+from brownie import TestERC20, TestUniswapV3Callee, UniswapV3Factory, accounts
+from brownie.exceptions import VirtualMachineError
+
+import utils
+from brownie_tests.snapshots import match_object_snapshot
+from utils import (MAX_SQRT_RATIO, MAX_UINT_128, MIN_SQRT_RATIO, FeeAmount,
+                   TickSpacings)
+
+# Each pool case x swap case (240 tests) is repeated SWAP_TESTS_SCALE times.
+# Skipped by default so that the measured suite stays the same.
+SWAP_TESTS_SCALE = int(os.environ.get("SWAP_TESTS_SCALE", "0"))
+
+pytestmark = pytest.mark.skipif(
+    SWAP_TESTS_SCALE < 1, reason="swap tests run only with SWAP_TESTS_SCALE >= 1"
+)
+
+# can't use address zero because the ERC20 token does not allow it
+SWAP_RECIPIENT_ADDRESS = "0x0000000000000000000000000000000000000001"
+POSITION_PROCEEDS_OUTPUT_ADDRESS = "0x0000000000000000000000000000000000000002"
+
+
+def encode_price_sqrt(reserve1, reserve0):
+    # Same rounding as encodePriceSqrt in the TypeScript tests, where bignumber.js
+    # rounds the ratio and its square root half up to 40 decimal places.
+    # utils.encode_price_sqrt keeps 40 significant digits instead, which changes
+    # the starting prices close to the min and max ratio.
+    scale = 10**40
+    ratio = (2 * reserve1 * scale + reserve0) // (2 * reserve0)
+    sqrt_ratio = (math.isqrt(4 * ratio * scale) + 1) // 2
+    return (sqrt_ratio << 96) // scale
+
+
+@dataclass
+class SwapTestCase:
+    zero_for_one: bool
+    # None for swaps to an arbitrary price given by sqrt_price_limit
+    exact_out: Optional[bool] = None
+    amount0: int = 0
+    amount1: int = 0
+    sqrt_price_limit: Optional[int] = None
+
+
+@dataclass
+class PoolTestCase:
+    description: str
+    fee_amount: FeeAmount
+    tick_spacing: TickSpacings
+    starting_price: int
+    # (tick_lower, tick_upper, liquidity)
+    positions: List[Tuple[int, int, int]]
+
+
+def swap_case_to_description(swap_case: SwapTestCase) -> str:
+    price_clause = (
+        f" to price {utils.format_price(swap_case.sqrt_price_limit)}"
+        if swap_case.sqrt_price_limit
+        else ""
+    )
+    amount0 = utils.format_token_amount(swap_case.amount0)
+    amount1 = utils.format_token_amount(swap_case.amount1)
+    if swap_case.exact_out is None:
+        if swap_case.zero_for_one:
+            return f"swap token0 for token1{price_clause}"
+        return f"swap token1 for token0{price_clause}"
+    if swap_case.exact_out:
+        if swap_case.zero_for_one:
+            return f"swap token0 for exactly {amount1} token1{price_clause}"
+        return f"swap token1 for exactly {amount0} token0{price_clause}"
+    if swap_case.zero_for_one:
+        return f"swap exactly {amount0} token0 for token1{price_clause}"
+    return f"swap exactly {amount1} token1 for token0{price_clause}"
+
+
+def execute_swap(pool_helper, swap_case: SwapTestCase):
+    if swap_case.exact_out is None:
+        if swap_case.zero_for_one:
+            return pool_helper.swap_to_lower_price(
+                swap_case.sqrt_price_limit, SWAP_RECIPIENT_ADDRESS
+            )
+        return pool_helper.swap_to_higher_price(
+            swap_case.sqrt_price_limit, SWAP_RECIPIENT_ADDRESS
+        )
+    if swap_case.exact_out:
+        if swap_case.zero_for_one:
+            return pool_helper.swap_0_for_exact_1(
+                swap_case.amount1, SWAP_RECIPIENT_ADDRESS, swap_case.sqrt_price_limit
+            )
+        return pool_helper.swap_1_for_exact_0(
+            swap_case.amount0, SWAP_RECIPIENT_ADDRESS, swap_case.sqrt_price_limit
+        )
+    if swap_case.zero_for_one:
+        return pool_helper.swap_exact_0_for_1(
+            swap_case.amount0, SWAP_RECIPIENT_ADDRESS, swap_case.sqrt_price_limit
+        )
+    return pool_helper.swap_exact_1_for_0(
+        swap_case.amount1, SWAP_RECIPIENT_ADDRESS, swap_case.sqrt_price_limit
+    )
+
+
+def revert_reason(error):
+    if getattr(error, "revert_msg", None):
+        return error.revert_msg
+    # failed gas estimations are raised as ValueError with the reason in the message
+    match = re.search(r"revert(?:ed)?:? (\w+)", str(error))
+    return match.group(1) if match else str(error)
+
+
+def format_execution_price(amount0_delta, amount1_delta):
+    # decimal.js division by zero semantics used by the TypeScript snapshots
+    if amount0_delta == 0:
+        if amount1_delta == 0:
+            return "NaN"
+        return "-Infinity" if amount1_delta > 0 else "Infinity"
+    return utils.to_precision(-Decimal(amount1_delta) / amount0_delta)
+
+
+DEFAULT_POOL_SWAP_TESTS = [
+    # swap large amounts in/out
+    SwapTestCase(True, False, amount0=utils.expand_to_18_decimals(1)),
+    SwapTestCase(False, False, amount1=utils.expand_to_18_decimals(1)),
+    SwapTestCase(True, True, amount1=utils.expand_to_18_decimals(1)),
+    SwapTestCase(False, True, amount0=utils.expand_to_18_decimals(1)),
+    # swap large amounts in/out with a price limit
+    SwapTestCase(
+        True,
+        False,
+        amount0=utils.expand_to_18_decimals(1),
+        sqrt_price_limit=encode_price_sqrt(50, 100),
+    ),
+    SwapTestCase(
+        False,
+        False,
+        amount1=utils.expand_to_18_decimals(1),
+        sqrt_price_limit=encode_price_sqrt(200, 100),
+    ),
+    SwapTestCase(
+        True,
+        True,
+        amount1=utils.expand_to_18_decimals(1),
+        sqrt_price_limit=encode_price_sqrt(50, 100),
+    ),
+    SwapTestCase(
+        False,
+        True,
+        amount0=utils.expand_to_18_decimals(1),
+        sqrt_price_limit=encode_price_sqrt(200, 100),
+    ),
+    # swap small amounts in/out
+    SwapTestCase(True, False, amount0=1000),
+    SwapTestCase(False, False, amount1=1000),
+    SwapTestCase(True, True, amount1=1000),
+    SwapTestCase(False, True, amount0=1000),
+    # swap arbitrary input to price
+    SwapTestCase(False, sqrt_price_limit=encode_price_sqrt(5, 2)),
+    SwapTestCase(True, sqrt_price_limit=encode_price_sqrt(2, 5)),
+    SwapTestCase(True, sqrt_price_limit=encode_price_sqrt(5, 2)),
+    SwapTestCase(False, sqrt_price_limit=encode_price_sqrt(2, 5)),
+]
+
+
+def full_range_position(tick_spacing, liquidity=utils.expand_to_18_decimals(2)):
+    return (
+        utils.get_min_tick(tick_spacing),
+        utils.get_max_tick(tick_spacing),
+        liquidity,
+    )
+
+
+TEST_POOLS = [
+    PoolTestCase(
+        "low fee, 1:1 price, 2e18 max range liquidity",
+        FeeAmount.LOW,
+        TickSpacings.LOW,
+        encode_price_sqrt(1, 1),
+        [full_range_position(TickSpacings.LOW)],
+    ),
+    PoolTestCase(
+        "medium fee, 1:1 price, 2e18 max range liquidity",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(1, 1),
+        [full_range_position(TickSpacings.MEDIUM)],
+    ),
+    PoolTestCase(
+        "high fee, 1:1 price, 2e18 max range liquidity",
+        FeeAmount.HIGH,
+        TickSpacings.HIGH,
+        encode_price_sqrt(1, 1),
+        [full_range_position(TickSpacings.HIGH)],
+    ),
+    PoolTestCase(
+        "medium fee, 10:1 price, 2e18 max range liquidity",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(10, 1),
+        [full_range_position(TickSpacings.MEDIUM)],
+    ),
+    PoolTestCase(
+        "medium fee, 1:10 price, 2e18 max range liquidity",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(1, 10),
+        [full_range_position(TickSpacings.MEDIUM)],
+    ),
+    PoolTestCase(
+        "medium fee, 1:1 price, 0 liquidity, all liquidity around current price",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(1, 1),
+        [
+            (
+                utils.get_min_tick(TickSpacings.MEDIUM),
+                -TickSpacings.MEDIUM,
+                utils.expand_to_18_decimals(2),
+            ),
+            (
+                TickSpacings.MEDIUM,
+                utils.get_max_tick(TickSpacings.MEDIUM),
+                utils.expand_to_18_decimals(2),
+            ),
+        ],
+    ),
+    PoolTestCase(
+        "medium fee, 1:1 price, additional liquidity around current price",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(1, 1),
+        [
+            full_range_position(TickSpacings.MEDIUM),
+            (
+                utils.get_min_tick(TickSpacings.MEDIUM),
+                -TickSpacings.MEDIUM,
+                utils.expand_to_18_decimals(2),
+            ),
+            (
+                TickSpacings.MEDIUM,
+                utils.get_max_tick(TickSpacings.MEDIUM),
+                utils.expand_to_18_decimals(2),
+            ),
+        ],
+    ),
+    PoolTestCase(
+        "low fee, large liquidity around current price (stable swap)",
+        FeeAmount.LOW,
+        TickSpacings.LOW,
+        encode_price_sqrt(1, 1),
+        [(-TickSpacings.LOW, TickSpacings.LOW, utils.expand_to_18_decimals(2))],
+    ),
+    PoolTestCase(
+        "medium fee, token0 liquidity only",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(1, 1),
+        [(0, 2000 * TickSpacings.MEDIUM, utils.expand_to_18_decimals(2))],
+    ),
+    PoolTestCase(
+        "medium fee, token1 liquidity only",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(1, 1),
+        [(-2000 * TickSpacings.MEDIUM, 0, utils.expand_to_18_decimals(2))],
+    ),
+    PoolTestCase(
+        "close to max price",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(2**127, 1),
+        [full_range_position(TickSpacings.MEDIUM)],
+    ),
+    PoolTestCase(
+        "close to min price",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(1, 2**127),
+        [full_range_position(TickSpacings.MEDIUM)],
+    ),
+    PoolTestCase(
+        "max full range liquidity at 1:1 price with default fee",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        encode_price_sqrt(1, 1),
+        [
+            full_range_position(
+                TickSpacings.MEDIUM,
+                int(utils.get_max_liquidity_per_tick(TickSpacings.MEDIUM)),
+            )
+        ],
+    ),
+    PoolTestCase(
+        "initialized at the max ratio",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        MAX_SQRT_RATIO - 1,
+        [full_range_position(TickSpacings.MEDIUM)],
+    ),
+    PoolTestCase(
+        "initialized at the min ratio",
+        FeeAmount.MEDIUM,
+        TickSpacings.MEDIUM,
+        MIN_SQRT_RATIO,
+        [full_range_position(TickSpacings.MEDIUM)],
+    ),
+]
+
+
+@pytest.fixture(
+    scope="function", params=TEST_POOLS, ids=lambda pool_case: pool_case.description
+)
+def pool_case_fixture(request):
+    wallet = accounts[0]
+    pool_case = request.param
+    token0 = TestERC20.deploy(2**255, {"from": wallet})
+    token1 = TestERC20.deploy(2**255, {"from": wallet})
+    token0, token1 = sorted([token0, token1], key=lambda token: token.address.lower())
+
+    factory = UniswapV3Factory.deploy({"from": wallet})
+    pool = utils.create_pool(
+        pool_case.fee_amount, pool_case.tick_spacing, token0, token1, factory
+    )
+    pool_helper = utils.PoolHelper(
+        token0,
+        token1,
+        factory,
+        pool,
+        pool_case.tick_spacing,
+        TestUniswapV3Callee.deploy({"from": wallet}),
+    )
+    pool.initialize(pool_case.starting_price, {"from": wallet})
+    # mint all positions
+    for tick_lower, tick_upper, liquidity in pool_case.positions:
+        pool_helper.mint(wallet, tick_lower, tick_upper, liquidity)
+
+    pool_balance0 = token0.balanceOf(pool.address)
+    pool_balance1 = token1.balanceOf(pool.address)
+    yield pool_case, token0, token1, pool, pool_helper, pool_balance0, pool_balance1
+
+    # check can burn positions
+    for tick_lower, tick_upper, liquidity in pool_case.positions:
+        pool.burn(tick_lower, tick_upper, liquidity, {"from": wallet})
+        pool.collect(
+            POSITION_PROCEEDS_OUTPUT_ADDRESS,
+            tick_lower,
+            tick_upper,
+            MAX_UINT_128,
+            MAX_UINT_128,
+            {"from": wallet},
+        )
+
+
+class TestSwaps:
+    @pytest.mark.parametrize("iteration", range(SWAP_TESTS_SCALE))
+    @pytest.mark.parametrize(
+        "swap_case", DEFAULT_POOL_SWAP_TESTS, ids=swap_case_to_description
+    )
+    def test_swap(self, pool_case_fixture, swap_case, iteration):
+        """
+        Swap results match the snapshot of the pool case
+        """
+        (
+            pool_case,
+            token0,
+            token1,
+            pool,
+            pool_helper,
+            pool_balance0,
+            pool_balance1,
+        ) = pool_case_fixture
+        ident = f"{pool_case.description} {swap_case_to_description(swap_case)}"
+
+        sqrt_price_x96, tick = pool.slot0()[:2]
+        try:
+            tx = execute_swap(pool_helper, swap_case)
+        except (VirtualMachineError, ValueError) as e:
+            match_object_snapshot(
+                {
+                    "poolBalance0": str(pool_balance0),
+                    "poolBalance1": str(pool_balance1),
+                    "poolPriceBefore": utils.format_price(sqrt_price_x96),
+                    "swapError": revert_reason(e),
+                    "tickBefore": tick,
+                },
+                __file__,
+                ident,
+            )
+            return
+
+        pool_balance0_delta = token0.balanceOf(pool.address) - pool_balance0
+        pool_balance1_delta = token1.balanceOf(pool.address) - pool_balance1
+        sqrt_price_x96_after, tick_after = pool.slot0()[:2]
+        liquidity_after = pool.liquidity()
+
+        # check that the swap event was emitted
+        assert "Swap" in tx.events
+        assert tx.events["Swap"]["sender"] == pool_helper.swap_target.address
+        assert tx.events["Swap"]["recipient"] == SWAP_RECIPIENT_ADDRESS
+        assert tx.events["Swap"]["amount0"] == pool_balance0_delta
+        assert tx.events["Swap"]["amount1"] == pool_balance1_delta
+        assert tx.events["Swap"]["sqrtPriceX96"] == sqrt_price_x96_after
+        assert tx.events["Swap"]["liquidity"] == liquidity_after
+        assert tx.events["Swap"]["tick"] == tick_after
+
+        match_object_snapshot(
+            {
+                "amount0Before": str(pool_balance0),
+                "amount0Delta": str(pool_balance0_delta),
+                "amount1Before": str(pool_balance1),
+                "amount1Delta": str(pool_balance1_delta),
+                "executionPrice": format_execution_price(
+                    pool_balance0_delta, pool_balance1_delta
+                ),
+                "feeGrowthGlobal0X128Delta": str(pool.feeGrowthGlobal0X128()),
+                "feeGrowthGlobal1X128Delta": str(pool.feeGrowthGlobal1X128()),
+                "poolPriceAfter": utils.format_price(sqrt_price_x96_after),
+                "poolPriceBefore": utils.format_price(sqrt_price_x96),
+                "tickAfter": tick_after,
+                "tickBefore": tick,
+            },
+            __file__,
+            ident,
+        )
@@ -0,0 +1,402 @@
+import pytest
+from brownie import TickTest, accounts
+
+import utils
+from brownie_utils import brownie_reverts_fix
+from utils import MAX_UINT_128, MAX_UINT_256, FeeAmount, TickSpacings
+
+pytestmark = pytest.mark.extended
+
+TICK_SPACINGS = {
+    FeeAmount.LOW: TickSpacings.LOW,
+    FeeAmount.MEDIUM: TickSpacings.MEDIUM,
+    FeeAmount.HIGH: TickSpacings.HIGH,
+}
+
+
+def tick_info(
+    fee_growth_outside0_x128=0,
+    fee_growth_outside1_x128=0,
+    liquidity_gross=0,
+    liquidity_net=0,
+    seconds_per_liquidity_outside_x128=0,
+    tick_cumulative_outside=0,
+    seconds_outside=0,
+    initialized=True,
+):
+    return (
+        liquidity_gross,
+        liquidity_net,
+        fee_growth_outside0_x128,
+        fee_growth_outside1_x128,
+        tick_cumulative_outside,
+        seconds_per_liquidity_outside_x128,
+        seconds_outside,
+        initialized,
+    )
+
+
+@pytest.fixture(scope="function")
+def tick_test():
+    return TickTest.deploy({"from": accounts[0]})
+
+
+class TestTickSpacingToMaxLiquidityPerTick:
+    def test_returns_the_correct_value_for_low_fee(self, tick_test):
+        """
+        Returns the correct value for low fee
+        """
+        max_liquidity_per_tick = tick_test.tickSpacingToMaxLiquidityPerTick(
+            TICK_SPACINGS[FeeAmount.LOW]
+        )
+        # 110.8 bits
+        assert max_liquidity_per_tick == 1917569901783203986719870431555990
+        assert max_liquidity_per_tick == int(
+            utils.get_max_liquidity_per_tick(TICK_SPACINGS[FeeAmount.LOW])
+        )
+
+    def test_returns_the_correct_value_for_medium_fee(self, tick_test):
+        """
+        Returns the correct value for medium fee
+        """
+        max_liquidity_per_tick = tick_test.tickSpacingToMaxLiquidityPerTick(
+            TICK_SPACINGS[FeeAmount.MEDIUM]
+        )
+        # 113.1 bits
+        assert max_liquidity_per_tick == 11505743598341114571880798222544994
+        assert max_liquidity_per_tick == int(
+            utils.get_max_liquidity_per_tick(TICK_SPACINGS[FeeAmount.MEDIUM])
+        )
+
+    def test_returns_the_correct_value_for_high_fee(self, tick_test):
+        """
+        Returns the correct value for high fee
+        """
+        max_liquidity_per_tick = tick_test.tickSpacingToMaxLiquidityPerTick(
+            TICK_SPACINGS[FeeAmount.HIGH]
+        )
+        # 114.7 bits
+        assert max_liquidity_per_tick == 38350317471085141830651933667504588
+        assert max_liquidity_per_tick == int(
+            utils.get_max_liquidity_per_tick(TICK_SPACINGS[FeeAmount.HIGH])
+        )
+
+    def test_returns_the_correct_value_for_entire_range(self, tick_test):
+        """
+        Returns the correct value for entire range
+        """
+        max_liquidity_per_tick = tick_test.tickSpacingToMaxLiquidityPerTick(887272)
+        # 126 bits
+        assert max_liquidity_per_tick == MAX_UINT_128 // 3
+        assert max_liquidity_per_tick == int(utils.get_max_liquidity_per_tick(887272))
+
+    def test_returns_the_correct_value_for_2302(self, tick_test):
+        """
+        Returns the correct value for 2302
+        """
+        max_liquidity_per_tick = tick_test.tickSpacingToMaxLiquidityPerTick(2302)
+        # 118 bits
+        assert max_liquidity_per_tick == 441351967472034323558203122479595605
+        assert max_liquidity_per_tick == int(utils.get_max_liquidity_per_tick(2302))
+
+
+class TestGetFeeGrowthInside:
+    def test_returns_all_for_two_uninitialized_ticks_if_tick_is_inside(self, tick_test):
+        """
+        Returns all for two uninitialized ticks if tick is inside
+        """
+        assert tick_test.getFeeGrowthInside(-2, 2, 0, 15, 15) == (15, 15)
+
+    def test_returns_0_for_two_uninitialized_ticks_if_tick_is_above(self, tick_test):
+        """
+        Returns 0 for two uninitialized ticks if tick is above
+        """
+        assert tick_test.getFeeGrowthInside(-2, 2, 4, 15, 15) == (0, 0)
+
+    def test_returns_0_for_two_uninitialized_ticks_if_tick_is_below(self, tick_test):
+        """
+        Returns 0 for two uninitialized ticks if tick is below
+        """
+        assert tick_test.getFeeGrowthInside(-2, 2, -4, 15, 15) == (0, 0)
+
+    def test_subtracts_upper_tick_if_below(self, tick_test):
+        """
+        Subtracts upper tick if below
+        """
+        tick_test.setTick(
+            2,
+            tick_info(fee_growth_outside0_x128=2, fee_growth_outside1_x128=3),
+            {"from": accounts[0]},
+        )
+        assert tick_test.getFeeGrowthInside(-2, 2, 0, 15, 15) == (13, 12)
+
+    def test_subtracts_lower_tick_if_above(self, tick_test):
+        """
+        Subtracts lower tick if above
+        """
+        tick_test.setTick(
+            -2,
+            tick_info(fee_growth_outside0_x128=2, fee_growth_outside1_x128=3),
+            {"from": accounts[0]},
+        )
+        assert tick_test.getFeeGrowthInside(-2, 2, 0, 15, 15) == (13, 12)
+
+    def test_subtracts_upper_and_lower_tick_if_inside(self, tick_test):
+        """
+        Subtracts upper and lower tick if inside
+        """
+        tick_test.setTick(
+            -2,
+            tick_info(fee_growth_outside0_x128=2, fee_growth_outside1_x128=3),
+            {"from": accounts[0]},
+        )
+        tick_test.setTick(
+            2,
+            tick_info(fee_growth_outside0_x128=4, fee_growth_outside1_x128=1),
+            {"from": accounts[0]},
+        )
+        assert tick_test.getFeeGrowthInside(-2, 2, 0, 15, 15) == (9, 11)
+
+    def test_works_correctly_with_overflow_on_inside_tick(self, tick_test):
+        """
+        Works correctly with overflow on inside tick
+        """
+        tick_test.setTick(
+            -2,
+            tick_info(
+                fee_growth_outside0_x128=MAX_UINT_256 - 3,
+                fee_growth_outside1_x128=MAX_UINT_256 - 2,
+            ),
+            {"from": accounts[0]},
+        )
+        tick_test.setTick(
+            2,
+            tick_info(fee_growth_outside0_x128=3, fee_growth_outside1_x128=5),
+            {"from": accounts[0]},
+        )
+        assert tick_test.getFeeGrowthInside(-2, 2, 0, 15, 15) == (16, 13)
+
+
+class TestUpdate:
+    def test_flips_from_zero_to_nonzero(self, tick_test):
+        """
+        Flips from zero to nonzero
+        """
+        assert tick_test.update.call(0, 0, 1, 0, 0, 0, 0, 0, False, 3) is True
+
+    def test_does_not_flip_from_nonzero_to_greater_nonzero(self, tick_test):
+        """
+        Does not flip from nonzero to greater nonzero
+        """
+        tick_test.update(0, 0, 1, 0, 0, 0, 0, 0, False, 3, {"from": accounts[0]})
+        assert tick_test.update.call(0, 0, 1, 0, 0, 0, 0, 0, False, 3) is False
+
+    def test_flips_from_nonzero_to_zero(self, tick_test):
+        """
+        Flips from nonzero to zero
+        """
+        tick_test.update(0, 0, 1, 0, 0, 0, 0, 0, False, 3, {"from": accounts[0]})
+        assert tick_test.update.call(0, 0, -1, 0, 0, 0, 0, 0, False, 3) is True
+
+    def test_does_not_flip_from_nonzero_to_lesser_nonzero(self, tick_test):
+        """
+        Does not flip from nonzero to lesser nonzero
+        """
+        tick_test.update(0, 0, 2, 0, 0, 0, 0, 0, False, 3, {"from": accounts[0]})
+        assert tick_test.update.call(0, 0, -1, 0, 0, 0, 0, 0, False, 3) is False
+
+    def test_reverts_if_total_liquidity_gross_is_greater_than_max(self, tick_test):
+        """
+        Reverts if total liquidity gross is greater than max
+        """
+        tick_test.update(0, 0, 2, 0, 0, 0, 0, 0, False, 3, {"from": accounts[0]})
+        tick_test.update(0, 0, 1, 0, 0, 0, 0, 0, True, 3, {"from": accounts[0]})
+        with brownie_reverts_fix("LO"):
+            tick_test.update(0, 0, 1, 0, 0, 0, 0, 0, False, 3, {"from": accounts[0]})
+
+    def test_nets_the_liquidity_based_on_upper_flag(self, tick_test):
+        """
+        Nets the liquidity based on upper flag
+        """
+        tick_test.update(0, 0, 2, 0, 0, 0, 0, 0, False, 10, {"from": accounts[0]})
+        tick_test.update(0, 0, 1, 0, 0, 0, 0, 0, True, 10, {"from": accounts[0]})
+        tick_test.update(0, 0, 3, 0, 0, 0, 0, 0, True, 10, {"from": accounts[0]})
+        tick_test.update(0, 0, 1, 0, 0, 0, 0, 0, False, 10, {"from": accounts[0]})
+        tick = tick_test.ticks(0)
+        assert tick["liquidityGross"] == 2 + 1 + 3 + 1
+        assert tick["liquidityNet"] == 2 - 1 - 3 + 1
+
+    def test_reverts_on_overflow_liquidity_gross(self, tick_test):
+        """
+        Reverts on overflow liquidity gross
+        """
+        tick_test.update(
+            0,
+            0,
+            MAX_UINT_128 // 2 - 1,
+            0,
+            0,
+            0,
+            0,
+            0,
+            False,
+            MAX_UINT_128,
+            {"from": accounts[0]},
+        )
+        with brownie_reverts_fix():
+            tick_test.update(
+                0,
+                0,
+                MAX_UINT_128 // 2 - 1,
+                0,
+                0,
+                0,
+                0,
+                0,
+                False,
+                MAX_UINT_128,
+                {"from": accounts[0]},
+            )
+
+    def test_assumes_all_growth_happens_below_ticks_lte_current_tick(self, tick_test):
+        """
+        Assumes all growth happens below ticks lte current tick
+        """
+        tick_test.update(
+            1, 1, 1, 1, 2, 3, 4, 5, False, MAX_UINT_128, {"from": accounts[0]}
+        )
+        tick = tick_test.ticks(1)
+        assert tick["feeGrowthOutside0X128"] == 1
+        assert tick["feeGrowthOutside1X128"] == 2
+        assert tick["secondsPerLiquidityOutsideX128"] == 3
+        assert tick["tickCumulativeOutside"] == 4
+        assert tick["secondsOutside"] == 5
+        assert tick["initialized"] is True
+
+    def test_does_not_set_any_growth_fields_if_tick_is_already_initialized(
+        self, tick_test
+    ):
+        """
+        Does not set any growth fields if tick is already initialized
+        """
+        tick_test.update(
+            1, 1, 1, 1, 2, 3, 4, 5, False, MAX_UINT_128, {"from": accounts[0]}
+        )
+        tick_test.update(
+            1,
+            1,
+            1,
+            6,
+            7,
+            8,
+            9,
+            10,
+            False,
+            MAX_UINT_128,
+            {"from": accounts[0]},
+        )
+        tick = tick_test.ticks(1)
+        assert tick["feeGrowthOutside0X128"] == 1
+        assert tick["feeGrowthOutside1X128"] == 2
+        assert tick["secondsPerLiquidityOutsideX128"] == 3
+        assert tick["tickCumulativeOutside"] == 4
+        assert tick["secondsOutside"] == 5
+        assert tick["initialized"] is True
+
+    def test_does_not_set_any_growth_fields_for_ticks_gt_current_tick(self, tick_test):
+        """
+        Does not set any growth fields for ticks gt current tick
+        """
+        tick_test.update(
+            2, 1, 1, 1, 2, 3, 4, 5, False, MAX_UINT_128, {"from": accounts[0]}
+        )
+        tick = tick_test.ticks(2)
+        assert tick["feeGrowthOutside0X128"] == 0
+        assert tick["feeGrowthOutside1X128"] == 0
+        assert tick["secondsPerLiquidityOutsideX128"] == 0
+        assert tick["tickCumulativeOutside"] == 0
+        assert tick["secondsOutside"] == 0
+        assert tick["initialized"] is True
+
+
+class TestClear:
+    def test_deletes_all_the_data_in_the_tick(self, tick_test):
+        """
+        Deletes all the data in the tick
+        """
+        tick_test.setTick(
+            2,
+            tick_info(
+                fee_growth_outside0_x128=1,
+                fee_growth_outside1_x128=2,
+                liquidity_gross=3,
+                liquidity_net=4,
+                seconds_per_liquidity_outside_x128=5,
+                tick_cumulative_outside=6,
+                seconds_outside=7,
+            ),
+            {"from": accounts[0]},
+        )
+        tick_test.clear(2, {"from": accounts[0]})
+        tick = tick_test.ticks(2)
+        assert tick["feeGrowthOutside0X128"] == 0
+        assert tick["feeGrowthOutside1X128"] == 0
+        assert tick["secondsOutside"] == 0
+        assert tick["secondsPerLiquidityOutsideX128"] == 0
+        assert tick["tickCumulativeOutside"] == 0
+        assert tick["liquidityGross"] == 0
+        assert tick["liquidityNet"] == 0
+        assert tick["initialized"] is False
+
+
+class TestCross:
+    def test_flips_the_growth_variables(self, tick_test):
+        """
+        Flips the growth variables
+        """
+        tick_test.setTick(
+            2,
+            tick_info(
+                fee_growth_outside0_x128=1,
+                fee_growth_outside1_x128=2,
+                liquidity_gross=3,
+                liquidity_net=4,
+                seconds_per_liquidity_outside_x128=5,
+                tick_cumulative_outside=6,
+                seconds_outside=7,
+            ),
+            {"from": accounts[0]},
+        )
+        tick_test.cross(2, 7, 9, 8, 15, 10, {"from": accounts[0]})
+        tick = tick_test.ticks(2)
+        assert tick["feeGrowthOutside0X128"] == 6
+        assert tick["feeGrowthOutside1X128"] == 7
+        assert tick["secondsPerLiquidityOutsideX128"] == 3
+        assert tick["tickCumulativeOutside"] == 9
+        assert tick["secondsOutside"] == 3
+
+    def test_two_flips_are_no_op(self, tick_test):
+        """
+        Two flips are no op
+        """
+        tick_test.setTick(
+            2,
+            tick_info(
+                fee_growth_outside0_x128=1,
+                fee_growth_outside1_x128=2,
+                liquidity_gross=3,
+                liquidity_net=4,
+                seconds_per_liquidity_outside_x128=5,
+                tick_cumulative_outside=6,
+                seconds_outside=7,
+            ),
+            {"from": accounts[0]},
+        )
+        tick_test.cross(2, 7, 9, 8, 15, 10, {"from": accounts[0]})
+        tick_test.cross(2, 7, 9, 8, 15, 10, {"from": accounts[0]})
+        tick = tick_test.ticks(2)
+        assert tick["feeGrowthOutside0X128"] == 1
+        assert tick["feeGrowthOutside1X128"] == 2
+        assert tick["secondsPerLiquidityOutsideX128"] == 5
+        assert tick["tickCumulativeOutside"] == 6
+        assert tick["secondsOutside"] == 7
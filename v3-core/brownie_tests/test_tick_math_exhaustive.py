@@ -0,0 +1,71 @@
+import os
+import time
+
+import pytest
+from brownie import TickMathTest, accounts, web3
+
+from drivers.benchmarks import timings
+from drivers.rpc_driver import RpcConnection
+from drivers.tick_math import (MAX_TICK, MIN_TICK, batch_call_requests,
+                               batch_mismatches, get_tick_table,
+                               verification_batches, verification_cases)
+
+# Verifies getSqrtRatioAtTick of TickMathTest for every TICK_MATH_EXHAUSTIVE_STEP-th
+# tick and getTickAtSqrtRatio for the sqrt ratio of the tick and the ratio just below it
+# against the tick table of drivers.tick_math. The calls are sent as JSON-RPC batches of
+# TICK_MATH_EXHAUSTIVE_BATCH eth_calls, and every FRAMEWORK_TICK_STEP-th tick also goes
+# through the calls of the framework. Skipped by default so that the measured suite
+# stays the same.
+TICK_MATH_EXHAUSTIVE_BATCH = int(os.environ.get("TICK_MATH_EXHAUSTIVE_BATCH", "0"))
+TICK_MATH_EXHAUSTIVE_STEP = int(os.environ.get("TICK_MATH_EXHAUSTIVE_STEP", "1"))
+FRAMEWORK_TICK_STEP = 1000
+
+pytestmark = pytest.mark.skipif(
+    TICK_MATH_EXHAUSTIVE_BATCH < 1,
+    reason="exhaustive TickMath checks run only with TICK_MATH_EXHAUSTIVE_BATCH >= 1",
+)
+
+
+@pytest.fixture(scope="module")
+def tick_math():
+    return TickMathTest.deploy({"from": accounts[0]})
+
+
+@pytest.fixture(scope="module")
+def tick_table():
+    return get_tick_table()
+
+
+class TestTickMathExhaustive:
+    def test_framework_calls(self, tick_math, tick_table):
+        mismatches = []
+        for function, argument, expected in verification_cases(
+            tick_table, range(MIN_TICK, MAX_TICK + 1, FRAMEWORK_TICK_STEP)
+        ):
+            with timings.measure(f"operation framework call {function}"):
+                result = getattr(tick_math, function)(argument)
+            if result != expected:
+                mismatches.append((function, argument, expected, result))
+        assert not mismatches, mismatches[:10]
+
+    def test_batched_calls(self, tick_math, tick_table):
+        connection = RpcConnection(web3.provider.endpoint_uri)
+        cases = verification_cases(
+            tick_table, range(MIN_TICK, MAX_TICK + 1, TICK_MATH_EXHAUSTIVE_STEP)
+        )
+        mismatches = []
+        try:
+            for batch in verification_batches(cases, TICK_MATH_EXHAUSTIVE_BATCH):
+                requests = batch_call_requests(tick_math.address, batch)
+                start = time.perf_counter()
+                results = connection.batch_request(requests)
+                # one sample per batch with the time per call, so that the report shows
+                # the latency and the throughput of a single call
+                timings.record(
+                    f"operation batched call {batch[0][0]}",
+                    (time.perf_counter() - start) / len(batch),
+                )
+                mismatches.extend(batch_mismatches(batch, results))
+        finally:
+            connection.close()
+        assert not mismatches, mismatches[:10]
@@ -0,0 +1,74 @@
+import os
+import random
+
+import pytest
+from brownie import TickMathTest, accounts
+
+import utils
+from drivers.tick_math import (MAX_SQRT_RATIO, MAX_TICK, MIN_SQRT_RATIO,
+                               MIN_TICK, get_tick_table)
+
+# Checks TickMathTest against the precomputed tick table of drivers.tick_math, exactly
+# and for TICK_TABLE_SAMPLES random ticks and ratios besides the ticks and ratios of
+# test_tick_math.py. Skipped by default so that the measured suite stays the same.
+TICK_TABLE_SAMPLES = int(os.environ.get("TICK_TABLE_SAMPLES", "0"))
+
+RANDOM = random.Random(0)
+TICKS = [MIN_TICK, MIN_TICK + 1, 0, MAX_TICK - 1, MAX_TICK] + [
+    sign * tick
+    for tick in [50, 100, 250, 500, 1000, 2500, 3000, 4000, 5000, 50000, 150000]
+    + [250000, 500000, 738203]
+    for sign in (-1, 1)
+]
+TICKS += [RANDOM.randint(MIN_TICK, MAX_TICK) for _ in range(TICK_TABLE_SAMPLES)]
+RATIOS = [
+    MIN_SQRT_RATIO,
+    utils.encode_price_sqrt(10**12, 1),
+    utils.encode_price_sqrt(10**6, 1),
+    utils.encode_price_sqrt(1, 64),
+    utils.encode_price_sqrt(1, 8),
+    utils.encode_price_sqrt(1, 2),
+    utils.encode_price_sqrt(1, 1),
+    utils.encode_price_sqrt(2, 1),
+    utils.encode_price_sqrt(8, 1),
+    utils.encode_price_sqrt(64, 1),
+    utils.encode_price_sqrt(1, 10**6),
+    utils.encode_price_sqrt(1, 10**12),
+    MAX_SQRT_RATIO - 1,
+]
+RATIOS += [
+    RANDOM.randrange(MIN_SQRT_RATIO, MAX_SQRT_RATIO) for _ in range(TICK_TABLE_SAMPLES)
+]
+
+pytestmark = pytest.mark.skipif(
+    TICK_TABLE_SAMPLES < 1,
+    reason="tick table checks run only with TICK_TABLE_SAMPLES >= 1",
+)
+
+
+@pytest.fixture(scope="module")
+def tick_math():
+    return TickMathTest.deploy({"from": accounts[0]})
+
+
+@pytest.fixture(scope="module")
+def tick_table():
+    return get_tick_table()
+
+
+class TestTickTable:
+    @pytest.mark.parametrize("tick", TICKS)
+    def test_sqrt_ratio_at_tick(self, tick_math, tick_table, tick):
+        """
+        getSqrtRatioAtTick equals the table entry of the tick
+        """
+        assert tick_math.getSqrtRatioAtTick(tick) == tick_table.sqrt_ratio(tick)
+
+    @pytest.mark.parametrize("ratio", RATIOS)
+    def test_tick_at_sqrt_ratio(self, tick_math, tick_table, ratio):
+        """
+        getTickAtSqrtRatio equals the greatest tick of the table not above the ratio
+        """
+        assert tick_math.getTickAtSqrtRatio(ratio) == tick_table.tick_at_sqrt_ratio(
+            ratio
+        )
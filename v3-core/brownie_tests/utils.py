@@ -1,13 +1,18 @@
 import decimal
 import math
+import os
 from decimal import Decimal
 from enum import IntEnum
 
 from brownie import (MockTimeUniswapV3Pool, MockTimeUniswapV3PoolDeployer,
-                     TestERC20, TestUniswapV3Callee, UniswapV3Factory,
-                     accounts)
+                     TestERC20, TestUniswapV3Callee, TestUniswapV3Router,
+                     UniswapV3Factory, UniswapV3Pool, accounts)
 from eth_abi.packed import encode_packed
-from eth_utils import keccak
+from eth_utils import keccak, to_checksum_address
+
+from drivers.approvals import approval_cache
+from drivers.codec import position_key
+from drivers.events import event_codec, receipt_logs
 
 decimal.setcontext(decimal.Context(prec=40))
 
@@ -17,6 +22,13 @@ MIN_SQRT_RATIO = 4295128739
 MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
 TEST_POOL_START_TIME = 1601906400
 
+DETERMINISTIC_ADDRESSES = os.environ.get("DETERMINISTIC_ADDRESSES", "") not in ("", "0")
+# fixed key shared by all suites, it is not one of the test accounts of any framework
+DEPLOYER_PRIVATE_KEY = (
+    "0x0b2b0d2b7b0339bcc642812ca0ed6e83daf15e5f5c77fc845156a6b30d94fe71"
+)
+DEPLOYER_BALANCE = 100 * 10**18
+
 
 class FeeAmount(IntEnum):
     LOW = 500
@@ -48,17 +60,69 @@ def expand_to_18_decimals(n):
     return n * 10**18
 
 
+def get_deployer():
+    """
+    Account that deploys the fixture contracts. With DETERMINISTIC_ADDRESSES it is an
+    account with a fixed private key and no other transactions, so the addresses of
+    the contracts depend only on the order of the deployments and are the same in
+    every run and framework.
+    """
+    if not DETERMINISTIC_ADDRESSES:
+        return accounts[0]
+    deployer = accounts.add(DEPLOYER_PRIVATE_KEY)
+    if deployer.balance() == 0:
+        accounts[0].transfer(deployer, DEPLOYER_BALANCE)
+    return deployer
+
+
 def encode_price_sqrt(reserve1, reserve0):
     return int(
         (Decimal.from_float(reserve1) / Decimal.from_float(reserve0)).sqrt() * 2**96
     )
 
 
+def to_precision(value, precision=5):
+    """
+    Formats a Decimal the same way as decimal.js toPrecision does in the TypeScript snapshots
+    """
+    if not value.is_finite():
+        return str(value)
+    rounded = decimal.Context(prec=precision, rounding=decimal.ROUND_HALF_UP).plus(
+        value
+    )
+    exponent = rounded.adjusted()
+    if exponent >= precision:
+        digits = "".join(map(str, rounded.as_tuple().digits)).ljust(precision, "0")
+        sign = "-" if rounded.is_signed() else ""
+        return f"{sign}{digits[0]}.{digits[1:]}e+{exponent}"
+    return f"{rounded:.{precision - 1 - exponent}f}"
+
+
+def format_token_amount(amount):
+    return to_precision(Decimal(amount) / 10**18)
+
+
+def format_price(sqrt_price_x96):
+    return to_precision((Decimal(sqrt_price_x96) / 2**96) ** 2)
+
+
 def get_position_key(address: str, lower_tick: int, upper_tick: int) -> str:
-    packed_data = encode_packed(
-        ["address", "int24", "int24"], [address, lower_tick, upper_tick]
+    return position_key(address, lower_tick, upper_tick).hex()
+
+
+def get_create2_address(factory_address: str, tokens, fee: int, bytecode: bytes) -> str:
+    token0, token1 = sorted(tokens, key=lambda token: token.lower())
+    # abi.encode(token0, token1, fee) pads every value to 32 bytes
+    salt = keccak(
+        encode_packed(
+            ["uint256", "uint256", "uint256"], [int(token0, 16), int(token1, 16), fee]
+        )
     )
-    return keccak(packed_data).hex()
+    create2_input = encode_packed(
+        ["bytes1", "address", "bytes32", "bytes32"],
+        [b"\xff", factory_address, salt, keccak(bytecode)],
+    )
+    return to_checksum_address(keccak(create2_input)[12:])
 
 
 def check_observation_equals(observation, expected_observation):
@@ -66,16 +130,28 @@ def check_observation_equals(observation, expected_observation):
         assert observation[key] == value
 
 
-def create_pool(fee, tick_spacing, first_token, second_token, factory):
-    mock_time_pool_deployer = MockTimeUniswapV3PoolDeployer.deploy(
-        {"from": accounts[0]}
-    )
+def approve_max(token, spender):
+    """
+    Approves spender to transfer all tokens of the owner of the token contract object,
+    unless this has already been done in the current test
+    """
+    if approval_cache.is_granted(token.address, spender.address):
+        return
+    token.approve(spender.address, MAX_UINT_256)
+    approval_cache.grant(token.address, spender.address)
+
+
+def create_pool(fee, tick_spacing, first_token, second_token, factory, deployer=None):
+    if deployer is None:
+        deployer = accounts[0]
+    mock_time_pool_deployer = MockTimeUniswapV3PoolDeployer.deploy({"from": deployer})
     tx = mock_time_pool_deployer.deploy(
         factory.address,
         first_token.address,
         second_token.address,
         fee.value,
         tick_spacing.value,
+        {"from": deployer},
     )
 
     return MockTimeUniswapV3Pool.at(tx.events["PoolDeployed"]["pool"])
@@ -99,6 +175,38 @@ def check_tick_is_not_clear(pool, tick):
     assert liquidity_gross != 0
 
 
+def transaction_logs(tx):
+    return receipt_logs(
+        tx,
+        lambda: [(log["address"], log["topics"], log["data"]) for log in tx.logs],
+    )
+
+
+def event_abi(contract, event_name):
+    return next(
+        item
+        for item in contract.abi
+        if item["type"] == "event" and item["name"] == event_name
+    )
+
+
+def events(tx, contract, event_name):
+    """
+    Arguments of the logs of an event emitted by the contract in the transaction by
+    their ABI names, only the logs of that event are decoded
+    """
+    return transaction_logs(tx).events(
+        event_codec(event_abi(contract, event_name)), contract.address
+    )
+
+
+def event_emitted(tx, contract, event_name, args) -> bool:
+    args = {name: getattr(value, "address", value) for name, value in args.items()}
+    return transaction_logs(tx).emitted(
+        event_codec(event_abi(contract, event_name)), args, contract.address
+    )
+
+
 class PoolHelper:
     def __init__(
         self,
@@ -138,7 +246,7 @@ class PoolHelper:
             sqrt_price_limit_x96 = (
                 MIN_SQRT_RATIO + 1 if input_token == self.token0 else MAX_SQRT_RATIO - 1
             )
-        input_token.approve(self.swap_target.address, MAX_UINT_256)
+        approve_max(input_token, self.swap_target)
         to_address = to if isinstance(to, str) else to.address
         return method(
             self.pool.address,
@@ -148,8 +256,8 @@ class PoolHelper:
         )
 
     def mint(self, recipient, tick_lower, tick_upper, liquidity):
-        self.token0.approve(self.swap_target.address, MAX_UINT_256)
-        self.token1.approve(self.swap_target.address, MAX_UINT_256)
+        approve_max(self.token0, self.swap_target)
+        approve_max(self.token1, self.swap_target)
         return self.swap_target.mint(
             self.pool.address, recipient, tick_lower, tick_upper, liquidity
         )
@@ -175,7 +283,7 @@ class PoolHelper:
             if input_token == self.token0
             else self.swap_target.swapToHigherSqrtPrice
         )
-        input_token.approve(self.swap_target.address, MAX_UINT_256)
+        approve_max(input_token, self.swap_target)
         to_address = to if isinstance(to, str) else to.address
         return method(self.pool.address, target_price, to_address)
 
@@ -196,3 +304,34 @@ class PoolHelper:
 
     def swap_1_for_exact_0(self, amount, to, sqrt_price_limit_x96=None):
         return self.swap(self.token1, 0, amount, to, sqrt_price_limit_x96)
+
+
+class MultiPoolHelper:
+    def __init__(
+        self,
+        input_token: TestERC20,
+        swap_target: TestUniswapV3Router,
+        pool_input: UniswapV3Pool,
+        pool_output: UniswapV3Pool,
+    ):
+        self.input_token = input_token
+        self.swap_target = swap_target
+        self.pool_input = pool_input
+        self.pool_output = pool_output
+
+    def swap_for_exact_multi(self, method, amount_out, to):
+        approve_max(self.input_token, self.swap_target)
+        to_address = to if isinstance(to, str) else to.address
+        return method(
+            to_address, self.pool_input.address, self.pool_output.address, amount_out
+        )
+
+    def swap_for_exact_0_multi(self, amount_out, to):
+        return self.swap_for_exact_multi(
+            self.swap_target.swapForExact0Multi, amount_out, to
+        )
+
+    def swap_for_exact_1_multi(self, amount_out, to):
+        return self.swap_for_exact_multi(
+            self.swap_target.swapForExact1Multi, amount_out, to
+        )
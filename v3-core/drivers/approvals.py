@@ -0,0 +1,45 @@
+import os
+
+# enabled by default, APPROVAL_CACHE=0 sends every approval for comparison
+APPROVAL_CACHE_ENABLED = os.environ.get("APPROVAL_CACHE", "1") not in ("", "0")
+
+
+class ApprovalCache:
+    """
+    Allowances granted by the pool helpers, keyed by (token, spender, owner). The
+    entries describe chain state that is reverted by test isolation, so the cache
+    has to be cleared after every test.
+    """
+
+    def __init__(self):
+        self.granted = set()
+        self.sent = 0
+        self.skipped = 0
+
+    @staticmethod
+    def key(token, spender, owner):
+        return str(token).lower(), str(spender).lower(), str(owner).lower()
+
+    def is_granted(self, token, spender, owner=None) -> bool:
+        if APPROVAL_CACHE_ENABLED and self.key(token, spender, owner) in self.granted:
+            self.skipped += 1
+            return True
+        return False
+
+    def grant(self, token, spender, owner=None):
+        self.sent += 1
+        self.granted.add(self.key(token, spender, owner))
+
+    def clear(self):
+        self.granted.clear()
+
+
+def format_approval_cache(cache):
+    total = cache.sent + cache.skipped
+    return (
+        f"approve transactions: {cache.sent} sent, {cache.skipped} skipped "
+        f"({cache.skipped / total:.1%} of {total} saved)"
+    )
+
+
+approval_cache = ApprovalCache()
@@ -0,0 +1,10 @@
+import json
+from pathlib import Path
+
+# compiled by npx hardhat compile
+ARTIFACTS_DIR = Path(__file__).parent.parent / "artifacts" / "contracts"
+
+
+def load_artifact(contract_name, artifacts_dir=ARTIFACTS_DIR):
+    path = next(artifacts_dir.rglob(f"{contract_name}.sol/{contract_name}.json"))
+    return json.loads(path.read_text())
@@ -0,0 +1,95 @@
+from drivers.base import TransactionReverted
+from drivers.codec import encode_call
+
+MAX_UINT_256 = 2**256 - 1
+# explicit gas limit of the pipelined transactions, the node cannot estimate gas of a
+# transaction that depends on transactions which have not been mined yet
+TRANSACTION_GAS = 5_000_000
+
+
+class AsyncPoolHelper:
+    """
+    Setup part of PoolHelper that queues transactions from an account unlocked in the
+    node with explicit nonces, so that none of them waits for the previous one to be
+    mined. wait submits all queued transactions through an RpcConnection in a single
+    request and collects their receipts.
+    """
+
+    def __init__(
+        self, connection, sender, token0, token1, pool, tick_spacing, swap_target
+    ):
+        self.connection = connection
+        self.sender = sender
+        self.token0 = token0
+        self.token1 = token1
+        self.pool = pool
+        self.tick_spacing = tick_spacing
+        self.swap_target = swap_target
+        self.min_tick = -(887272 // tick_spacing) * tick_spacing
+        self.max_tick = 887272 // tick_spacing * tick_spacing
+        self.nonce = None
+        self.queued = []
+
+    def transact(self, to, signature, types, args):
+        if self.nonce is None:
+            self.nonce = int(
+                self.connection.request(
+                    "eth_getTransactionCount", [self.sender, "pending"]
+                ),
+                16,
+            )
+        tx = {
+            "from": self.sender,
+            "to": to,
+            "data": encode_call(signature, types, args),
+            "nonce": hex(self.nonce),
+            "gas": hex(TRANSACTION_GAS),
+        }
+        self.nonce += 1
+        self.queued.append(tx)
+
+    def initialize(self, sqrt_price_x96):
+        self.transact(self.pool, "initialize(uint160)", ["uint160"], [sqrt_price_x96])
+
+    def approve_max(self, token, spender):
+        self.transact(
+            token,
+            "approve(address,uint256)",
+            ["address", "uint256"],
+            [spender, MAX_UINT_256],
+        )
+
+    def mint(self, recipient, tick_lower, tick_upper, liquidity):
+        self.approve_max(self.token0, self.swap_target)
+        self.approve_max(self.token1, self.swap_target)
+        self.transact(
+            self.swap_target,
+            "mint(address,address,int24,int24,uint128)",
+            ["address", "address", "int24", "int24", "uint128"],
+            [self.pool, recipient, tick_lower, tick_upper, liquidity],
+        )
+
+    def wait(self):
+        """
+        Submits the queued transactions and checks that all of them succeeded. They are
+        sent as one JSON-RPC batch, which the node processes in nonce order, Hardhat in
+        automine mode rejects transactions with a nonce gap. The receipts are requested
+        in batches too, until every transaction is mined.
+        """
+        queued, self.queued = self.queued, []
+        tx_hashes = self.connection.batch_request(
+            [("eth_sendTransaction", [tx]) for tx in queued]
+        )
+        receipts = dict.fromkeys(tx_hashes)
+        pending = tx_hashes
+        # all development chains mine on submission, the loop covers lagging receipts
+        while pending:
+            results = self.connection.batch_request(
+                [("eth_getTransactionReceipt", [tx_hash]) for tx_hash in pending]
+            )
+            receipts.update(zip(pending, results))
+            pending = [tx_hash for tx_hash in pending if receipts[tx_hash] is None]
+        for tx_hash, receipt in receipts.items():
+            if int(receipt["status"], 16) != 1:
+                raise TransactionReverted(tx_hash)
+        return list(receipts.values())
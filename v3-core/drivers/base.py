@@ -0,0 +1,79 @@
+from abc import ABC, abstractmethod
+
+
+def normalize(value):
+    """
+    Converts a return value or event argument to plain Python types, structs and
+    multiple return values become tuples
+    """
+    if isinstance(value, (str, bytes, int)):
+        return value
+    if isinstance(value, dict):
+        return {key: normalize(item) for key, item in value.items()}
+    if hasattr(value, "__iter__"):
+        return tuple(normalize(item) for item in value)
+    return value
+
+
+class TransactionReverted(Exception):
+    pass
+
+
+class RpcError(Exception):
+    """
+    Error response of a JSON-RPC request, error is the JSON-RPC error object
+    """
+
+    def __init__(self, error):
+        super().__init__(error.get("message", error))
+        self.error = error
+        self.data = error.get("data")
+
+
+class Driver(ABC):
+    """
+    Operations the framework-neutral scenarios need from a framework. Contracts,
+    accounts and transactions are the framework's own objects; return values and
+    event arguments are normalized to plain Python types, addresses to checksummed
+    strings.
+    """
+
+    name = None
+
+    @property
+    @abstractmethod
+    def accounts(self):
+        ...
+
+    @abstractmethod
+    def address(self, contract_or_account) -> str:
+        ...
+
+    @abstractmethod
+    def deploy(self, contract_name, *args, sender):
+        ...
+
+    @abstractmethod
+    def at(self, contract_name, address):
+        ...
+
+    @abstractmethod
+    def call(self, contract, function, *args):
+        ...
+
+    @abstractmethod
+    def transact(self, contract, function, *args, sender):
+        ...
+
+    @abstractmethod
+    def events(self, tx, contract, event_name):
+        """
+        Arguments of the events named event_name in the ABI of contract that contract
+        emitted in the transaction, as dicts; events of other contracts are left out
+        """
+
+    @abstractmethod
+    def reverts(self, reason=None):
+        """
+        Context manager that fails unless its body reverts, with reason if it is given
+        """
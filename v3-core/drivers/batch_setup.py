@@ -0,0 +1,247 @@
+import os
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+
+from eth_utils import keccak, to_checksum_address
+
+from drivers.async_pool_helper import MAX_UINT_256
+from drivers.codec import compile_encoder, encode_call
+from drivers.impact import impact_recorder
+
+BATCH_SETUP_ENABLED = os.environ.get("BATCH_SETUP", "") not in ("", "0")
+
+# gas limits of the queued transactions, the node cannot estimate gas of a transaction
+# that depends on transactions which have not been mined yet; the sum of the deployments
+# fits into the 30M block gas limit of Anvil and Hardhat
+SETUP_GAS = {
+    "token": 1_500_000,
+    "factory": 6_500_000,
+    "pool deployer": 6_500_000,
+    "pool": 6_000_000,
+    "callee": 1_500_000,
+    "initialize": 200_000,
+    "approve": 100_000,
+    "mint": 1_000_000,
+}
+
+
+def get_create_address(sender, nonce):
+    """
+    Address of the contract created by the transaction of sender with the given nonce
+    """
+    if nonce == 0:
+        encoded_nonce = b"\x80"
+    elif nonce < 0x80:
+        encoded_nonce = bytes([nonce])
+    else:
+        nonce_bytes = nonce.to_bytes((nonce.bit_length() + 7) // 8, "big")
+        encoded_nonce = bytes([0x80 + len(nonce_bytes)]) + nonce_bytes
+    # RLP encoding of [sender, nonce]
+    payload = b"\x94" + bytes.fromhex(sender[2:]) + encoded_nonce
+    return to_checksum_address(keccak(bytes([0xC0 + len(payload)]) + payload)[12:])
+
+
+def get_pool_address(pool_deployer, token0, token1, fee, tick_spacing, pool_code):
+    """
+    Address of the pool created by MockTimeUniswapV3PoolDeployer.deploy
+    """
+    salt = keccak(
+        bytes.fromhex(token0[2:])
+        + bytes.fromhex(token1[2:])
+        + fee.to_bytes(3, "big")
+        + tick_spacing.to_bytes(3, "big", signed=True)
+    )
+    return to_checksum_address(
+        keccak(b"\xff" + bytes.fromhex(pool_deployer[2:]) + salt + keccak(pool_code))[
+            12:
+        ]
+    )
+
+
+@contextmanager
+def automine_disabled(request):
+    """
+    Transactions sent inside the block stay pending until they are mined by evm_mine
+    """
+    ganache = request("web3_clientVersion").lower().startswith("ganache")
+    if ganache:
+        request("miner_stop")
+    else:
+        request("evm_setAutomine", [False])
+    try:
+        yield
+    finally:
+        if ganache:
+            request("miner_start")
+        else:
+            request("evm_setAutomine", [True])
+
+
+class BatchSetup:
+    """
+    Queues transactions of an account unlocked in the node with explicit nonces, to be
+    sent with automine disabled and mined together by mine
+    """
+
+    def __init__(self, request, sender):
+        self.request = request
+        self.sender = sender
+        self.nonce = int(request("eth_getTransactionCount", [sender, "pending"]), 16)
+        latest_block = request("eth_getBlockByNumber", ["latest", False])
+        self.block_gas_limit = int(latest_block["gasLimit"], 16)
+        self.pending = []
+
+    def send(self, tx, gas):
+        tx.update(
+            {
+                "from": self.sender,
+                "nonce": hex(self.nonce),
+                "gas": hex(min(gas, self.block_gas_limit)),
+            }
+        )
+        self.nonce += 1
+        self.pending.append(self.request("eth_sendTransaction", [tx]))
+
+    def deploy(self, code, gas, types=(), args=()):
+        address = get_create_address(self.sender, self.nonce)
+        self.send({"data": "0x" + (code + compile_encoder(types)(args)).hex()}, gas)
+        return address
+
+    def transact(self, to, signature, types, args, gas):
+        self.send({"to": to, "data": encode_call(signature, types, args)}, gas)
+
+    def mine(self):
+        """
+        Mines the queued transactions and returns the number of mined blocks, more than
+        one only if the transactions do not fit into the block gas limit (Ganache)
+        """
+        blocks = 0
+        # transactions of a single sender are mined in nonce order
+        while True:
+            self.request("evm_mine")
+            blocks += 1
+            if self.request("eth_getTransactionReceipt", [self.pending[-1]]):
+                break
+        for tx_hash in self.pending:
+            receipt = self.request("eth_getTransactionReceipt", [tx_hash])
+            if int(receipt["status"], 16) != 1:
+                raise ValueError(f"batch setup transaction {tx_hash} failed")
+        self.pending = []
+        return blocks
+
+
+class FixtureBatchSetup(ABC):
+    """
+    Batch setup of the test_pool.py fixtures, each suite implements the JSON-RPC
+    requests and the creation code of contract types of its framework
+    """
+
+    @abstractmethod
+    def request(self, method, params=()):
+        ...
+
+    @abstractmethod
+    def creation_code(self, contract_type) -> bytes:
+        ...
+
+    def deploy_fixture_contracts(self, sender, contract_types, fee, tick_spacing):
+        """
+        Deploys the tokens, factory, pool and callee of the test_pool.py fixtures in
+        a single block and returns their addresses by name. contract_types maps the
+        contract names to the contract types of the framework.
+        """
+        for name in contract_types:
+            impact_recorder.used(name)
+        with automine_disabled(self.request):
+            batch = BatchSetup(self.request, sender)
+            tokens = sorted(
+                (
+                    batch.deploy(
+                        self.creation_code(contract_types["TestERC20"]),
+                        SETUP_GAS["token"],
+                        ["uint256"],
+                        [2**255],
+                    )
+                    for _ in range(3)
+                ),
+                key=str.lower,
+            )
+            factory = batch.deploy(
+                self.creation_code(contract_types["UniswapV3Factory"]),
+                SETUP_GAS["factory"],
+            )
+            pool_deployer = batch.deploy(
+                self.creation_code(contract_types["MockTimeUniswapV3PoolDeployer"]),
+                SETUP_GAS["pool deployer"],
+            )
+            batch.transact(
+                pool_deployer,
+                "deploy(address,address,address,uint24,int24)",
+                ["address", "address", "address", "uint24", "int24"],
+                [factory, tokens[0], tokens[1], fee, tick_spacing],
+                SETUP_GAS["pool"],
+            )
+            swap_target = batch.deploy(
+                self.creation_code(contract_types["TestUniswapV3Callee"]),
+                SETUP_GAS["callee"],
+            )
+            batch.mine()
+
+        pool = get_pool_address(
+            pool_deployer,
+            tokens[0],
+            tokens[1],
+            fee,
+            tick_spacing,
+            self.creation_code(contract_types["MockTimeUniswapV3Pool"]),
+        )
+        return {
+            "token0": tokens[0],
+            "token1": tokens[1],
+            "token2": tokens[2],
+            "factory": factory,
+            "pool": pool,
+            "swap_target": swap_target,
+        }
+
+    def initialize_pool(
+        self,
+        sender,
+        pool,
+        token0,
+        token1,
+        swap_target,
+        sqrt_price_x96,
+        tick_lower,
+        tick_upper,
+        liquidity,
+    ):
+        """
+        Initializes the pool, approves the callee to spend both tokens of sender and
+        mints liquidity of sender through it, in a single block
+        """
+        with automine_disabled(self.request):
+            batch = BatchSetup(self.request, sender)
+            batch.transact(
+                pool,
+                "initialize(uint160)",
+                ["uint160"],
+                [sqrt_price_x96],
+                SETUP_GAS["initialize"],
+            )
+            for token in (token0, token1):
+                batch.transact(
+                    token,
+                    "approve(address,uint256)",
+                    ["address", "uint256"],
+                    [swap_target, MAX_UINT_256],
+                    SETUP_GAS["approve"],
+                )
+            batch.transact(
+                swap_target,
+                "mint(address,address,int24,int24,uint128)",
+                ["address", "address", "int24", "int24", "uint128"],
+                [pool, sender, tick_lower, tick_upper, liquidity],
+                SETUP_GAS["mint"],
+            )
+            batch.mine()
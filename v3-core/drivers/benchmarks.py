@@ -0,0 +1,72 @@
+import json
+import math
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+
+def percentile(values, q):
+    """
+    Nearest-rank percentile of a non-empty list of values
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * q / 100))
+    return ordered[rank - 1]
+
+
+class Timings:
+    def __init__(self):
+        self.samples = defaultdict(list)
+
+    def record(self, name, seconds):
+        self.samples[name].append(seconds)
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        yield
+        self.record(name, time.perf_counter() - start)
+
+    def summary(self):
+        """
+        Returns count, total, mean and latency percentiles in seconds and throughput
+        (measured operations per second) for each measured name
+        """
+        return {
+            name: {
+                "count": len(values),
+                "total": sum(values),
+                "mean": sum(values) / len(values),
+                "p50": percentile(values, 50),
+                "p95": percentile(values, 95),
+                "p99": percentile(values, 99),
+                "max": max(values),
+                "per_second": len(values) / sum(values),
+            }
+            for name, values in self.samples.items()
+        }
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.summary(), f, indent=2)
+
+
+def format_timings(summary):
+    """
+    Formats Timings.summary as a Markdown table with times in milliseconds
+    """
+    lines = [
+        "| name | count | total | mean | p50 | p95 | p99 | max | per second |",
+        "| --- | --- | --- | --- | --- | --- | --- | --- | --- |",
+    ]
+    for name, values in summary.items():
+        columns = [
+            f"{values[key] * 1000:.3f}"
+            for key in ("total", "mean", "p50", "p95", "p99", "max")
+        ]
+        columns.append(f"{values['per_second']:.1f}")
+        lines.append(f"| {name} | {values['count']} | " + " | ".join(columns) + " |")
+    return "\n".join(lines)
+
+
+timings = Timings()
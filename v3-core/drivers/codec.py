@@ -0,0 +1,226 @@
+import functools
+import re
+
+from eth_utils import keccak, to_checksum_address
+from eth_utils.abi import collapse_if_tuple
+
+try:
+    from eth_abi import decode, encode
+except ImportError:
+    # eth-abi 2 of the Brownie environment
+    from eth_abi import decode_abi as decode
+    from eth_abi import encode_abi as encode
+
+# compiled encoders and decoders by signature, position keys of the fuzz loops
+CACHE_SIZE = 2**16
+
+INTEGER_TYPE = re.compile(r"(u?)int(\d*)")
+FIXED_BYTES_TYPE = re.compile(r"bytes(\d+)")
+
+
+@functools.lru_cache(maxsize=None)
+def selector(signature):
+    return keccak(signature.encode())[:4]
+
+
+def static_encoder(abi_type):
+    """
+    Encoder of a single value of an elementary static ABI type into its 32 byte word,
+    None for the types left to eth-abi
+    """
+    integer = INTEGER_TYPE.fullmatch(abi_type)
+    if integer:
+        bits = int(integer[2] or 256)
+        signed = not integer[1]
+        low, high = (-(2 ** (bits - 1)), 2 ** (bits - 1)) if signed else (0, 2**bits)
+
+        def encode_integer(value):
+            if not low <= value < high:
+                raise ValueError(f"{value} out of {abi_type} range")
+            return value.to_bytes(32, "big", signed=signed)
+
+        return encode_integer
+    fixed_bytes = FIXED_BYTES_TYPE.fullmatch(abi_type)
+    if fixed_bytes:
+        size = int(fixed_bytes[1])
+
+        def encode_fixed_bytes(value):
+            if len(value) > size:
+                raise ValueError(f"{value!r} longer than {abi_type}")
+            return bytes(value).ljust(32, b"\x00")
+
+        return encode_fixed_bytes
+    if abi_type == "address":
+
+        def encode_address(value):
+            if len(value) != 42:
+                raise ValueError(f"{value} is not an address")
+            return bytes(12) + bytes.fromhex(value[2:])
+
+        return encode_address
+    if abi_type == "bool":
+        return lambda value: bytes(31) + (b"\x01" if value else b"\x00")
+    return None
+
+
+def static_decoder(abi_type):
+    """
+    Decoder of a 32 byte word into a value of an elementary static ABI type, addresses
+    are checksummed; None for the types left to eth-abi
+    """
+    integer = INTEGER_TYPE.fullmatch(abi_type)
+    if integer:
+        signed = not integer[1]
+        return lambda word: int.from_bytes(word, "big", signed=signed)
+    fixed_bytes = FIXED_BYTES_TYPE.fullmatch(abi_type)
+    if fixed_bytes:
+        size = int(fixed_bytes[1])
+        return lambda word: word[:size]
+    if abi_type == "address":
+        return lambda word: to_checksum_address(word[12:])
+    if abi_type == "bool":
+        return lambda word: word[31] == 1
+    return None
+
+
+def output_converter(abi_type):
+    """
+    Function applied to a value decoded by eth-abi, checksums addresses and turns
+    arrays and structs into tuples
+    """
+    if abi_type["type"].endswith("]"):
+        item = output_converter(
+            {**abi_type, "type": abi_type["type"][: abi_type["type"].rindex("[")]}
+        )
+        return lambda value: tuple(item(element) for element in value)
+    if abi_type["type"] == "tuple":
+        components = [output_converter(c) for c in abi_type["components"]]
+        return lambda value: tuple(
+            convert(element) for convert, element in zip(components, value)
+        )
+    if abi_type["type"] == "address":
+        return to_checksum_address
+    return lambda value: value
+
+
+def compile_encoder(types):
+    """
+    Function encoding a sequence of arguments of the given ABI types; arguments of
+    elementary static types are packed word by word, other types go through eth-abi
+    """
+    types = list(types)
+    encoders = [static_encoder(abi_type) for abi_type in types]
+    if None in encoders:
+        return lambda args: encode(types, list(args))
+
+    def encode_static(args):
+        if len(args) != len(encoders):
+            raise ValueError(f"expected {len(encoders)} arguments, got {len(args)}")
+        return b"".join(
+            encode_value(value) for encode_value, value in zip(encoders, args)
+        )
+
+    return encode_static
+
+
+def compile_decoder(outputs):
+    """
+    Function decoding return data of the given ABI outputs to a tuple of plain values
+    """
+    types = [collapse_if_tuple(output) for output in outputs]
+    decoders = [static_decoder(abi_type) for abi_type in types]
+    if None in decoders:
+        converters = [output_converter(output) for output in outputs]
+        return lambda data: tuple(
+            convert(value) for convert, value in zip(converters, decode(types, data))
+        )
+    offsets = range(0, 32 * len(decoders), 32)
+
+    def decode_static(data):
+        return tuple(
+            decode_word(data[offset : offset + 32])
+            for decode_word, offset in zip(decoders, offsets)
+        )
+
+    return decode_static
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def call_encoder(signature, types):
+    """
+    Compiled encoder of calls of the function with the given signature and argument
+    types, returning hex calldata
+    """
+    function_selector = selector(signature)
+    encode_args = compile_encoder(types)
+    return lambda args: "0x" + (function_selector + encode_args(args)).hex()
+
+
+def encode_call(signature, types, args):
+    return call_encoder(signature, tuple(types))(args)
+
+
+@functools.lru_cache(maxsize=CACHE_SIZE)
+def position_key(owner, tick_lower, tick_upper):
+    """
+    keccak256(abi.encodePacked(owner, tickLower, tickUpper)) of Position.get
+    """
+    return keccak(
+        bytes.fromhex(owner[2:])
+        + tick_lower.to_bytes(3, "big", signed=True)
+        + tick_upper.to_bytes(3, "big", signed=True)
+    )
+
+
+class FunctionCodec:
+    """
+    Selector, encoder and decoder of a function, compiled once from its ABI
+    """
+
+    def __init__(self, abi):
+        self.types = [collapse_if_tuple(i) for i in abi["inputs"]]
+        self.selector = selector(f"{abi['name']}({','.join(self.types)})")
+        self.encode_args = compile_encoder(self.types)
+        self.decode_outputs = compile_decoder(abi.get("outputs", []))
+        # calldata by arguments, most calls are repeated with the same arguments
+        self.calldata = {}
+
+    def encode(self, args):
+        try:
+            return self.calldata[args]
+        except KeyError:
+            data = "0x" + (self.selector + self.encode_args(args)).hex()
+            if len(self.calldata) < CACHE_SIZE:
+                self.calldata[args] = data
+            return data
+        except TypeError:
+            # unhashable arguments (arrays)
+            return "0x" + (self.selector + self.encode_args(args)).hex()
+
+    def decode(self, data):
+        values = self.decode_outputs(bytes.fromhex(data[2:]))
+        return values[0] if len(values) == 1 else values
+
+
+class EventCodec:
+    """
+    Topic and decoder of an event, compiled once from its ABI
+    """
+
+    def __init__(self, abi):
+        types = [collapse_if_tuple(i) for i in abi["inputs"]]
+        self.topic = "0x" + keccak(text=f"{abi['name']}({','.join(types)})").hex()
+        indexed = [i for i in abi["inputs"] if i["indexed"]]
+        self.indexed_names = [i["name"] for i in indexed]
+        self.decode_topics = compile_decoder(indexed)
+        data = [i for i in abi["inputs"] if not i["indexed"]]
+        self.data_names = [i["name"] for i in data]
+        self.decode_data = compile_decoder(data)
+
+    def decode(self, log):
+        topics = b"".join(bytes.fromhex(topic[2:]) for topic in log["topics"][1:])
+        args = dict(zip(self.indexed_names, self.decode_topics(topics)))
+        args.update(
+            zip(self.data_names, self.decode_data(bytes.fromhex(log["data"][2:])))
+        )
+        return args
@@ -0,0 +1,104 @@
+from collections import OrderedDict
+
+from drivers.codec import CACHE_SIZE, EventCodec
+
+# transactions whose decoded events are kept, a test asserts the events of its last
+# few transactions only
+RECEIPT_CACHE_SIZE = 256
+
+event_codecs = {}
+receipt_cache = OrderedDict()
+
+
+def hex_value(value):
+    if isinstance(value, str):
+        return value.lower()
+    return "0x" + bytes(value).hex()
+
+
+def event_codec(abi):
+    """
+    EventCodec of an event ABI, compiled once per signature
+    """
+    key = (
+        abi["name"],
+        tuple(
+            (i["type"], i["indexed"], str(i.get("components"))) for i in abi["inputs"]
+        ),
+    )
+    codec = event_codecs.get(key)
+    if codec is None:
+        if len(event_codecs) >= CACHE_SIZE:
+            event_codecs.clear()
+        codec = event_codecs[key] = EventCodec(abi)
+    return codec
+
+
+class ReceiptLogs:
+    """
+    Raw logs of a receipt indexed by topic0. Only the logs of an asserted event are
+    decoded, once, so an assertion on a Transfer does not decode the Mint logs.
+    """
+
+    def __init__(self, logs):
+        self.logs = {}
+        for address, topics, data in logs:
+            topics = [hex_value(topic) for topic in topics]
+            # anonymous events have no signature topic and cannot be asserted
+            if topics:
+                self.logs.setdefault(topics[0], []).append(
+                    {
+                        "address": hex_value(address),
+                        "topics": topics,
+                        "data": hex_value(data),
+                    }
+                )
+        self.decoded = {}
+
+    def events(self, codec, address=None):
+        """
+        Arguments of the logs of the event by their ABI names, in log order, only of the
+        logs emitted by the given address if any
+        """
+        if codec.topic not in self.decoded:
+            self.decoded[codec.topic] = [
+                (log["address"], codec.decode(log))
+                for log in self.logs.get(codec.topic, [])
+            ]
+        return [
+            event
+            for emitter, event in self.decoded[codec.topic]
+            if address is None or emitter == hex_value(address)
+        ]
+
+    def emitted(self, codec, args, address=None):
+        """
+        Whether a log of the event emitted by the given address if any has all the given
+        arguments, addresses are compared case-insensitively
+        """
+        return any(
+            all(
+                (
+                    hex_value(event[name]) == hex_value(value)
+                    if isinstance(value, str)
+                    else event[name] == value
+                )
+                for name, value in args.items()
+            )
+            for event in self.events(codec, address)
+        )
+
+
+def receipt_logs(tx, logs):
+    """
+    ReceiptLogs of a transaction object of the framework, logs is called to get its
+    (address, topics, data) triples only when the transaction is not cached yet.
+    Transactions are cached by identity, hashes repeat when a test replays a transaction
+    after a revert.
+    """
+    cached = receipt_cache.get(id(tx))
+    if cached is None or cached[0] is not tx:
+        cached = receipt_cache[id(tx)] = (tx, ReceiptLogs(logs()))
+        if len(receipt_cache) > RECEIPT_CACHE_SIZE:
+            receipt_cache.popitem(last=False)
+    return cached[1]
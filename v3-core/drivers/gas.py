@@ -0,0 +1,169 @@
+import json
+import os
+from collections import defaultdict
+
+from eth_utils import keccak
+
+GAS_REPORT_ENABLED = os.environ.get("GAS_REPORT", "") not in ("", "0")
+GAS_CHECK = os.environ.get("GAS_CHECK", "") not in ("", "0")
+GAS_UPDATE_BASELINE = os.environ.get("GAS_UPDATE_BASELINE", "") not in ("", "0")
+GAS_RELATIVE_TOLERANCE = float(os.environ.get("GAS_RELATIVE_TOLERANCE", "0.01"))
+GAS_ABSOLUTE_TOLERANCE = int(os.environ.get("GAS_ABSOLUTE_TOLERANCE", "0"))
+
+DEPLOYMENT = "deploy"
+UNKNOWN_FUNCTION = "unknown"
+
+# Functions are identified by selector so that all three suites aggregate
+# under the same names regardless of how each framework labels transactions.
+FUNCTION_SIGNATURES = [
+    # TestUniswapV3Callee
+    "swapExact0For1(address,uint256,address,uint160)",
+    "swap0ForExact1(address,uint256,address,uint160)",
+    "swapExact1For0(address,uint256,address,uint160)",
+    "swap1ForExact0(address,uint256,address,uint160)",
+    "swapToLowerSqrtPrice(address,uint160,address)",
+    "swapToHigherSqrtPrice(address,uint160,address)",
+    "mint(address,address,int24,int24,uint128)",
+    "flash(address,address,uint256,uint256,uint256,uint256)",
+    # UniswapV3Pool / MockTimeUniswapV3Pool
+    "initialize(uint160)",
+    "mint(address,int24,int24,uint128,bytes)",
+    "burn(int24,int24,uint128)",
+    "collect(address,int24,int24,uint128,uint128)",
+    "swap(address,bool,int256,uint160,bytes)",
+    "flash(address,uint256,uint256,bytes)",
+    "increaseObservationCardinalityNext(uint16)",
+    "setFeeProtocol(uint8,uint8)",
+    "collectProtocol(address,uint128,uint128)",
+    "advanceTime(uint256)",
+    "setFeeGrowthGlobal0X128(uint256)",
+    "setFeeGrowthGlobal1X128(uint256)",
+    # UniswapV3Factory / MockTimeUniswapV3PoolDeployer
+    "createPool(address,address,uint24)",
+    "setOwner(address)",
+    "enableFeeAmount(uint24,int24)",
+    "deploy(address,address,address,uint24,int24)",
+    # TestERC20
+    "approve(address,uint256)",
+    "transfer(address,uint256)",
+    "transferFrom(address,address,uint256)",
+    "mint(address,uint256)",
+]
+
+SELECTORS = {keccak(text=signature)[:4]: signature for signature in FUNCTION_SIGNATURES}
+
+
+def function_name(data) -> str:
+    if isinstance(data, str):
+        data = bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    return SELECTORS.get(bytes(data[:4]), UNKNOWN_FUNCTION)
+
+
+def within_tolerance(
+    value, expected, relative_tolerance=None, absolute_tolerance=None
+) -> bool:
+    if relative_tolerance is None:
+        relative_tolerance = GAS_RELATIVE_TOLERANCE
+    if absolute_tolerance is None:
+        absolute_tolerance = GAS_ABSOLUTE_TOLERANCE
+    return abs(value - expected) <= max(
+        absolute_tolerance, expected * relative_tolerance
+    )
+
+
+class GasReport:
+    def __init__(self):
+        self.gas_used = defaultdict(list)
+
+    def record(self, function, gas_used):
+        self.gas_used[function].append(int(gas_used))
+
+    def record_transaction(self, data, gas_used, deployment=False):
+        self.record(DEPLOYMENT if deployment else function_name(data), gas_used)
+
+    def aggregate(self):
+        """
+        Returns calls, min, max and average gas for each function
+        """
+        return {
+            function: {
+                "calls": len(values),
+                "min": min(values),
+                "max": max(values),
+                "avg": sum(values) // len(values),
+            }
+            for function, values in sorted(self.gas_used.items())
+        }
+
+    def diff(self, baseline, relative_tolerance=None, absolute_tolerance=None):
+        """
+        Compares average gas of each function against the baseline aggregate.
+        Returns rows of (function, expected, actual, delta, status).
+        """
+        aggregated = self.aggregate()
+        rows = []
+        for function in sorted(set(aggregated) | set(baseline)):
+            if function not in baseline:
+                actual = aggregated[function]["avg"]
+                rows.append((function, None, actual, None, "new"))
+                continue
+            if function not in aggregated:
+                expected = baseline[function]["avg"]
+                rows.append((function, expected, None, None, "missing"))
+                continue
+
+            expected = baseline[function]["avg"]
+            actual = aggregated[function]["avg"]
+            if within_tolerance(
+                actual, expected, relative_tolerance, absolute_tolerance
+            ):
+                status = "ok"
+            elif actual > expected:
+                status = "regression"
+            else:
+                status = "improvement"
+            rows.append((function, expected, actual, actual - expected, status))
+        return rows
+
+    def write(self, path):
+        with open(path, "w") as f:
+            json.dump(self.aggregate(), f, indent=2)
+
+
+def load_gas_report(path):
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def format_gas_aggregate(aggregated):
+    """
+    Formats aggregated gas usage as a Markdown table
+    """
+    lines = [
+        "| function | calls | min | max | avg |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    for function, values in aggregated.items():
+        lines.append(
+            f"| {function} | {values['calls']} | {values['min']} | {values['max']} | {values['avg']} |"
+        )
+    return "\n".join(lines)
+
+
+def format_gas_diff(rows):
+    """
+    Formats rows returned by GasReport.diff as a Markdown table
+    """
+    lines = [
+        "| function | baseline | current | delta | status |",
+        "| --- | --- | --- | --- | --- |",
+    ]
+    for function, expected, actual, delta, status in rows:
+        expected = "-" if expected is None else expected
+        actual = "-" if actual is None else actual
+        delta = "-" if delta is None else f"{delta:+d}"
+        lines.append(f"| {function} | {expected} | {actual} | {delta} | {status} |")
+    return "\n".join(lines)
+
+
+gas_report = GasReport()
@@ -0,0 +1,203 @@
+import hashlib
+import json
+import os
+import re
+from contextlib import contextmanager
+from pathlib import Path
+
+from drivers.workers import module_of, worker_path
+
+# TEST_IMPACT_RECORD=1 records the contracts used by every test into the impact
+# index of the suite, TEST_IMPACT_SELECT=1 runs only the tests whose contracts, test
+# module or suite code changed since the index was recorded
+TEST_IMPACT_RECORD = os.environ.get("TEST_IMPACT_RECORD", "") not in ("", "0")
+TEST_IMPACT_SELECT = os.environ.get("TEST_IMPACT_SELECT", "") not in ("", "0")
+
+PROJECT_DIR = Path(__file__).parent.parent
+CONTRACTS_DIR = PROJECT_DIR / "contracts"
+DRIVERS_DIR = Path(__file__).parent
+
+IMPORT = re.compile(r"""^\s*import\s+(?:[^;]*?\bfrom\s+)?["']([^"']+)["']""", re.M)
+DEFINITION = re.compile(
+    r"^\s*(?:abstract\s+)?(?:contract|library|interface)\s+(\w+)", re.M
+)
+
+
+def relative(path):
+    return path.resolve().relative_to(PROJECT_DIR.resolve()).as_posix()
+
+
+def file_hash(path):
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def source_graph(contracts_dir=CONTRACTS_DIR):
+    """
+    Returns the source file of every contract, library and interface by name and the
+    imported source files of every source file, paths relative to the project
+    """
+    definitions = {}
+    imports = {}
+    for path in sorted(contracts_dir.rglob("*.sol")):
+        source = path.read_text()
+        for name in DEFINITION.findall(source):
+            definitions[name] = relative(path)
+        imports[relative(path)] = {
+            relative(path.parent / imported)
+            for imported in IMPORT.findall(source)
+            if imported.startswith(".") and (path.parent / imported).exists()
+        }
+    return definitions, imports
+
+
+def source_closure(paths, imports):
+    """
+    Source files compiled into the given ones, libraries are inlined by the compiler so
+    a contract depends on every file it imports, directly or not
+    """
+    closure = set()
+    pending = list(paths)
+    while pending:
+        path = pending.pop()
+        if path not in closure:
+            closure.add(path)
+            pending.extend(imports.get(path, ()))
+    return closure
+
+
+def python_hashes(suite_dir):
+    return {
+        relative(path): file_hash(path)
+        for directory in (suite_dir, DRIVERS_DIR)
+        for path in sorted(directory.glob("*.py"))
+    }
+
+
+class ImpactRecorder:
+    """
+    Collects the contracts used by every test, deployed or attached to. Contracts used
+    while a fixture is set up are recorded for the fixture and attributed to every test
+    requesting it, directly or through other fixtures, also when the fixture is cached in
+    a wider scope. The others are used by the test itself.
+    """
+
+    def __init__(self):
+        self.fixtures = {}
+        self.active = []
+        self.test_contracts = set()
+        self.tests = {}
+
+    def start_test(self, nodeid):
+        self.test_contracts = set()
+
+    @contextmanager
+    def fixture_setup(self, name):
+        """
+        Records the contracts used while the fixture of the given name is set up, they
+        replace the contracts of a previous setup of the fixture
+        """
+        contracts = self.fixtures[name] = set()
+        self.active.append(contracts)
+        try:
+            yield
+        finally:
+            self.active.pop()
+
+    def used(self, contract_name):
+        """
+        Records a contract deployed, attached to at an address or loaded with a state
+        image by the fixture being set up or by the current test
+        """
+        (self.active[-1] if self.active else self.test_contracts).add(contract_name)
+
+    def finish_test(self, nodeid, fixturenames):
+        contracts = set(self.test_contracts)
+        for name in fixturenames:
+            contracts |= self.fixtures.get(name, set())
+        self.tests[nodeid] = sorted(contracts)
+
+    def write(self, path, suite_dir):
+        definitions, imports = source_graph()
+        tests = {}
+        for nodeid, contracts in self.tests.items():
+            sources = source_closure(
+                [definitions[name] for name in contracts if name in definitions],
+                imports,
+            )
+            tests[nodeid] = {"contracts": contracts, "sources": sorted(sources)}
+        index = {
+            "sources": {path: file_hash(PROJECT_DIR / path) for path in imports},
+            "python": python_hashes(suite_dir),
+            "tests": tests,
+        }
+        with open(worker_path(path), "w") as f:
+            json.dump(index, f, indent=2)
+
+
+def load_impact_index(path):
+    """
+    Loads the index written by a single process run or merges the indexes written by
+    the workers (impact_index.gw0.json, ...). Only the indexes recorded with the same
+    sources and suite code as the newest one are merged.
+    """
+    paths = [
+        candidate
+        for candidate in [path, *path.parent.glob(f"{path.stem}.*{path.suffix}")]
+        if candidate.exists()
+    ]
+    if not paths:
+        return None
+    indexes = []
+    for candidate in sorted(paths, key=lambda p: p.stat().st_mtime, reverse=True):
+        with open(candidate, "r") as f:
+            indexes.append(json.load(f))
+    merged = {
+        "sources": indexes[0]["sources"],
+        "python": indexes[0]["python"],
+        "tests": {},
+    }
+    for index in reversed(indexes):
+        if (
+            index["sources"] == merged["sources"]
+            and index["python"] == merged["python"]
+        ):
+            merged["tests"].update(index["tests"])
+    return merged
+
+
+def changed_files(recorded, current):
+    return {
+        path
+        for path in recorded.keys() | current.keys()
+        if recorded.get(path) != current.get(path)
+    }
+
+
+def select_impacted(items, index, suite_dir):
+    """
+    Returns the collected items impacted by the changes since the index was recorded and
+    the changed files. All items are impacted by a change of the suite code other than
+    test modules or of the drivers, and items missing in the index are always selected.
+    """
+    _, imports = source_graph()
+    changed_sources = changed_files(
+        index["sources"],
+        {path: file_hash(PROJECT_DIR / path) for path in imports},
+    )
+    changed_python = changed_files(index["python"], python_hashes(suite_dir))
+    changed = sorted(changed_sources | changed_python)
+    if any(not Path(path).name.startswith("test_") for path in changed_python):
+        return list(items), changed
+    selected = []
+    for item in items:
+        test = index["tests"].get(item.nodeid)
+        if (
+            test is None
+            or any(path.endswith(module_of(item.nodeid)) for path in changed_python)
+            or changed_sources.intersection(test["sources"])
+        ):
+            selected.append(item)
+    return selected, changed
+
+
+impact_recorder = ImpactRecorder()
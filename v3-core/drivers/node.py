@@ -0,0 +1,66 @@
+import json
+import os
+import signal
+import socket
+import subprocess
+import time
+import urllib.request
+from contextlib import contextmanager
+
+# development chains the drivers without a framework launch by themselves, with the
+# arguments Wake uses in wake.toml
+NODE_COMMANDS = {
+    "anvil": "anvil --port {port} --prune-history 100 --steps-tracing --silent",
+    "ganache": "ganache -k istanbul -q -p {port}",
+    "hardhat": "npx hardhat node --port {port}",
+}
+
+
+def client_version(uri):
+    request = urllib.request.Request(
+        uri,
+        data=json.dumps(
+            {"jsonrpc": "2.0", "id": 0, "method": "web3_clientVersion", "params": []}
+        ).encode(),
+        headers={"Content-Type": "application/json"},
+    )
+    with urllib.request.urlopen(request, timeout=1) as response:
+        return json.load(response)["result"]
+
+
+def free_port():
+    """
+    Port nothing listens on, for a chain launched next to the chains of a framework
+    """
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def launch_node(network, port=8545, timeout=60):
+    """
+    Launches the development chain and yields its HTTP endpoint once it answers
+    """
+    process = subprocess.Popen(
+        NODE_COMMANDS[network].format(port=port).split(),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        # npx starts Hardhat in a child process, the whole group is stopped at the end
+        start_new_session=True,
+    )
+    uri = f"http://127.0.0.1:{port}"
+    try:
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                client_version(uri)
+                break
+            except OSError:
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError(f"{network} did not start on port {port}")
+                time.sleep(0.1)
+        yield uri
+    finally:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait()
@@ -0,0 +1,79 @@
+from drivers.base import RpcError
+from drivers.codec import compile_decoder, encode_call, selector
+
+ERROR_SELECTOR = selector("Error(string)")
+ERROR_PREFIX = "0x" + ERROR_SELECTOR.hex()
+decode_error = compile_decoder([{"type": "string"}])
+
+
+def revert_data(error):
+    """
+    Revert data of a JSON-RPC error object, a hex string on Anvil, nested in "data" on
+    Hardhat and in "result" on Ganache
+    """
+    data = error.get("data") if isinstance(error, dict) else error
+    while isinstance(data, dict):
+        data = data.get("data", data.get("result"))
+    return data if isinstance(data, str) else None
+
+
+def decode_revert_reason(data):
+    """
+    Reason of an Error(string) revert data, None for other errors (custom errors,
+    panics, reverts without a reason)
+    """
+    if data is None or not data.startswith(ERROR_PREFIX):
+        return None
+    raw = bytes.fromhex(data[10:])
+    # the reason is the only argument, so it starts right after its offset and length
+    if len(raw) >= 64 and int.from_bytes(raw[:32], "big") == 32:
+        length = int.from_bytes(raw[32:64], "big")
+        if len(raw) >= 64 + length:
+            return raw[64 : 64 + length].decode("utf-8", "replace")
+    (reason,) = decode_error(raw)
+    return reason
+
+
+def revert_reason(error):
+    return decode_revert_reason(revert_data(error))
+
+
+def error_message(error):
+    return error.get("message", "") if isinstance(error, dict) else str(error)
+
+
+def call_error(request, sender, to, signature, types, args):
+    """
+    JSON-RPC error of the function call as a transaction of sender, from a plain
+    eth_call sent by request without mining a transaction or tracing it. Raises
+    AssertionError if it succeeds.
+    """
+    try:
+        request(
+            "eth_call",
+            [
+                {
+                    "from": str(sender),
+                    "to": str(to),
+                    "data": encode_call(signature, types, args),
+                },
+                "latest",
+            ],
+        )
+    except RpcError as e:
+        return e.error
+    raise AssertionError("expected a revert")
+
+
+def assert_reverts(request, sender, to, signature, types, args, reason=None):
+    """
+    Low overhead counterpart of the revert assertions of the frameworks, the reason is
+    decoded from the Error(string) data of the JSON-RPC error. request is the
+    send_request of the suite's driver.py.
+    """
+    error = call_error(request, sender, to, signature, types, args)
+    if reason is not None:
+        decoded = revert_reason(error)
+        assert decoded == reason or (
+            decoded is None and reason in error_message(error)
+        ), f"expected revert reason {reason!r}, got {error}"
@@ -0,0 +1,222 @@
+import http.client
+import json
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+from eth_utils import to_checksum_address
+from eth_utils.abi import collapse_if_tuple
+
+from drivers.artifacts import ARTIFACTS_DIR, load_artifact
+from drivers.base import Driver, RpcError, TransactionReverted
+from drivers.codec import EventCodec, FunctionCodec, compile_encoder
+from drivers.reverts import revert_reason
+
+
+class RpcConnection:
+    """
+    JSON-RPC over a single keep-alive HTTP connection
+    """
+
+    def __init__(self, uri):
+        url = urlparse(uri)
+        self.connection = http.client.HTTPConnection(url.hostname, url.port)
+        self.path = url.path or "/"
+        self.request_id = 0
+
+    def request(self, method, params=()):
+        self.request_id += 1
+        body = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "id": self.request_id,
+                "method": method,
+                "params": list(params),
+            }
+        )
+        try:
+            response = self._post(body)
+        except (http.client.RemoteDisconnected, ConnectionError):
+            # the node closed the idle connection (Hardhat after 5 s), reconnect once
+            self.connection.close()
+            response = self._post(body)
+        if "error" in response:
+            raise RpcError(response["error"])
+        return response["result"]
+
+    def batch_request(self, requests):
+        """
+        Sends (method, params) requests as a single JSON-RPC batch and returns their
+        results in order, raises the first error
+        """
+        first_id = self.request_id + 1
+        self.request_id += len(requests)
+        body = json.dumps(
+            [
+                {
+                    "jsonrpc": "2.0",
+                    "id": first_id + i,
+                    "method": method,
+                    "params": list(params),
+                }
+                for i, (method, params) in enumerate(requests)
+            ]
+        )
+        try:
+            responses = self._post(body)
+        except (http.client.RemoteDisconnected, ConnectionError):
+            self.connection.close()
+            responses = self._post(body)
+        # the responses of a batch may come in any order
+        responses = sorted(responses, key=lambda response: response["id"])
+        for response in responses:
+            if "error" in response:
+                raise RpcError(response["error"])
+        return [response["result"] for response in responses]
+
+    def _post(self, body):
+        self.connection.request(
+            "POST", self.path, body, {"Content-Type": "application/json"}
+        )
+        return json.loads(self.connection.getresponse().read())
+
+    def close(self):
+        self.connection.close()
+
+
+def provider_request(provider, method, params=()):
+    """
+    JSON-RPC request through the web3.py provider a framework is connected with, errors
+    are raised as RpcError like by RpcConnection
+    """
+    response = provider.make_request(method, list(params))
+    if "error" in response:
+        raise RpcError(response["error"])
+    return response["result"]
+
+
+class CompiledContract:
+    """
+    Selectors, codecs and event topics of a contract, computed once from its artifact
+    """
+
+    def __init__(self, artifact):
+        self.bytecode = bytes.fromhex(artifact["bytecode"][2:])
+        constructor = next(
+            (item for item in artifact["abi"] if item["type"] == "constructor"),
+            {"inputs": []},
+        )
+        self.encode_constructor_args = compile_encoder(
+            [collapse_if_tuple(i) for i in constructor["inputs"]]
+        )
+        self.functions = {
+            item["name"]: FunctionCodec(item)
+            for item in artifact["abi"]
+            if item["type"] == "function"
+        }
+        self.events = {
+            item["name"]: EventCodec(item)
+            for item in artifact["abi"]
+            if item["type"] == "event"
+        }
+
+
+class RpcContract:
+    def __init__(self, address, compiled):
+        self.address = address
+        self.compiled = compiled
+
+
+class RpcDriver(Driver):
+    """
+    Overhead floor: JSON-RPC requests written directly to a keep-alive connection,
+    with codecs precomputed from the Hardhat artifacts and the accounts unlocked in
+    the node
+    """
+
+    name = "rpc"
+
+    def __init__(self, connection, artifacts_dir=ARTIFACTS_DIR):
+        self.connection = connection
+        self.artifacts_dir = artifacts_dir
+        self.compiled = {}
+        self._accounts = [
+            to_checksum_address(account)
+            for account in connection.request("eth_accounts")
+        ]
+
+    @property
+    def accounts(self):
+        return self._accounts
+
+    def compile(self, contract_name):
+        if contract_name not in self.compiled:
+            self.compiled[contract_name] = CompiledContract(
+                load_artifact(contract_name, self.artifacts_dir)
+            )
+        return self.compiled[contract_name]
+
+    def address(self, contract_or_account):
+        # accounts are plain addresses
+        return getattr(contract_or_account, "address", contract_or_account)
+
+    def send(self, tx):
+        tx_hash = self.connection.request("eth_sendTransaction", [tx])
+        # all development chains mine on submission, the loop covers a lagging receipt
+        while True:
+            receipt = self.connection.request("eth_getTransactionReceipt", [tx_hash])
+            if receipt is not None:
+                break
+        if int(receipt["status"], 16) != 1:
+            raise TransactionReverted(tx_hash)
+        return receipt
+
+    def deploy(self, contract_name, *args, sender):
+        compiled = self.compile(contract_name)
+        data = compiled.bytecode + compiled.encode_constructor_args(args)
+        receipt = self.send({"from": sender, "data": "0x" + data.hex()})
+        return RpcContract(to_checksum_address(receipt["contractAddress"]), compiled)
+
+    def at(self, contract_name, address):
+        return RpcContract(address, self.compile(contract_name))
+
+    def call(self, contract, function, *args):
+        compiled = contract.compiled.functions[function]
+        return compiled.decode(
+            self.connection.request(
+                "eth_call",
+                [{"to": contract.address, "data": compiled.encode(args)}, "latest"],
+            )
+        )
+
+    def transact(self, contract, function, *args, sender):
+        return self.send(
+            {
+                "from": sender,
+                "to": contract.address,
+                "data": contract.compiled.functions[function].encode(args),
+            }
+        )
+
+    def events(self, tx, contract, event_name):
+        event = contract.compiled.events[event_name]
+        address = contract.address.lower()
+        return [
+            event.decode(log)
+            for log in tx["logs"]
+            if log["address"].lower() == address
+            and log["topics"]
+            and log["topics"][0] == event.topic
+        ]
+
+    @contextmanager
+    def reverts(self, reason=None):
+        try:
+            yield
+        except (RpcError, TransactionReverted) as e:
+            if reason is not None:
+                decoded = revert_reason(getattr(e, "data", None))
+                assert decoded == reason or reason in str(
+                    e
+                ), f"expected revert reason {reason!r}, got {e}"
+            return
+        raise AssertionError("expected a revert")
@@ -0,0 +1,397 @@
+import decimal
+from decimal import Decimal
+
+from drivers.codec import position_key
+
+MAX_UINT_128 = 2**128 - 1
+MAX_UINT_256 = 2**256 - 1
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+FEE_MEDIUM = 3000
+TICK_SPACING_MEDIUM = 60
+
+# name -> scenario, every scenario is a test body run against a fresh chain state
+SCENARIOS = {}
+
+
+def scenario(function):
+    SCENARIOS[function.__name__] = function
+    return function
+
+
+def get_min_tick(tick_spacing):
+    return -(887272 // tick_spacing) * tick_spacing
+
+
+def get_max_tick(tick_spacing):
+    return 887272 // tick_spacing * tick_spacing
+
+
+def get_max_liquidity_per_tick(tick_spacing):
+    return MAX_UINT_128 // (
+        (get_max_tick(tick_spacing) - get_min_tick(tick_spacing)) // tick_spacing + 1
+    )
+
+
+def expand_to_18_decimals(n):
+    return n * 10**18
+
+
+def encode_price_sqrt(reserve1, reserve0):
+    with decimal.localcontext(decimal.Context(prec=40)):
+        return int((Decimal(reserve1) / Decimal(reserve0)).sqrt() * 2**96)
+
+
+def get_position_key(address, tick_lower, tick_upper):
+    return position_key(address, tick_lower, tick_upper)
+
+
+class PoolFixture:
+    """
+    pool_fixture of test_pool.py deployed through a driver, with the PoolHelper
+    operations the scenarios use
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.wallet = driver.accounts[0]
+        self.other = driver.accounts[1]
+        tokens = [
+            driver.deploy("TestERC20", 2**255, sender=self.wallet) for _ in range(3)
+        ]
+        self.token0, self.token1, self.token2 = sorted(
+            tokens, key=lambda token: driver.address(token).lower()
+        )
+        self.factory = driver.deploy("UniswapV3Factory", sender=self.wallet)
+        pool_deployer = driver.deploy(
+            "MockTimeUniswapV3PoolDeployer", sender=self.wallet
+        )
+        tx = driver.transact(
+            pool_deployer,
+            "deploy",
+            driver.address(self.factory),
+            driver.address(self.token0),
+            driver.address(self.token1),
+            FEE_MEDIUM,
+            TICK_SPACING_MEDIUM,
+            sender=self.wallet,
+        )
+        (deployed,) = driver.events(tx, pool_deployer, "PoolDeployed")
+        self.pool = driver.at("MockTimeUniswapV3Pool", deployed["pool"])
+        self.swap_target = driver.deploy("TestUniswapV3Callee", sender=self.wallet)
+        self.tick_spacing = TICK_SPACING_MEDIUM
+        self.min_tick = get_min_tick(TICK_SPACING_MEDIUM)
+        self.max_tick = get_max_tick(TICK_SPACING_MEDIUM)
+        # (token, owner) pairs approved to the callee, like the approval cache
+        self.approved = set()
+
+    def approve(self, token, owner):
+        key = (self.driver.address(token), self.driver.address(owner))
+        if key in self.approved:
+            return
+        self.driver.transact(
+            token,
+            "approve",
+            self.driver.address(self.swap_target),
+            MAX_UINT_256,
+            sender=owner,
+        )
+        self.approved.add(key)
+
+    def initialize(self, sqrt_price_x96):
+        return self.driver.transact(
+            self.pool, "initialize", sqrt_price_x96, sender=self.wallet
+        )
+
+    def mint(self, recipient, tick_lower, tick_upper, liquidity, sender=None):
+        sender = self.wallet if sender is None else sender
+        self.approve(self.token0, sender)
+        self.approve(self.token1, sender)
+        return self.driver.transact(
+            self.swap_target,
+            "mint",
+            self.driver.address(self.pool),
+            self.driver.address(recipient),
+            tick_lower,
+            tick_upper,
+            liquidity,
+            sender=sender,
+        )
+
+    def swap_exact_0_for_1(self, amount, to):
+        self.approve(self.token0, self.wallet)
+        return self.driver.transact(
+            self.swap_target,
+            "swapExact0For1",
+            self.driver.address(self.pool),
+            amount,
+            self.driver.address(to),
+            MIN_SQRT_RATIO + 1,
+            sender=self.wallet,
+        )
+
+    def swap_exact_1_for_0(self, amount, to):
+        self.approve(self.token1, self.wallet)
+        return self.driver.transact(
+            self.swap_target,
+            "swapExact1For0",
+            self.driver.address(self.pool),
+            amount,
+            self.driver.address(to),
+            MAX_SQRT_RATIO - 1,
+            sender=self.wallet,
+        )
+
+    def advance_time(self, seconds):
+        return self.driver.transact(
+            self.pool, "advanceTime", seconds, sender=self.wallet
+        )
+
+    def slot0(self):
+        return self.driver.call(self.pool, "slot0")
+
+    def balance_of_pool(self, token):
+        return self.driver.call(token, "balanceOf", self.driver.address(self.pool))
+
+
+def initialized_pool(driver, sqrt_price_x96, liquidity):
+    fixture = PoolFixture(driver)
+    fixture.initialize(sqrt_price_x96)
+    fixture.mint(fixture.wallet, fixture.min_tick, fixture.max_tick, liquidity)
+    return fixture
+
+
+@scenario
+def constructor_initializes_immutables(driver):
+    """
+    Constructor initializes immutables
+    """
+    fixture = PoolFixture(driver)
+    pool = fixture.pool
+    assert driver.call(pool, "factory") == driver.address(fixture.factory)
+    assert driver.call(pool, "token0") == driver.address(fixture.token0)
+    assert driver.call(pool, "token1") == driver.address(fixture.token1)
+    assert driver.call(pool, "maxLiquidityPerTick") == get_max_liquidity_per_tick(
+        fixture.tick_spacing
+    )
+
+
+@scenario
+def initialize_fails_if_already_initialized(driver):
+    """
+    Fails if already initialized
+    """
+    fixture = PoolFixture(driver)
+    fixture.initialize(encode_price_sqrt(1, 1))
+    with driver.reverts():
+        fixture.initialize(encode_price_sqrt(1, 1))
+
+
+@scenario
+def initialize_fails_if_starting_price_is_too_low(driver):
+    """
+    Fails if starting price is too low
+    """
+    fixture = PoolFixture(driver)
+    with driver.reverts("R"):
+        fixture.initialize(1)
+    with driver.reverts("R"):
+        fixture.initialize(MIN_SQRT_RATIO - 1)
+
+
+@scenario
+def initialize_fails_if_starting_price_is_too_high(driver):
+    """
+    Fails if starting price is too high
+    """
+    fixture = PoolFixture(driver)
+    with driver.reverts("R"):
+        fixture.initialize(MAX_SQRT_RATIO)
+    with driver.reverts("R"):
+        fixture.initialize(2**160 - 1)
+
+
+@scenario
+def initialize_sets_initial_variables(driver):
+    """
+    Sets initial variables
+    """
+    fixture = PoolFixture(driver)
+    price = encode_price_sqrt(1, 2)
+    fixture.initialize(price)
+    sqrt_price_x96, tick, observation_index = fixture.slot0()[:3]
+    assert sqrt_price_x96 == price
+    assert observation_index == 0
+    assert tick == -6932
+
+
+@scenario
+def emits_an_initialized_event_with_the_input_tick(driver):
+    """
+    Emits an Initialized event with the input tick
+    """
+    fixture = PoolFixture(driver)
+    sqrt_price_x96 = encode_price_sqrt(1, 2)
+    tx = fixture.initialize(sqrt_price_x96)
+    assert driver.events(tx, fixture.pool, "Initialize") == [
+        {"sqrtPriceX96": sqrt_price_x96, "tick": -6932}
+    ]
+
+
+@scenario
+def increase_observation_cardinality_next_can_only_be_called_after_initialize(
+    driver,
+):
+    """
+    Can only be called after initialize
+    """
+    fixture = PoolFixture(driver)
+    with driver.reverts("LOK"):
+        driver.transact(
+            fixture.pool, "increaseObservationCardinalityNext", 2, sender=fixture.wallet
+        )
+
+
+@scenario
+def increase_observation_cardinality_next_emits_an_event_including_both_old_and_new(
+    driver,
+):
+    """
+    Emits an event including both old and new
+    """
+    fixture = PoolFixture(driver)
+    fixture.initialize(encode_price_sqrt(1, 1))
+    tx = driver.transact(
+        fixture.pool, "increaseObservationCardinalityNext", 2, sender=fixture.wallet
+    )
+    assert driver.events(tx, fixture.pool, "IncreaseObservationCardinalityNext") == [
+        {"observationCardinalityNextOld": 1, "observationCardinalityNextNew": 2}
+    ]
+
+
+@scenario
+def mint_fails_if_not_initialized(driver):
+    """
+    Fails if not initialized
+    """
+    fixture = PoolFixture(driver)
+    with driver.reverts("LOK"):
+        fixture.mint(fixture.wallet, -fixture.tick_spacing, fixture.tick_spacing, 1)
+
+
+@scenario
+def mint_fails_if_tick_lower_greater_than_tick_upper(driver):
+    """
+    Fails if tickLower greater than tickUpper
+    """
+    fixture = initialized_pool(driver, encode_price_sqrt(1, 10), 3161)
+    with driver.reverts():
+        fixture.mint(fixture.wallet, 1, 0, 1)
+
+
+@scenario
+def mint_initial_balances_and_tick(driver):
+    """
+    Initial balances and initial tick
+    """
+    fixture = initialized_pool(driver, encode_price_sqrt(1, 10), 3161)
+    assert fixture.balance_of_pool(fixture.token0) == 9996
+    assert fixture.balance_of_pool(fixture.token1) == 1000
+    assert fixture.slot0()[1] == -23028
+
+
+@scenario
+def mint_above_current_price_transfers_token0_only(driver):
+    """
+    Transfers token0 only
+    """
+    fixture = initialized_pool(driver, encode_price_sqrt(1, 10), 3161)
+    tx = fixture.mint(fixture.wallet, -22980, 0, 10000)
+    assert driver.events(tx, fixture.token0, "Transfer") == [
+        {
+            "from": driver.address(fixture.wallet),
+            "to": driver.address(fixture.pool),
+            "value": 21549,
+        }
+    ]
+    assert fixture.balance_of_pool(fixture.token0) == 9996 + 21549
+    assert fixture.balance_of_pool(fixture.token1) == 1000
+
+
+@scenario
+def mint_price_within_range_transfers_current_price_of_both_tokens(driver):
+    """
+    Price within range: transfers current price of both tokens
+    """
+    fixture = initialized_pool(driver, encode_price_sqrt(1, 10), 3161)
+    fixture.mint(
+        fixture.wallet,
+        fixture.min_tick + fixture.tick_spacing,
+        fixture.max_tick - fixture.tick_spacing,
+        100,
+    )
+    assert fixture.balance_of_pool(fixture.token0) == 9996 + 317
+    assert fixture.balance_of_pool(fixture.token1) == 1000 + 32
+
+
+@scenario
+def burn_does_not_clear_the_position_fee_growth_snapshot_if_no_more_liquidity(
+    driver,
+):
+    """
+    Does not clear the position fee growth snapshot if no more liquidity
+    """
+    fixture = initialized_pool(
+        driver, encode_price_sqrt(1, 1), expand_to_18_decimals(2)
+    )
+    fixture.advance_time(10)
+    fixture.mint(
+        fixture.other, fixture.min_tick, fixture.max_tick, expand_to_18_decimals(1)
+    )
+    fixture.swap_exact_0_for_1(expand_to_18_decimals(1), fixture.wallet)
+    fixture.swap_exact_1_for_0(expand_to_18_decimals(1), fixture.wallet)
+    driver.transact(
+        fixture.pool,
+        "burn",
+        fixture.min_tick,
+        fixture.max_tick,
+        expand_to_18_decimals(1),
+        sender=fixture.other,
+    )
+
+    (
+        liquidity,
+        fee_growth_inside0_last_x128,
+        fee_growth_inside1_last_x128,
+        tokens_owed0,
+        tokens_owed1,
+    ) = driver.call(
+        fixture.pool,
+        "positions",
+        get_position_key(
+            driver.address(fixture.other), fixture.min_tick, fixture.max_tick
+        ),
+    )
+    assert liquidity == 0
+    assert tokens_owed0 != 0
+    assert tokens_owed1 != 0
+    assert fee_growth_inside0_last_x128 == 340282366920938463463374607431768211
+    assert fee_growth_inside1_last_x128 == 340282366920938576890830247744589365
+
+
+@scenario
+def observe_current_tick_accumulator_after_two_swaps(driver):
+    """
+    Current tick accumulator after two swaps
+    """
+    fixture = initialized_pool(
+        driver, encode_price_sqrt(1, 1), expand_to_18_decimals(2)
+    )
+    fixture.swap_exact_0_for_1(expand_to_18_decimals(1) // 2, fixture.wallet)
+    assert fixture.slot0()[1] == -4452
+    fixture.advance_time(4)
+    fixture.swap_exact_1_for_0(expand_to_18_decimals(1) // 4, fixture.wallet)
+    assert fixture.slot0()[1] == -1558
+    fixture.advance_time(6)
+    tick_cumulatives = driver.call(fixture.pool, "observe", [0])[0]
+    assert tick_cumulatives[0] == -27156
@@ -0,0 +1,115 @@
+import heapq
+import json
+import os
+from pathlib import Path
+
+from drivers.workers import SHARD_COUNT, SHARD_INDEX, module_of, worker_path
+
+# durations of the tests of one framework and chain, recorded by a single worker run
+# with TEST_DURATIONS_RECORD=1 and used to schedule the runs with multiple workers
+TEST_DURATIONS_FILE = os.environ.get("TEST_DURATIONS_FILE", "")
+TEST_DURATIONS_RECORD = os.environ.get("TEST_DURATIONS_RECORD", "") not in ("", "0")
+
+
+class DurationRecorder:
+    """
+    Collects the wall time of every test, including the setup and teardown of its
+    fixtures, so the first test of a module also carries its module scoped deployments
+    """
+
+    def __init__(self):
+        self.seconds = {}
+
+    def record(self, nodeid, seconds):
+        self.seconds[nodeid] = self.seconds.get(nodeid, 0.0) + seconds
+
+    def write(self, path=TEST_DURATIONS_FILE):
+        with open(worker_path(Path(path)), "w") as f:
+            json.dump(self.seconds, f, indent=2, sort_keys=True)
+
+
+def load_test_durations(path=TEST_DURATIONS_FILE):
+    if not path or not Path(path).exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def module_durations(nodeids, durations):
+    """
+    Estimated duration of every module, the unit of scheduling, so module scoped fixtures
+    are set up on one worker only. Tests without a stored duration, e.g. new ones, count
+    as the mean of the stored tests.
+    """
+    default = sum(durations.values()) / len(durations) if durations else 0.0
+    modules = {}
+    for nodeid in nodeids:
+        module = module_of(nodeid)
+        modules[module] = modules.get(module, 0.0) + durations.get(nodeid, default)
+    return modules
+
+
+def lpt_schedule(modules, count):
+    """
+    Longest processing time first: the modules, from the longest, are assigned to the
+    worker with the least load so far. Returns the modules and the load of every worker.
+    """
+    heap = [(0.0, index) for index in range(count)]
+    assigned = [[] for _ in range(count)]
+    loads = [0.0] * count
+    for module in sorted(modules, key=lambda module: (-modules[module], module)):
+        load, index = heapq.heappop(heap)
+        assigned[index].append(module)
+        loads[index] = load + modules[module]
+        heapq.heappush(heap, (loads[index], index))
+    return assigned, loads
+
+
+def select_shard(items, durations=None, index=SHARD_INDEX, count=SHARD_COUNT):
+    """
+    Returns the collected items of the shard. Whole modules are assigned to the shards,
+    like pytest-xdist --dist loadfile, by LPT when test durations are stored and
+    round-robin in alphabetical order otherwise.
+    """
+    if durations:
+        modules = module_durations([item.nodeid for item in items], durations)
+        shard_modules = set(lpt_schedule(modules, count)[0][index])
+    else:
+        modules = sorted({module_of(item.nodeid) for item in items})
+        shard_modules = set(modules[index::count])
+    return [item for item in items if module_of(item.nodeid) in shard_modules]
+
+
+def longest_modules_first(items, durations):
+    """
+    Reorders the collected items so pytest-xdist --dist loadfile, which hands out the
+    modules in collection order to the idle workers, schedules them by LPT
+    """
+    modules = module_durations([item.nodeid for item in items], durations)
+    return sorted(items, key=lambda item: -modules[module_of(item.nodeid)])
+
+
+def format_schedule(modules, count):
+    """
+    Formats the LPT schedule of the modules as a Markdown table with loads in seconds
+    and the makespan compared to the ideal (total / workers) and the lower bound (the
+    ideal or the longest module, whichever is longer)
+    """
+    assigned, loads = lpt_schedule(modules, count)
+    lines = ["| worker | modules | load |", "| --- | --- | --- |"]
+    for index, (worker_modules, load) in enumerate(zip(assigned, loads)):
+        lines.append(f"| {index} | {', '.join(worker_modules)} | {load:.2f} |")
+    makespan = max(loads)
+    ideal = sum(loads) / count
+    lower_bound = max([ideal] + list(modules.values()))
+    lines.append("")
+    lines.append(
+        f"makespan {makespan:.2f} s, ideal {ideal:.2f} s ({makespan / ideal:.2f}x), "
+        f"lower bound {lower_bound:.2f} s ({makespan / lower_bound:.2f}x)"
+        if ideal > 0
+        else "no stored durations"
+    )
+    return "\n".join(lines)
+
+
+duration_recorder = DurationRecorder()
@@ -0,0 +1,32 @@
+from drivers.codec import EventCodec
+
+TRANSFER_ABI = {
+    "name": "Transfer",
+    "type": "event",
+    "anonymous": False,
+    "inputs": [
+        {"name": "from", "type": "address", "indexed": True},
+        {"name": "to", "type": "address", "indexed": True},
+        {"name": "value", "type": "uint256", "indexed": False},
+    ],
+}
+
+
+def test_event_codec():
+    """
+    topic0 is the full keccak of the event signature, the drivers match logs by it
+    """
+    codec = EventCodec(TRANSFER_ABI)
+    assert (
+        codec.topic
+        == "0xddf252ad1be2c89b69c2b068fc378daa952ba7f163c4a11628f55a4df523b3ef"
+    )
+    log = {
+        "topics": [codec.topic, "0x" + "00" * 31 + "01", "0x" + "00" * 31 + "02"],
+        "data": "0x" + (1000).to_bytes(32, "big").hex(),
+    }
+    assert codec.decode(log) == {
+        "from": "0x0000000000000000000000000000000000000001",
+        "to": "0x0000000000000000000000000000000000000002",
+        "value": 1000,
+    }
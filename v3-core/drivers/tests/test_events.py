@@ -0,0 +1,58 @@
+from drivers.events import ReceiptLogs, event_codec, receipt_logs
+from drivers.tests.test_codec import TRANSFER_ABI
+
+TOKEN0 = "0x00000000000000000000000000000000000000A0"
+TOKEN1 = "0x00000000000000000000000000000000000000a1"
+SENDER = "0x0000000000000000000000000000000000000001"
+POOL = "0x0000000000000000000000000000000000000002"
+MINT_TOPIC = "0x" + "11" * 32
+
+
+def transfer_log(token, value):
+    codec = event_codec(TRANSFER_ABI)
+    topics = [
+        codec.topic,
+        "0x" + SENDER[2:].rjust(64, "0"),
+        "0x" + POOL[2:].rjust(64, "0"),
+    ]
+    return token, topics, "0x" + value.to_bytes(32, "big").hex()
+
+
+def test_emitted_by_address():
+    """
+    Transfers are matched by their arguments and by the token emitting them
+    """
+    logs = ReceiptLogs(
+        [
+            transfer_log(TOKEN0, 21549),
+            (POOL, [MINT_TOPIC], "0x"),
+            transfer_log(TOKEN1, 1000),
+        ]
+    )
+    codec = event_codec(TRANSFER_ABI)
+    args = {"from": SENDER, "to": POOL, "value": 21549}
+    assert logs.emitted(codec, args)
+    assert logs.emitted(codec, args, TOKEN0.lower())
+    assert not logs.emitted(codec, args, TOKEN1)
+    assert not logs.emitted(codec, {**args, "value": 1}, TOKEN0)
+    assert [event["value"] for event in logs.events(codec)] == [21549, 1000]
+    assert [event["value"] for event in logs.events(codec, TOKEN1)] == [1000]
+    # the Mint log is never decoded
+    assert list(logs.decoded) == [codec.topic]
+
+
+def test_receipt_logs_cached_by_transaction():
+    """
+    The logs of a transaction are read and indexed once
+    """
+    calls = []
+
+    class Transaction:
+        def logs(self):
+            calls.append(self)
+            return [transfer_log(TOKEN0, 1)]
+
+    tx = Transaction()
+    first = receipt_logs(tx, tx.logs)
+    assert receipt_logs(tx, tx.logs) is first
+    assert calls == [tx]
@@ -0,0 +1,206 @@
+import mmap
+import os
+import sys
+from pathlib import Path
+
+from drivers.codec import encode_call
+
+# exact values of TickMath.getSqrtRatioAtTick for every tick as 160-bit big-endian
+# integers, built once by python -m drivers.tick_math
+TICK_TABLE_FILE = Path(__file__).parent.parent / "tick_math_table.bin"
+
+MIN_TICK = -887272
+MAX_TICK = 887272
+MIN_SQRT_RATIO = 4295128739
+MAX_SQRT_RATIO = 1461446703485210103287273052203988822378723970342
+MAX_UINT_256 = 2**256 - 1
+
+ENTRY_SIZE = 20
+TICK_COUNT = MAX_TICK - MIN_TICK + 1
+
+# (bit of the absolute tick, Q128.128 factor) of TickMath.getSqrtRatioAtTick
+RATIO_FACTORS = [
+    (0x2, 0xFFF97272373D413259A46990580E213A),
+    (0x4, 0xFFF2E50F5F656932EF12357CF3C7FDCC),
+    (0x8, 0xFFE5CACA7E10E4E61C3624EAA0941CD0),
+    (0x10, 0xFFCB9843D60F6159C9DB58835C926644),
+    (0x20, 0xFF973B41FA98C081472E6896DFB254C0),
+    (0x40, 0xFF2EA16466C96A3843EC78B326B52861),
+    (0x80, 0xFE5DEE046A99A2A811C461F1969C3053),
+    (0x100, 0xFCBE86C7900A88AEDCFFC83B479AA3A4),
+    (0x200, 0xF987A7253AC413176F2B074CF7815E54),
+    (0x400, 0xF3392B0822B70005940C7A398E4B70F3),
+    (0x800, 0xE7159475A2C29B7443B29C7FA6E889D9),
+    (0x1000, 0xD097F3BDFD2022B8845AD8F792AA5825),
+    (0x2000, 0xA9F746462D870FDF8A65DC1F90E061E5),
+    (0x4000, 0x70D869A156D2A1B890BB3DF62BAF32F7),
+    (0x8000, 0x31BE135F97D08FD981231505542FCFA6),
+    (0x10000, 0x9AA508B5B7A84E1C677DE54F3E99BC9),
+    (0x20000, 0x5D6AF8DEDB81196699C329225EE604),
+    (0x40000, 0x2216E584F5FA1EA926041BEDFE98),
+    (0x80000, 0x48A170391F7DC42444E8FA2),
+]
+
+
+def get_sqrt_ratio_at_tick(tick):
+    """
+    Port of TickMath.getSqrtRatioAtTick with the same integer arithmetic
+    """
+    abs_tick = abs(tick)
+    if abs_tick > MAX_TICK:
+        raise ValueError("T")
+    ratio = (
+        0xFFFCB933BD6FAD37AA2D162D1A594001
+        if abs_tick & 0x1
+        else 0x100000000000000000000000000000000
+    )
+    for bit, factor in RATIO_FACTORS:
+        if abs_tick & bit:
+            ratio = (ratio * factor) >> 128
+    if tick > 0:
+        ratio = MAX_UINT_256 // ratio
+    return (ratio >> 32) + (0 if ratio % (1 << 32) == 0 else 1)
+
+
+def build_tick_table(path=TICK_TABLE_FILE):
+    """
+    Writes the sqrt ratio of every tick from MIN_TICK to MAX_TICK, a 35 MB file
+    """
+    partial = path.with_name(path.name + ".partial")
+    with open(partial, "wb") as f:
+        for start in range(MIN_TICK, MAX_TICK + 1, 65536):
+            f.write(
+                b"".join(
+                    get_sqrt_ratio_at_tick(tick).to_bytes(ENTRY_SIZE, "big")
+                    for tick in range(start, min(start + 65536, MAX_TICK + 1))
+                )
+            )
+    os.replace(partial, path)
+
+
+class TickTable:
+    """
+    Memory-mapped table of TickMath.getSqrtRatioAtTick, the expected sqrt ratio of a
+    tick is a single read and the expected tick of a sqrt ratio a binary search over
+    the monotonic table, so only the pages of the looked up ticks are ever loaded
+    """
+
+    def __init__(self, path=TICK_TABLE_FILE):
+        if not path.exists():
+            build_tick_table(path)
+        with open(path, "rb") as f:
+            self.table = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.table) != TICK_COUNT * ENTRY_SIZE:
+            self.table.close()
+            raise ValueError(f"{path} is not a complete tick table, delete it")
+
+    def entry(self, index):
+        offset = index * ENTRY_SIZE
+        return int.from_bytes(self.table[offset : offset + ENTRY_SIZE], "big")
+
+    def sqrt_ratio(self, tick):
+        """
+        Expected result of TickMath.getSqrtRatioAtTick
+        """
+        if not MIN_TICK <= tick <= MAX_TICK:
+            raise ValueError("T")
+        return self.entry(tick - MIN_TICK)
+
+    def tick_at_sqrt_ratio(self, sqrt_ratio):
+        """
+        Expected result of TickMath.getTickAtSqrtRatio, the greatest tick whose sqrt
+        ratio is less than or equal to the given one
+        """
+        if not MIN_SQRT_RATIO <= sqrt_ratio < MAX_SQRT_RATIO:
+            raise ValueError("R")
+        low, high = 0, TICK_COUNT - 1
+        while low < high:
+            middle = (low + high + 1) // 2
+            if self.entry(middle) <= sqrt_ratio:
+                low = middle
+            else:
+                high = middle - 1
+        return low + MIN_TICK
+
+    def close(self):
+        self.table.close()
+
+
+def verification_cases(table, ticks=range(MIN_TICK, MAX_TICK + 1)):
+    """
+    (function, argument, expected result) of every tick: its sqrt ratio, and the tick
+    of the sqrt ratio of the tick and of the ratio just below it, the boundaries of
+    getTickAtSqrtRatio. Grouped by function, getSqrtRatioAtTick of all ticks first.
+    """
+    for tick in ticks:
+        yield "getSqrtRatioAtTick", tick, table.sqrt_ratio(tick)
+    for tick in ticks:
+        sqrt_ratio = table.sqrt_ratio(tick)
+        if tick > MIN_TICK:
+            yield "getTickAtSqrtRatio", sqrt_ratio - 1, tick - 1
+        if tick < MAX_TICK:
+            yield "getTickAtSqrtRatio", sqrt_ratio, tick
+
+
+def verification_batches(cases, batch_size):
+    """
+    Cases in batches of at most batch_size calls of a single function
+    """
+    batch = []
+    for case in cases:
+        if batch and (len(batch) == batch_size or batch[0][0] != case[0]):
+            yield batch
+            batch = []
+        batch.append(case)
+    if batch:
+        yield batch
+
+
+TICK_MATH_FUNCTIONS = {
+    "getSqrtRatioAtTick": ("getSqrtRatioAtTick(int24)", ["int24"], False),
+    "getTickAtSqrtRatio": ("getTickAtSqrtRatio(uint160)", ["uint160"], True),
+}
+
+
+def batch_call_requests(address, batch):
+    """
+    eth_call requests of a batch of cases to TickMathTest at address
+    """
+    requests = []
+    for function, argument, _ in batch:
+        signature, types, _ = TICK_MATH_FUNCTIONS[function]
+        call = {"to": address, "data": encode_call(signature, types, [argument])}
+        requests.append(("eth_call", [call, "latest"]))
+    return requests
+
+
+def batch_mismatches(batch, results):
+    """
+    Cases of a batch whose eth_call result differs from the table, with the result
+    """
+    mismatches = []
+    for (function, argument, expected), result in zip(batch, results):
+        signed = TICK_MATH_FUNCTIONS[function][2]
+        value = int.from_bytes(bytes.fromhex(result[2:]), "big", signed=signed)
+        if value != expected:
+            mismatches.append((function, argument, expected, value))
+    return mismatches
+
+
+tick_table = None
+
+
+def get_tick_table():
+    """
+    Tick table shared by the tests of a session, built on first use
+    """
+    global tick_table
+    if tick_table is None:
+        tick_table = TickTable()
+    return tick_table
+
+
+if __name__ == "__main__":
+    path = Path(sys.argv[1]) if len(sys.argv) > 1 else TICK_TABLE_FILE
+    build_tick_table(path)
+    print(f"{TICK_COUNT} ticks written to {path}")
@@ -0,0 +1,82 @@
+from contextlib import contextmanager
+
+from web3.exceptions import ContractLogicError
+from web3.logs import DISCARD
+
+from drivers.artifacts import ARTIFACTS_DIR, load_artifact
+from drivers.base import Driver, TransactionReverted, normalize
+
+
+class Web3Driver(Driver):
+    """
+    Baseline driver that uses web3.py directly with the Hardhat artifacts and the
+    accounts unlocked in the node
+    """
+
+    name = "web3"
+
+    def __init__(self, w3, artifacts_dir=ARTIFACTS_DIR):
+        self.w3 = w3
+        self.artifacts_dir = artifacts_dir
+        self.artifacts = {}
+        self._accounts = w3.eth.accounts
+
+    @property
+    def accounts(self):
+        return self._accounts
+
+    def artifact(self, contract_name):
+        if contract_name not in self.artifacts:
+            self.artifacts[contract_name] = load_artifact(
+                contract_name, self.artifacts_dir
+            )
+        return self.artifacts[contract_name]
+
+    def address(self, contract_or_account):
+        # accounts are plain addresses
+        return getattr(contract_or_account, "address", contract_or_account)
+
+    def wait(self, tx_hash):
+        receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, poll_latency=0.001)
+        if receipt["status"] != 1:
+            raise TransactionReverted(tx_hash.hex())
+        return receipt
+
+    def deploy(self, contract_name, *args, sender):
+        artifact = self.artifact(contract_name)
+        contract = self.w3.eth.contract(
+            abi=artifact["abi"], bytecode=artifact["bytecode"]
+        )
+        receipt = self.wait(contract.constructor(*args).transact({"from": sender}))
+        return self.at(contract_name, receipt["contractAddress"])
+
+    def at(self, contract_name, address):
+        return self.w3.eth.contract(
+            address=address, abi=self.artifact(contract_name)["abi"]
+        )
+
+    def call(self, contract, function, *args):
+        return normalize(contract.functions[function](*args).call())
+
+    def transact(self, contract, function, *args, sender):
+        return self.wait(contract.functions[function](*args).transact({"from": sender}))
+
+    def events(self, tx, contract, event_name):
+        return [
+            normalize(dict(event["args"]))
+            for event in contract.events[event_name]().process_receipt(
+                tx, errors=DISCARD
+            )
+            if event["address"] == contract.address
+        ]
+
+    @contextmanager
+    def reverts(self, reason=None):
+        try:
+            yield
+        except (ContractLogicError, TransactionReverted, ValueError) as e:
+            # Ganache reports reverts as JSON-RPC errors, i.e. ValueError
+            if reason is not None:
+                assert reason in str(e), f"expected revert reason {reason!r}, got {e}"
+            return
+        raise AssertionError("expected a revert")
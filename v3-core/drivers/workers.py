@@ -0,0 +1,42 @@
+import os
+
+# shard of a suite started by test_projects.py for frameworks without pytest-xdist support
+SHARD_INDEX = int(os.environ.get("SHARD_INDEX", "0"))
+SHARD_COUNT = int(os.environ.get("SHARD_COUNT", "1"))
+
+
+def worker_id():
+    """
+    Id of the pytest-xdist worker (gw0, gw1, ...) or of the shard (shard0, ...) running
+    the session, None in a single process run
+    """
+    if "PYTEST_XDIST_WORKER" in os.environ:
+        return os.environ["PYTEST_XDIST_WORKER"]
+    if SHARD_COUNT > 1:
+        return f"shard{SHARD_INDEX}"
+    return None
+
+
+def worker_path(path):
+    """
+    Path of a file written by the session, with the worker id before the suffix so that
+    workers do not overwrite each other's reports, e.g. benchmark_report.gw1.json
+    """
+    current_worker = worker_id()
+    if current_worker is None:
+        return path
+    return path.with_name(f"{path.stem}.{current_worker}{path.suffix}")
+
+
+def worker_count(config):
+    """
+    Number of pytest-xdist workers or shards the suite is run with
+    """
+    if SHARD_COUNT > 1:
+        return SHARD_COUNT
+    numprocesses = getattr(config.option, "numprocesses", None)
+    return numprocesses if isinstance(numprocesses, int) and numprocesses > 0 else 1
+
+
+def module_of(nodeid):
+    return nodeid.split("::")[0]
@@ -0,0 +1,28 @@
+import pytest
+
+from drivers.node import NODE_COMMANDS, launch_node
+from drivers.rpc_driver import RpcConnection, RpcDriver
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--network",
+        default="anvil",
+        choices=sorted(NODE_COMMANDS),
+        help="development chain to launch",
+    )
+
+
+@pytest.fixture(scope="session")
+def driver(request):
+    with launch_node(request.config.getoption("--network")) as uri:
+        connection = RpcConnection(uri)
+        yield RpcDriver(connection)
+        connection.close()
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolation(driver):
+    snapshot = driver.connection.request("evm_snapshot")
+    yield
+    driver.connection.request("evm_revert", [snapshot])
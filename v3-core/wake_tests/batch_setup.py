@@ -0,0 +1,13 @@
+from drivers.batch_setup import FixtureBatchSetup
+from wake_tests.driver import send_request
+
+
+class WakeFixtureBatchSetup(FixtureBatchSetup):
+    def request(self, method, params=()):
+        return send_request(method, params)
+
+    def creation_code(self, contract_type):
+        return contract_type.get_creation_code()
+
+
+batch_setup = WakeFixtureBatchSetup()
@@ -0,0 +1,89 @@
+import dataclasses
+
+from pytypes.contracts.test.MockTimeUniswapV3Pool import MockTimeUniswapV3Pool
+from pytypes.contracts.test.MockTimeUniswapV3PoolDeployer import \
+    MockTimeUniswapV3PoolDeployer
+from pytypes.contracts.test.TestERC20 import TestERC20
+from pytypes.contracts.test.TestUniswapV3Callee import TestUniswapV3Callee
+from pytypes.contracts.UniswapV3Factory import UniswapV3Factory
+from wake.development.json_rpc.communicator import JsonRpcError
+from wake.testing import *
+
+from drivers.base import Driver, RpcError, normalize
+
+CONTRACTS = {
+    contract.__name__: contract
+    for contract in (
+        MockTimeUniswapV3Pool,
+        MockTimeUniswapV3PoolDeployer,
+        TestERC20,
+        TestUniswapV3Callee,
+        UniswapV3Factory,
+    )
+}
+
+
+def send_request(method, params=()):
+    """
+    JSON-RPC request through the connection of the default chain
+    """
+    try:
+        return default_chain.chain_interface.send_request(method, list(params))
+    except JsonRpcError as e:
+        raise RpcError(e.data)
+
+
+def wake_normalize(value):
+    if isinstance(value, Address):
+        return str(value)
+    if dataclasses.is_dataclass(value):
+        return tuple(
+            wake_normalize(getattr(value, field.name))
+            for field in dataclasses.fields(value)
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(wake_normalize(item) for item in value)
+    return normalize(value)
+
+
+def function_name(name):
+    # pytypes append an underscore to functions that clash with Contract members
+    return f"{name}_" if name == "deploy" else name
+
+
+class WakeDriver(Driver):
+    name = "wake"
+
+    @property
+    def accounts(self):
+        return default_chain.accounts
+
+    def address(self, contract_or_account):
+        return str(contract_or_account.address)
+
+    def deploy(self, contract_name, *args, sender):
+        return CONTRACTS[contract_name].deploy(*args, from_=sender)
+
+    def at(self, contract_name, address):
+        return CONTRACTS[contract_name](address)
+
+    def call(self, contract, function, *args):
+        return wake_normalize(getattr(contract, function_name(function))(*args))
+
+    def transact(self, contract, function, *args, sender):
+        return getattr(contract, function_name(function))(*args, from_=sender)
+
+    def events(self, tx, contract, event_name):
+        return [
+            {
+                field.name.rstrip("_"): wake_normalize(getattr(event, field.name))
+                for field in dataclasses.fields(event)
+            }
+            for event in tx.events
+            if type(event).__name__ == event_name
+            and dataclasses.is_dataclass(event)
+            and event.origin.address == contract.address
+        ]
+
+    def reverts(self, reason=None):
+        return must_revert() if reason is None else must_revert(Error(reason))
@@ -0,0 +1,27 @@
+from pathlib import Path
+
+from wake.development.core import Contract
+
+from drivers.impact import impact_recorder
+
+IMPACT_INDEX_FILE = Path(__file__).parent / "impact_index.json"
+
+
+def instrument_contracts():
+    """
+    Reports the contract type of every deployment of Wake and of every contract attached
+    to at an address, e.g. TestERC20(address), to the impact recorder
+    """
+    deploy = Contract._deploy.__func__
+    init = Contract.__init__
+
+    def recorded_deploy(cls, *args, **kwargs):
+        impact_recorder.used(cls.__name__)
+        return deploy(cls, *args, **kwargs)
+
+    def recorded_init(self, *args, **kwargs):
+        impact_recorder.used(type(self).__name__)
+        init(self, *args, **kwargs)
+
+    Contract._deploy = classmethod(recorded_deploy)
+    Contract.__init__ = recorded_init
@@ -0,0 +1,27 @@
+from contextlib import contextmanager
+from pathlib import Path
+
+import tomli
+
+from drivers.node import free_port, launch_node
+
+WAKE_TOML = Path(__file__).parent.parent / "wake.toml"
+
+
+def testing_network():
+    """
+    Development chain of the testing section of wake.toml, test_projects.py sets it
+    for every network
+    """
+    with open(WAKE_TOML, "rb") as f:
+        return tomli.load(f)["testing"]["cmd"]
+
+
+@contextmanager
+def launch_testing_node():
+    """
+    Launches the development chain of wake.toml on a free port and yields its HTTP
+    endpoint, for tests that send requests to the node also without Wake
+    """
+    with launch_node(testing_network(), free_port()) as uri:
+        yield uri
@@ -0,0 +1,93 @@
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+import rlp
+from eth_utils import keccak
+from wake.development.json_rpc.communicator import JsonRpcCommunicator
+
+from drivers.workers import worker_path
+
+OPERATION_COUNTS_ENABLED = os.environ.get("OPERATION_COUNTS", "") not in ("", "0")
+OPERATION_COUNTS_FILE = worker_path(Path(__file__).parent / "operation_counts.json")
+
+ADVANCE_TIME_SELECTOR = "0x" + keccak(b"advanceTime(uint256)")[:4].hex()
+TRANSACTION_METHODS = {"eth_sendTransaction", "eth_sendRawTransaction"}
+# a revert surfaces as an error of the call, the gas estimation or the submission
+REVERTING_METHODS = TRANSACTION_METHODS | {"eth_call", "eth_estimateGas"}
+
+
+def transaction_fields(method, params):
+    """
+    Recipient (None for deployments) and calldata of a submitted transaction
+    """
+    if method == "eth_sendTransaction":
+        tx = params[0]
+        return tx.get("to"), tx.get("data", tx.get("input", "0x"))
+    raw = params[0]
+    if isinstance(raw, str):
+        raw = bytes.fromhex(raw[2:])
+    if raw[0] == 1:
+        fields = rlp.decode(raw[1:])
+        to, data = fields[4], fields[6]
+    elif raw[0] == 2:
+        fields = rlp.decode(raw[1:])
+        to, data = fields[5], fields[7]
+    else:
+        fields = rlp.decode(raw)
+        to, data = fields[3], fields[5]
+    return ("0x" + to.hex() if to else None), "0x" + data.hex()
+
+
+class OperationCounter:
+    """
+    Counts the JSON-RPC requests of a session by method and classifies them into the
+    operation types of the operation benchmarks
+    """
+
+    def __init__(self):
+        self.operations = Counter()
+        self.methods = Counter()
+
+    def record(self, method, params, failed):
+        self.methods[method] += 1
+        if failed and method in REVERTING_METHODS:
+            self.operations["revert"] += 1
+        elif method == "eth_call":
+            self.operations["call"] += 1
+        elif method in TRANSACTION_METHODS:
+            to, data = transaction_fields(method, params)
+            if not to:
+                self.operations["deploy"] += 1
+            elif data.startswith(ADVANCE_TIME_SELECTOR):
+                self.operations["time travel"] += 1
+            else:
+                self.operations["transaction"] += 1
+
+    def write(self, path=OPERATION_COUNTS_FILE):
+        with open(path, "w") as f:
+            json.dump(
+                {"operations": self.operations, "methods": self.methods}, f, indent=2
+            )
+
+
+operation_counter = OperationCounter()
+
+
+def instrument_requests():
+    """
+    Routes the JSON-RPC requests of Wake through the operation counter
+    """
+    send_request = JsonRpcCommunicator.send_request
+
+    def counted_send_request(self, method_name, params=None):
+        try:
+            result = send_request(self, method_name, params)
+        except Exception:
+            operation_counter.record(method_name, params, True)
+            raise
+        operation_counter.record(method_name, params, False)
+        return result
+
+    JsonRpcCommunicator.send_request = counted_send_request
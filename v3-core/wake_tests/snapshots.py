@@ -1,9 +1,38 @@
+import functools
 import json
 from pathlib import Path
 
+from drivers.gas import within_tolerance
+
+
+# cached for the gas and object snapshots only, match_snapshot keeps reading the file
+# on every call as in the measured suite
+@functools.lru_cache(maxsize=None)
+def load_snapshots(file_path):
+    filename = Path(__file__).parent / "__snapshots__" / f"{Path(file_path).name}.snap"
+    with open(filename, "r") as f:
+        return json.load(f)
+
+
+def load_snapshot(file_path, ident):
+    return int(load_snapshots(file_path)[ident])
+
 
 def match_snapshot(value, file_path, ident):
     filename = Path(__file__).parent / "__snapshots__" / f"{Path(file_path).name}.snap"
     with open(filename, "r") as f:
         expected = json.load(f)
         assert value == int(expected[ident])
+
+
+def match_gas_snapshot(
+    value, file_path, ident, relative_tolerance=None, absolute_tolerance=None
+):
+    expected = load_snapshot(file_path, ident)
+    assert within_tolerance(
+        value, expected, relative_tolerance, absolute_tolerance
+    ), f"{ident}: gas {value} outside tolerance of snapshot {expected}"
+
+
+def match_object_snapshot(value, file_path, ident):
+    assert value == load_snapshots(file_path)[ident], ident
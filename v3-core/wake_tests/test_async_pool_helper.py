@@ -0,0 +1,121 @@
+import os
+
+import pytest
+from pytypes.contracts.test.TestERC20 import TestERC20
+from pytypes.contracts.test.TestUniswapV3Callee import TestUniswapV3Callee
+from pytypes.contracts.UniswapV3Factory import UniswapV3Factory
+from wake.testing import *
+
+import wake_tests.utils as utils
+from drivers.async_pool_helper import AsyncPoolHelper
+from drivers.benchmarks import timings
+from drivers.rpc_driver import RpcConnection
+from wake_tests.node import launch_testing_node
+from wake_tests.utils import FeeAmount, TickSpacings
+
+# Compares the setup of initialized_pool_fixture in test_pool.py sent through PoolHelper
+# and through AsyncPoolHelper, ASYNC_POOL_HELPER_REPEATS times each.
+# Skipped by default so that the measured suite stays the same.
+ASYNC_POOL_HELPER_REPEATS = int(os.environ.get("ASYNC_POOL_HELPER_REPEATS", "0"))
+
+pytestmark = pytest.mark.skipif(
+    ASYNC_POOL_HELPER_REPEATS < 1,
+    reason="async pool helper benchmark runs only with ASYNC_POOL_HELPER_REPEATS >= 1",
+)
+
+INITIAL_PRICE = utils.encode_price_sqrt(1, 10)
+LIQUIDITY = 3161
+
+
+# RpcConnection needs the HTTP endpoint of the node, so the chain configured in
+# wake.toml is launched here and Wake connects to it
+@pytest.fixture(scope="module")
+def node_uri():
+    with launch_testing_node() as uri:
+        yield uri
+
+
+@pytest.fixture(scope="function", autouse=True)
+def chain(node_uri):
+    with default_chain.connect(node_uri):
+        yield default_chain
+
+
+def deploy_pool_helper(wallet):
+    token0 = TestERC20.deploy(2**255, from_=wallet)
+    token1 = TestERC20.deploy(2**255, from_=wallet)
+    token0, token1 = sorted([token0, token1], key=lambda token: token.address)
+    factory = UniswapV3Factory.deploy(from_=wallet)
+    pool = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token0, token1, factory
+    )
+    return utils.PoolHelper(
+        token0,
+        token1,
+        factory,
+        pool,
+        TickSpacings.MEDIUM,
+        TestUniswapV3Callee.deploy(from_=wallet),
+    )
+
+
+def pool_state(pool_helper):
+    pool = pool_helper.pool
+    return (
+        pool.slot0(),
+        pool.liquidity(),
+        pool_helper.token0.balanceOf(pool),
+        pool_helper.token1.balanceOf(pool),
+    )
+
+
+def setup_pools_async(uri, pool_helpers, wallet):
+    connection = RpcConnection(uri)
+    try:
+        for pool_helper in pool_helpers:
+            async_pool_helper = AsyncPoolHelper(
+                connection,
+                str(wallet.address),
+                str(pool_helper.token0.address),
+                str(pool_helper.token1.address),
+                str(pool_helper.pool.address),
+                pool_helper.tick_spacing,
+                str(pool_helper.swap_target.address),
+            )
+            with timings.measure("initialized pool setup async"):
+                async_pool_helper.initialize(INITIAL_PRICE)
+                async_pool_helper.mint(
+                    str(wallet.address),
+                    async_pool_helper.min_tick,
+                    async_pool_helper.max_tick,
+                    LIQUIDITY,
+                )
+                async_pool_helper.wait()
+    finally:
+        connection.close()
+
+
+class TestAsyncPoolHelper:
+    def test_initialized_pool_setup(self, node_uri):
+        """
+        Pools set up by PoolHelper and AsyncPoolHelper end in the same state
+        """
+        default_chain.set_default_accounts(default_chain.accounts[0])
+        wallet = default_chain.accounts[0]
+        sync_helpers = [
+            deploy_pool_helper(wallet) for _ in range(ASYNC_POOL_HELPER_REPEATS)
+        ]
+        async_helpers = [
+            deploy_pool_helper(wallet) for _ in range(ASYNC_POOL_HELPER_REPEATS)
+        ]
+
+        for pool_helper in sync_helpers:
+            with timings.measure("initialized pool setup"):
+                pool_helper.pool.initialize(INITIAL_PRICE, from_=wallet)
+                pool_helper.mint(
+                    wallet, pool_helper.min_tick, pool_helper.max_tick, LIQUIDITY
+                )
+        setup_pools_async(node_uri, async_helpers, wallet)
+
+        for sync_helper, async_helper in zip(sync_helpers, async_helpers):
+            assert pool_state(sync_helper) == pool_state(async_helper)
@@ -0,0 +1,27 @@
+import os
+
+import pytest
+from wake.testing import *
+
+from drivers.scenarios import SCENARIOS
+from wake_tests.driver import WakeDriver
+
+# Framework-neutral scenarios of drivers/scenarios.py, the same operations in every
+# suite and in the web3 baseline. Skipped by default so that the measured suite stays
+# the same.
+DRIVER_SCENARIOS = os.environ.get("DRIVER_SCENARIOS", "") not in ("", "0")
+
+pytestmark = pytest.mark.skipif(
+    not DRIVER_SCENARIOS, reason="driver scenarios run only with DRIVER_SCENARIOS=1"
+)
+
+
+@pytest.fixture(scope="function", autouse=True)
+def chain():
+    with default_chain.connect():
+        yield default_chain
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_scenario(name):
+    SCENARIOS[name](WakeDriver())
@@ -0,0 +1,165 @@
+import os
+import random
+
+import pytest
+from pytypes.contracts.test.TestERC20 import TestERC20
+from pytypes.contracts.test.TestUniswapV3Callee import TestUniswapV3Callee
+from pytypes.contracts.test.TestUniswapV3Router import TestUniswapV3Router
+from pytypes.contracts.UniswapV3Factory import UniswapV3Factory
+from pytypes.contracts.UniswapV3Pool import UniswapV3Pool
+from wake.testing import *
+
+import wake_tests.utils as utils
+from drivers.benchmarks import timings
+from wake_tests.utils import FeeAmount, TickSpacings
+
+# Creates FACTORY_BULK_POOLS pools through UniswapV3Factory.createPool across all fee
+# tiers and routes FACTORY_BULK_SWAPS two-hop swaps through TestUniswapV3Router.
+# Skipped by default so that the measured suite stays the same.
+FACTORY_BULK_POOLS = int(os.environ.get("FACTORY_BULK_POOLS", "0"))
+FACTORY_BULK_SWAPS = int(os.environ.get("FACTORY_BULK_SWAPS", "100"))
+FACTORY_BULK_SEED = int(os.environ.get("FACTORY_BULK_SEED", "0"))
+
+pytestmark = pytest.mark.skipif(
+    FACTORY_BULK_POOLS < 1,
+    reason="bulk pool creation runs only with FACTORY_BULK_POOLS >= 1",
+)
+
+LIQUIDITY = utils.expand_to_18_decimals(1000)
+
+
+def pool_keys(count):
+    """
+    Returns (pair, fee) keys of count pools, pair i being the pool of the i-th and
+    (i + 1)-th token. Every pair gets a pool of each fee tier before the next pair is used.
+    """
+    fees = list(FeeAmount)
+    return [(i // len(fees), fees[i % len(fees)]) for i in range(count)]
+
+
+def generate_routes(pools, count, seed):
+    """
+    Returns count (input pool key, output pool key, amount out) routes over two
+    consecutive pairs with random fee tiers, in both directions
+    """
+    rng = random.Random(seed)
+    fees = {}
+    for pair, fee in pools:
+        fees.setdefault(pair, []).append(fee)
+    pairs = [pair for pair in sorted(fees) if pair + 1 in fees]
+    routes = []
+    for _ in range(count):
+        pair = rng.choice(pairs)
+        hops = [(pair, rng.choice(fees[pair])), (pair + 1, rng.choice(fees[pair + 1]))]
+        if rng.random() < 0.5:
+            hops.reverse()
+        routes.append((hops[0], hops[1], rng.randint(10**15, 10**18)))
+    return routes
+
+
+@pytest.fixture(scope="module", autouse=True)
+def chain():
+    with default_chain.connect():
+        yield default_chain
+
+
+@pytest.fixture(scope="module")
+def bulk_pools(chain):
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    wallet = default_chain.accounts[0]
+    keys = pool_keys(FACTORY_BULK_POOLS)
+    tokens = []
+    for _ in range(keys[-1][0] + 2):
+        with timings.measure("deploy token"):
+            tokens.append(TestERC20.deploy(2**255, from_=wallet))
+    tokens.sort(key=lambda token: token.address)
+
+    factory = UniswapV3Factory.deploy(from_=wallet)
+    pools = {}
+    for pair, fee in keys:
+        with timings.measure(f"createPool {fee.name.lower()}"):
+            tx = factory.createPool(
+                tokens[pair].address, tokens[pair + 1].address, fee.value, from_=wallet
+            )
+        pools[(pair, fee)] = UniswapV3Pool(tx.events[0].pool)
+    return tokens, factory, pools
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolation(bulk_pools):
+    with default_chain.snapshot_and_revert():
+        yield
+
+
+class TestFactoryBulk:
+    def test_pools_match_create2_addresses(self, bulk_pools):
+        """
+        Every created pool is registered in both token orders at its CREATE2 address
+        """
+        tokens, factory, pools = bulk_pools
+        bytecode = UniswapV3Pool.get_creation_code()
+        for (pair, fee), pool in pools.items():
+            token0, token1 = tokens[pair], tokens[pair + 1]
+            create2_address = utils.get_create2_address(
+                str(factory.address),
+                [str(token0.address), str(token1.address)],
+                fee,
+                bytecode,
+            )
+            assert pool.address == Address(create2_address)
+            assert factory.getPool(token0, token1, fee.value) == pool.address
+            assert factory.getPool(token1, token0, fee.value) == pool.address
+            assert pool.tickSpacing() == TickSpacings[fee.name]
+
+    def test_route_swaps(self, bulk_pools):
+        """
+        Two-hop swaps through random pools deliver the exact output amount
+        """
+        tokens, factory, pools = bulk_pools
+        if len({pair for pair, _ in pools}) < 2:
+            pytest.skip("routing needs pools of at least two token pairs")
+        wallet = default_chain.accounts[0]
+        swap_target_callee = TestUniswapV3Callee.deploy(from_=wallet)
+        swap_target_router = TestUniswapV3Router.deploy(from_=wallet)
+        initialized = set()
+
+        for input_key, output_key, amount_out in generate_routes(
+            pools, FACTORY_BULK_SWAPS, FACTORY_BULK_SEED
+        ):
+            for pair, fee in [input_key, output_key]:
+                if (pair, fee) in initialized:
+                    continue
+                pool = pools[(pair, fee)]
+                pool_helper = utils.PoolHelper(
+                    tokens[pair],
+                    tokens[pair + 1],
+                    factory,
+                    pool,
+                    TickSpacings[fee.name],
+                    swap_target_callee,
+                )
+                pool.initialize(utils.encode_price_sqrt(1, 1), from_=wallet)
+                pool_helper.mint(
+                    wallet, pool_helper.min_tick, pool_helper.max_tick, LIQUIDITY
+                )
+                initialized.add((pair, fee))
+
+            # the input token is not shared with the output pool
+            input_pair, output_pair = input_key[0], output_key[0]
+            if input_pair < output_pair:
+                input_token, output_token = tokens[input_pair], tokens[output_pair + 1]
+            else:
+                input_token, output_token = tokens[input_pair + 1], tokens[output_pair]
+            multi_pool_helper = utils.MultiPoolHelper(
+                input_token, swap_target_router, pools[input_key], pools[output_key]
+            )
+            method = (
+                multi_pool_helper.swap_for_exact_0_multi
+                if output_token == tokens[output_pair]
+                else multi_pool_helper.swap_for_exact_1_multi
+            )
+
+            balance = output_token.balanceOf(wallet)
+            with timings.measure("route swap"):
+                method(amount_out, wallet)
+            assert output_token.balanceOf(wallet) == balance + amount_out
@@ -0,0 +1,118 @@
+import os
+
+import pytest
+from pytypes.contracts.interfaces.IERC20Minimal import IERC20Minimal
+from pytypes.contracts.test.BitMathTest import BitMathTest
+from pytypes.contracts.test.TestERC20 import TestERC20
+from pytypes.contracts.UniswapV3Factory import UniswapV3Factory
+from wake.testing import *
+
+import wake_tests.utils as utils
+from drivers.benchmarks import timings
+from wake_tests.utils import FeeAmount, TickSpacings
+
+# Times every framework primitive OPERATION_BENCHMARK_REPEATS times in isolation:
+# deploys, calls, transactions, reverts, event decoding and time travel.
+# Skipped by default so that the measured suite stays the same.
+OPERATION_BENCHMARK_REPEATS = int(os.environ.get("OPERATION_BENCHMARK_REPEATS", "0"))
+
+pytestmark = pytest.mark.skipif(
+    OPERATION_BENCHMARK_REPEATS < 1,
+    reason="operation benchmarks run only with OPERATION_BENCHMARK_REPEATS >= 1",
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def chain():
+    with default_chain.connect():
+        yield default_chain
+
+
+@pytest.fixture(scope="module")
+def contracts(chain):
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    token = TestERC20.deploy(2**255, from_=default_chain.accounts[0])
+    other_token = TestERC20.deploy(2**255, from_=default_chain.accounts[0])
+    bit_math = BitMathTest.deploy(from_=default_chain.accounts[0])
+    factory = UniswapV3Factory.deploy(from_=default_chain.accounts[0])
+    pool = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token, other_token, factory
+    )
+    return token, bit_math, pool
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolation(contracts):
+    with default_chain.snapshot_and_revert():
+        yield
+
+
+class TestOperationBenchmarks:
+    def test_deploy(self):
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation deploy TestERC20"):
+                TestERC20.deploy(2**255, from_=default_chain.accounts[0])
+            with timings.measure("operation deploy BitMathTest"):
+                BitMathTest.deploy(from_=default_chain.accounts[0])
+
+    def test_call(self, contracts):
+        token, bit_math, _ = contracts
+        for i in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation call mostSignificantBit"):
+                result = bit_math.mostSignificantBit(2 ** (i % 256))
+            assert result == i % 256
+            with timings.measure("operation call balanceOf"):
+                balance = token.balanceOf(default_chain.accounts[0].address)
+            assert balance == 2**255
+
+    def test_transaction(self, contracts):
+        token, _, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation transaction transfer"):
+                token.transfer(
+                    default_chain.accounts[1].address,
+                    1,
+                    from_=default_chain.accounts[0],
+                )
+        assert (
+            token.balanceOf(default_chain.accounts[1].address)
+            == OPERATION_BENCHMARK_REPEATS
+        )
+
+    def test_revert(self, contracts):
+        token, bit_math, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation revert call"):
+                with must_revert():
+                    bit_math.mostSignificantBit(0)
+            with timings.measure("operation revert transaction with reason"):
+                with must_revert(Error("insufficient balance")):
+                    token.transfer(
+                        default_chain.accounts[0].address,
+                        1,
+                        from_=default_chain.accounts[1],
+                    )
+
+    def test_event_decoding(self, contracts):
+        token, _, _ = contracts
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            tx = token.transfer(
+                default_chain.accounts[1].address, 1, from_=default_chain.accounts[0]
+            )
+            with timings.measure("operation event decoding"):
+                assert (
+                    IERC20Minimal.Transfer(
+                        from_=default_chain.accounts[0].address,
+                        to=default_chain.accounts[1].address,
+                        value=1,
+                    )
+                    in tx.events
+                )
+
+    def test_time_travel(self, contracts):
+        _, _, pool = contracts
+        start = pool.time()
+        for _ in range(OPERATION_BENCHMARK_REPEATS):
+            with timings.measure("operation time travel"):
+                pool.advanceTime(1, from_=default_chain.accounts[0])
+        assert pool.time() == start + OPERATION_BENCHMARK_REPEATS
@@ -0,0 +1,971 @@
+import pytest
+from pytypes.contracts.libraries.Oracle import Oracle
+from pytypes.contracts.test.OracleTest import OracleTest
+from wake.testing import *
+
+import wake_tests.utils as utils
+from drivers.gas import GAS_REPORT_ENABLED
+from wake_tests.snapshots import match_gas_snapshot, match_object_snapshot
+from wake_tests.utils import MAX_UINT_128
+
+pytestmark = pytest.mark.extended
+
+gas_test = pytest.mark.skipif(
+    not GAS_REPORT_ENABLED, reason="gas snapshots are checked only with GAS_REPORT=1"
+)
+
+
+def initialize_params(time, tick, liquidity):
+    return OracleTest.InitializeParams(time=time, tick=tick, liquidity=liquidity)
+
+
+def update_params(advance_time_by, tick, liquidity):
+    return OracleTest.UpdateParams(
+        advanceTimeBy=advance_time_by, tick=tick, liquidity=liquidity
+    )
+
+
+def observe_single(oracle, seconds_ago):
+    tick_cumulatives, seconds_per_liquidity_cumulative_x128s = oracle.observe(
+        [seconds_ago]
+    )
+    return tick_cumulatives[0], seconds_per_liquidity_cumulative_x128s[0]
+
+
+@pytest.fixture(scope="function", autouse=True)
+def chain():
+    with default_chain.connect():
+        yield default_chain
+
+
+@pytest.fixture(scope="function")
+def oracle():
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    return OracleTest.deploy(from_=default_chain.accounts[0])
+
+
+@pytest.fixture(scope="function")
+def initialized_oracle(oracle):
+    oracle.initialize(initialize_params(0, 0, 0), from_=default_chain.accounts[0])
+    return oracle
+
+
+class TestInitialize:
+    def test_index_is_0(self, oracle):
+        """
+        Index is 0
+        """
+        oracle.initialize(initialize_params(1, 1, 1), from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+
+    def test_cardinality_is_1(self, oracle):
+        """
+        Cardinality is 1
+        """
+        oracle.initialize(initialize_params(1, 1, 1), from_=default_chain.accounts[0])
+        assert oracle.cardinality() == 1
+
+    def test_cardinality_next_is_1(self, oracle):
+        """
+        Cardinality next is 1
+        """
+        oracle.initialize(initialize_params(1, 1, 1), from_=default_chain.accounts[0])
+        assert oracle.cardinalityNext() == 1
+
+    def test_sets_first_slot_timestamp_only(self, oracle):
+        """
+        Sets first slot timestamp only
+        """
+        oracle.initialize(initialize_params(1, 1, 1), from_=default_chain.accounts[0])
+        utils.check_observation_equals(
+            oracle.observations(0),
+            Oracle.Observation(
+                blockTimestamp=1,
+                tickCumulative=0,
+                secondsPerLiquidityCumulativeX128=0,
+                initialized=True,
+            ),
+        )
+
+    @gas_test
+    def test_gas(self, oracle):
+        """
+        Gas
+        """
+        tx = oracle.initialize(
+            initialize_params(1, 1, 1), from_=default_chain.accounts[0]
+        )
+        match_gas_snapshot(tx.gas_used, __file__, "initialize_gas")
+
+
+class TestGrow:
+    def test_increases_the_cardinality_next_for_the_first_call(
+        self, initialized_oracle
+    ):
+        """
+        Increases the cardinality next for the first call
+        """
+        oracle = initialized_oracle
+        oracle.grow(5, from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+        assert oracle.cardinality() == 1
+        assert oracle.cardinalityNext() == 5
+
+    def test_does_not_touch_the_first_slot(self, initialized_oracle):
+        """
+        Does not touch the first slot
+        """
+        oracle = initialized_oracle
+        oracle.grow(5, from_=default_chain.accounts[0])
+        utils.check_observation_equals(
+            oracle.observations(0),
+            Oracle.Observation(
+                blockTimestamp=0,
+                tickCumulative=0,
+                secondsPerLiquidityCumulativeX128=0,
+                initialized=True,
+            ),
+        )
+
+    def test_is_no_op_if_oracle_is_already_gte_that_size(self, initialized_oracle):
+        """
+        Is no op if oracle is already gte that size
+        """
+        oracle = initialized_oracle
+        oracle.grow(5, from_=default_chain.accounts[0])
+        oracle.grow(3, from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+        assert oracle.cardinality() == 1
+        assert oracle.cardinalityNext() == 5
+
+    def test_adds_data_to_all_the_slots(self, initialized_oracle):
+        """
+        Adds data to all the slots
+        """
+        oracle = initialized_oracle
+        oracle.grow(5, from_=default_chain.accounts[0])
+        for i in range(1, 5):
+            utils.check_observation_equals(
+                oracle.observations(i),
+                Oracle.Observation(
+                    blockTimestamp=1,
+                    tickCumulative=0,
+                    secondsPerLiquidityCumulativeX128=0,
+                    initialized=False,
+                ),
+            )
+
+    def test_grow_after_wrap(self, initialized_oracle):
+        """
+        Grow after wrap
+        """
+        oracle = initialized_oracle
+        oracle.grow(2, from_=default_chain.accounts[0])
+        # index is now 1
+        oracle.update(update_params(2, 1, 1), from_=default_chain.accounts[0])
+        # index is now 0 again
+        oracle.update(update_params(2, 1, 1), from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+        oracle.grow(3, from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+        assert oracle.cardinality() == 2
+        assert oracle.cardinalityNext() == 3
+
+    @gas_test
+    def test_gas_for_growing_by_1_slot_when_index_is_cardinality_minus_1(
+        self, initialized_oracle
+    ):
+        """
+        Gas for growing by 1 slot when index == cardinality - 1
+        """
+        tx = initialized_oracle.grow(2, from_=default_chain.accounts[0])
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            "grow_gas_for_growing_by_1_slot_when_index_is_cardinality_minus_1",
+        )
+
+    @gas_test
+    def test_gas_for_growing_by_10_slots_when_index_is_cardinality_minus_1(
+        self, initialized_oracle
+    ):
+        """
+        Gas for growing by 10 slots when index == cardinality - 1
+        """
+        tx = initialized_oracle.grow(11, from_=default_chain.accounts[0])
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            "grow_gas_for_growing_by_10_slots_when_index_is_cardinality_minus_1",
+        )
+
+    @gas_test
+    def test_gas_for_growing_by_1_slot_when_index_is_not_cardinality_minus_1(
+        self, initialized_oracle
+    ):
+        """
+        Gas for growing by 1 slot when index != cardinality - 1
+        """
+        initialized_oracle.grow(2, from_=default_chain.accounts[0])
+        tx = initialized_oracle.grow(3, from_=default_chain.accounts[0])
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            "grow_gas_for_growing_by_1_slot_when_index_is_not_cardinality_minus_1",
+        )
+
+    @gas_test
+    def test_gas_for_growing_by_10_slots_when_index_is_not_cardinality_minus_1(
+        self, initialized_oracle
+    ):
+        """
+        Gas for growing by 10 slots when index != cardinality - 1
+        """
+        initialized_oracle.grow(2, from_=default_chain.accounts[0])
+        tx = initialized_oracle.grow(12, from_=default_chain.accounts[0])
+        match_gas_snapshot(
+            tx.gas_used,
+            __file__,
+            "grow_gas_for_growing_by_10_slots_when_index_is_not_cardinality_minus_1",
+        )
+
+
+class TestWrite:
+    def test_single_element_array_gets_overwritten(self, initialized_oracle):
+        """
+        Single element array gets overwritten
+        """
+        oracle = initialized_oracle
+        oracle.update(update_params(1, 2, 5), from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+        utils.check_observation_equals(
+            oracle.observations(0),
+            Oracle.Observation(
+                blockTimestamp=1,
+                tickCumulative=0,
+                secondsPerLiquidityCumulativeX128=340282366920938463463374607431768211456,
+                initialized=True,
+            ),
+        )
+        oracle.update(update_params(5, -1, 8), from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+        utils.check_observation_equals(
+            oracle.observations(0),
+            Oracle.Observation(
+                blockTimestamp=6,
+                tickCumulative=10,
+                secondsPerLiquidityCumulativeX128=680564733841876926926749214863536422912,
+                initialized=True,
+            ),
+        )
+        oracle.update(update_params(3, 2, 3), from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+        utils.check_observation_equals(
+            oracle.observations(0),
+            Oracle.Observation(
+                blockTimestamp=9,
+                tickCumulative=7,
+                secondsPerLiquidityCumulativeX128=808170621437228850725514692650449502208,
+                initialized=True,
+            ),
+        )
+
+    def test_does_nothing_if_time_has_not_changed(self, initialized_oracle):
+        """
+        Does nothing if time has not changed
+        """
+        oracle = initialized_oracle
+        oracle.grow(2, from_=default_chain.accounts[0])
+        oracle.update(update_params(1, 3, 2), from_=default_chain.accounts[0])
+        assert oracle.index() == 1
+        oracle.update(update_params(0, -5, 9), from_=default_chain.accounts[0])
+        assert oracle.index() == 1
+
+    def test_writes_an_index_if_time_has_changed(self, initialized_oracle):
+        """
+        Writes an index if time has changed
+        """
+        oracle = initialized_oracle
+        oracle.grow(3, from_=default_chain.accounts[0])
+        oracle.update(update_params(6, 3, 2), from_=default_chain.accounts[0])
+        assert oracle.index() == 1
+        oracle.update(update_params(4, -5, 9), from_=default_chain.accounts[0])
+        assert oracle.index() == 2
+        utils.check_observation_equals(
+            oracle.observations(1),
+            Oracle.Observation(
+                blockTimestamp=6,
+                tickCumulative=0,
+                secondsPerLiquidityCumulativeX128=2041694201525630780780247644590609268736,
+                initialized=True,
+            ),
+        )
+
+    def test_grows_cardinality_when_writing_past(self, initialized_oracle):
+        """
+        Grows cardinality when writing past
+        """
+        oracle = initialized_oracle
+        oracle.grow(2, from_=default_chain.accounts[0])
+        oracle.grow(4, from_=default_chain.accounts[0])
+        assert oracle.cardinality() == 1
+        oracle.update(update_params(3, 5, 6), from_=default_chain.accounts[0])
+        assert oracle.cardinality() == 4
+        oracle.update(update_params(4, 6, 4), from_=default_chain.accounts[0])
+        assert oracle.cardinality() == 4
+        assert oracle.index() == 2
+        utils.check_observation_equals(
+            oracle.observations(2),
+            Oracle.Observation(
+                blockTimestamp=7,
+                tickCumulative=20,
+                secondsPerLiquidityCumulativeX128=1247702012043441032699040227249816775338,
+                initialized=True,
+            ),
+        )
+
+    def test_wraps_around(self, initialized_oracle):
+        """
+        Wraps around
+        """
+        oracle = initialized_oracle
+        oracle.grow(3, from_=default_chain.accounts[0])
+        oracle.update(update_params(3, 1, 2), from_=default_chain.accounts[0])
+        oracle.update(update_params(4, 2, 3), from_=default_chain.accounts[0])
+        oracle.update(update_params(5, 3, 4), from_=default_chain.accounts[0])
+        assert oracle.index() == 0
+        utils.check_observation_equals(
+            oracle.observations(0),
+            Oracle.Observation(
+                blockTimestamp=12,
+                tickCumulative=14,
+                secondsPerLiquidityCumulativeX128=2268549112806256423089164049545121409706,
+                initialized=True,
+            ),
+        )
+
+    def test_accumulates_liquidity(self, initialized_oracle):
+        """
+        Accumulates liquidity
+        """
+        oracle = initialized_oracle
+        oracle.grow(4, from_=default_chain.accounts[0])
+        oracle.update(update_params(3, 3, 2), from_=default_chain.accounts[0])
+        oracle.update(update_params(4, -7, 6), from_=default_chain.accounts[0])
+        oracle.update(update_params(5, -2, 4), from_=default_chain.accounts[0])
+        assert oracle.index() == 3
+        utils.check_observation_equals(
+            oracle.observations(1),
+            Oracle.Observation(
+                blockTimestamp=3,
+                tickCumulative=0,
+                secondsPerLiquidityCumulativeX128=1020847100762815390390123822295304634368,
+                initialized=True,
+            ),
+        )
+        utils.check_observation_equals(
+            oracle.observations(2),
+            Oracle.Observation(
+                blockTimestamp=7,
+                tickCumulative=12,
+                secondsPerLiquidityCumulativeX128=1701411834604692317316873037158841057280,
+                initialized=True,
+            ),
+        )
+        utils.check_observation_equals(
+            oracle.observations(3),
+            Oracle.Observation(
+                blockTimestamp=12,
+                tickCumulative=-23,
+                secondsPerLiquidityCumulativeX128=1984980473705474370203018543351981233493,
+                initialized=True,
+            ),
+        )
+        utils.check_observation_equals(
+            oracle.observations(4),
+            Oracle.Observation(
+                blockTimestamp=0,
+                tickCumulative=0,
+                secondsPerLiquidityCumulativeX128=0,
+                initialized=False,
+            ),
+        )
+
+
+class TestObserve:
+    class TestBeforeInitialization:
+        def test_fails_before_initialize(self, oracle):
+            """
+            Fails before initialize
+            """
+            with must_revert(Error("I")):
+                observe_single(oracle, 0)
+
+        def test_fails_if_an_older_observation_does_not_exist(self, oracle):
+            """
+            Fails if an older observation does not exist
+            """
+            oracle.initialize(
+                initialize_params(5, 2, 4), from_=default_chain.accounts[0]
+            )
+            with must_revert(Error("OLD")):
+                observe_single(oracle, 1)
+
+        def test_does_not_fail_across_overflow_boundary(self, oracle):
+            """
+            Does not fail across overflow boundary
+            """
+            oracle.initialize(
+                initialize_params(2**32 - 1, 2, 4), from_=default_chain.accounts[0]
+            )
+            oracle.advanceTime(2, from_=default_chain.accounts[0])
+            tick_cumulative, seconds_per_liquidity_cumulative_x128 = observe_single(
+                oracle, 1
+            )
+            assert tick_cumulative == 2
+            assert (
+                seconds_per_liquidity_cumulative_x128
+                == 85070591730234615865843651857942052864
+            )
+
+        def test_interpolates_correctly_at_max_liquidity(self, oracle):
+            """
+            Interpolates correctly at max liquidity
+            """
+            oracle.initialize(
+                initialize_params(0, 0, MAX_UINT_128), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(13, 0, 0), from_=default_chain.accounts[0])
+            assert observe_single(oracle, 0)[1] == 13
+            assert observe_single(oracle, 6)[1] == 7
+            assert observe_single(oracle, 12)[1] == 1
+            assert observe_single(oracle, 13)[1] == 0
+
+        def test_interpolates_correctly_at_min_liquidity(self, oracle):
+            """
+            Interpolates correctly at min liquidity
+            """
+            oracle.initialize(
+                initialize_params(0, 0, 0), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(
+                update_params(13, 0, MAX_UINT_128), from_=default_chain.accounts[0]
+            )
+            assert observe_single(oracle, 0)[1] == 13 << 128
+            assert observe_single(oracle, 6)[1] == 7 << 128
+            assert observe_single(oracle, 12)[1] == 1 << 128
+            assert observe_single(oracle, 13)[1] == 0
+
+        def test_interpolates_the_same_as_0_liquidity_for_1_liquidity(self, oracle):
+            """
+            Interpolates the same as 0 liquidity for 1 liquidity
+            """
+            oracle.initialize(
+                initialize_params(0, 0, 1), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(
+                update_params(13, 0, MAX_UINT_128), from_=default_chain.accounts[0]
+            )
+            assert observe_single(oracle, 0)[1] == 13 << 128
+            assert observe_single(oracle, 6)[1] == 7 << 128
+            assert observe_single(oracle, 12)[1] == 1 << 128
+            assert observe_single(oracle, 13)[1] == 0
+
+        def test_interpolates_correctly_across_uint32_seconds_boundaries(self, oracle):
+            """
+            Interpolates correctly across uint32 seconds boundaries
+            """
+            # setup
+            oracle.initialize(
+                initialize_params(0, 0, 0), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(
+                update_params(2**32 - 6, 0, 0), from_=default_chain.accounts[0]
+            )
+            assert observe_single(oracle, 0)[1] == (2**32 - 6) << 128
+            oracle.update(update_params(13, 0, 0), from_=default_chain.accounts[0])
+            assert observe_single(oracle, 0)[1] == 7 << 128
+
+            # interpolation checks
+            assert observe_single(oracle, 3)[1] == 4 << 128
+            assert observe_single(oracle, 8)[1] == (2**32 - 1) << 128
+
+        def test_single_observation_at_current_time(self, oracle):
+            """
+            Single observation at current time
+            """
+            oracle.initialize(
+                initialize_params(5, 2, 4), from_=default_chain.accounts[0]
+            )
+            assert observe_single(oracle, 0) == (0, 0)
+
+        def test_single_observation_in_past_but_not_earlier_than_seconds_ago(
+            self, oracle
+        ):
+            """
+            Single observation in past but not earlier than secondsAgo
+            """
+            oracle.initialize(
+                initialize_params(5, 2, 4), from_=default_chain.accounts[0]
+            )
+            oracle.advanceTime(3, from_=default_chain.accounts[0])
+            with must_revert(Error("OLD")):
+                observe_single(oracle, 4)
+
+        def test_single_observation_in_past_at_exactly_seconds_ago(self, oracle):
+            """
+            Single observation in past at exactly seconds ago
+            """
+            oracle.initialize(
+                initialize_params(5, 2, 4), from_=default_chain.accounts[0]
+            )
+            oracle.advanceTime(3, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 3) == (0, 0)
+
+        def test_single_observation_in_past_counterfactual_in_past(self, oracle):
+            """
+            Single observation in past counterfactual in past
+            """
+            oracle.initialize(
+                initialize_params(5, 2, 4), from_=default_chain.accounts[0]
+            )
+            oracle.advanceTime(3, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 1) == (
+                4,
+                170141183460469231731687303715884105728,
+            )
+
+        def test_single_observation_in_past_counterfactual_now(self, oracle):
+            """
+            Single observation in past counterfactual now
+            """
+            oracle.initialize(
+                initialize_params(5, 2, 4), from_=default_chain.accounts[0]
+            )
+            oracle.advanceTime(3, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 0) == (
+                6,
+                255211775190703847597530955573826158592,
+            )
+
+        def test_two_observations_in_chronological_order_0_seconds_ago_exact(
+            self, oracle
+        ):
+            """
+            Two observations in chronological order 0 seconds ago exact
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(4, 1, 2), from_=default_chain.accounts[0])
+            assert observe_single(oracle, 0) == (
+                -20,
+                272225893536750770770699685945414569164,
+            )
+
+        def test_two_observations_in_chronological_order_0_seconds_ago_counterfactual(
+            self, oracle
+        ):
+            """
+            Two observations in chronological order 0 seconds ago counterfactual
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(4, 1, 2), from_=default_chain.accounts[0])
+            oracle.advanceTime(7, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 0) == (
+                -13,
+                1463214177760035392892510811956603309260,
+            )
+
+        def test_two_observations_in_chronological_order_seconds_ago_is_exactly_on_first_observation(
+            self, oracle
+        ):
+            """
+            Two observations in chronological order seconds ago is exactly on first observation
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(4, 1, 2), from_=default_chain.accounts[0])
+            oracle.advanceTime(7, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 11) == (0, 0)
+
+        def test_two_observations_in_chronological_order_seconds_ago_is_between_first_and_second(
+            self, oracle
+        ):
+            """
+            Two observations in chronological order seconds ago is between first and second
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(4, 1, 2), from_=default_chain.accounts[0])
+            oracle.advanceTime(7, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 9) == (
+                -10,
+                136112946768375385385349842972707284582,
+            )
+
+        def test_two_observations_in_reverse_order_0_seconds_ago_exact(self, oracle):
+            """
+            Two observations in reverse order 0 seconds ago exact
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(4, 1, 2), from_=default_chain.accounts[0])
+            oracle.update(update_params(3, -5, 4), from_=default_chain.accounts[0])
+            assert observe_single(oracle, 0) == (
+                -17,
+                782649443918158465965761597093066886348,
+            )
+
+        def test_two_observations_in_reverse_order_0_seconds_ago_counterfactual(
+            self, oracle
+        ):
+            """
+            Two observations in reverse order 0 seconds ago counterfactual
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(4, 1, 2), from_=default_chain.accounts[0])
+            oracle.update(update_params(3, -5, 4), from_=default_chain.accounts[0])
+            oracle.advanceTime(7, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 0) == (
+                -52,
+                1378143586029800777026667160098661256396,
+            )
+
+        def test_two_observations_in_reverse_order_seconds_ago_is_exactly_on_first_observation(
+            self, oracle
+        ):
+            """
+            Two observations in reverse order seconds ago is exactly on first observation
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(4, 1, 2), from_=default_chain.accounts[0])
+            oracle.update(update_params(3, -5, 4), from_=default_chain.accounts[0])
+            oracle.advanceTime(7, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 10) == (
+                -20,
+                272225893536750770770699685945414569164,
+            )
+
+        def test_two_observations_in_reverse_order_seconds_ago_is_between_first_and_second(
+            self, oracle
+        ):
+            """
+            Two observations in reverse order seconds ago is between first and second
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.grow(2, from_=default_chain.accounts[0])
+            oracle.update(update_params(4, 1, 2), from_=default_chain.accounts[0])
+            oracle.update(update_params(3, -5, 4), from_=default_chain.accounts[0])
+            oracle.advanceTime(7, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 9) == (
+                -19,
+                442367076997220002502386989661298674892,
+            )
+
+        def test_can_fetch_multiple_observations(self, oracle):
+            """
+            Can fetch multiple observations
+            """
+            oracle.initialize(
+                initialize_params(5, 2, 2**15), from_=default_chain.accounts[0]
+            )
+            oracle.grow(4, from_=default_chain.accounts[0])
+            oracle.update(
+                update_params(13, 6, 2**12), from_=default_chain.accounts[0]
+            )
+            oracle.advanceTime(5, from_=default_chain.accounts[0])
+
+            (
+                tick_cumulatives,
+                seconds_per_liquidity_cumulative_x128s,
+            ) = oracle.observe([0, 3, 8, 13, 15, 18])
+            assert list(tick_cumulatives) == [56, 38, 20, 10, 6, 0]
+            assert list(seconds_per_liquidity_cumulative_x128s) == [
+                550383467004691728624232610897330176,
+                301153217795020002454768787094765568,
+                103845937170696552570609926584401920,
+                51922968585348276285304963292200960,
+                31153781151208965771182977975320576,
+                0,
+            ]
+
+        @gas_test
+        def test_gas_for_observe_since_most_recent(self, oracle):
+            """
+            Gas for observe since most recent
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.advanceTime(2, from_=default_chain.accounts[0])
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve([1]),
+                __file__,
+                "observe_before_initialization_gas_for_observe_since_most_recent",
+            )
+
+        @gas_test
+        def test_gas_for_single_observation_at_current_time(self, oracle):
+            """
+            Gas for single observation at current time
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve([0]),
+                __file__,
+                "observe_before_initialization_gas_for_single_observation_at_current_time",
+            )
+
+        @gas_test
+        def test_gas_for_single_observation_at_current_time_counterfactually_computed(
+            self, oracle
+        ):
+            """
+            Gas for single observation at current time counterfactually computed
+            """
+            oracle.initialize(
+                initialize_params(5, -5, 5), from_=default_chain.accounts[0]
+            )
+            oracle.advanceTime(5, from_=default_chain.accounts[0])
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve([0]),
+                __file__,
+                "observe_before_initialization_gas_for_single_observation_at_current_time_counterfactually_computed",
+            )
+
+    class TestInitializedWith5Observations:
+        @pytest.fixture(scope="function", params=[5, 2**32 - 5])
+        def oracle_5_observations(self, request, oracle):
+            starting_time = request.param
+            oracle.initialize(
+                initialize_params(starting_time, -5, 5),
+                from_=default_chain.accounts[0],
+            )
+            oracle.grow(5, from_=default_chain.accounts[0])
+            oracle.update(update_params(3, 1, 2), from_=default_chain.accounts[0])
+            oracle.update(update_params(2, -6, 4), from_=default_chain.accounts[0])
+            oracle.update(update_params(4, -2, 4), from_=default_chain.accounts[0])
+            oracle.update(update_params(1, -2, 9), from_=default_chain.accounts[0])
+            oracle.update(update_params(3, 4, 2), from_=default_chain.accounts[0])
+            oracle.update(update_params(6, 6, 7), from_=default_chain.accounts[0])
+            return f"observe_starting_time_{starting_time}", oracle
+
+        def test_index_cardinality_cardinality_next(self, oracle_5_observations):
+            """
+            Index, cardinality, cardinality next
+            """
+            prefix, oracle = oracle_5_observations
+            assert oracle.index() == 1
+            assert oracle.cardinality() == 5
+            assert oracle.cardinalityNext() == 5
+
+        def test_latest_observation_same_time_as_latest(self, oracle_5_observations):
+            """
+            Latest observation same time as latest
+            """
+            prefix, oracle = oracle_5_observations
+            assert observe_single(oracle, 0) == (
+                -21,
+                2104079302127802832415199655953100107502,
+            )
+
+        def test_latest_observation_5_seconds_after_latest(self, oracle_5_observations):
+            """
+            Latest observation 5 seconds after latest
+            """
+            prefix, oracle = oracle_5_observations
+            oracle.advanceTime(5, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 5) == (
+                -21,
+                2104079302127802832415199655953100107502,
+            )
+
+        def test_current_observation_5_seconds_after_latest(
+            self, oracle_5_observations
+        ):
+            """
+            Current observation 5 seconds after latest
+            """
+            prefix, oracle = oracle_5_observations
+            oracle.advanceTime(5, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 0) == (
+                9,
+                2347138135642758877746181518404363115684,
+            )
+
+        def test_between_latest_observation_and_just_before_latest_observation_at_same_time_as_latest(
+            self, oracle_5_observations
+        ):
+            """
+            Between latest observation and just before latest observation at same time as latest
+            """
+            prefix, oracle = oracle_5_observations
+            assert observe_single(oracle, 3) == (
+                -33,
+                1593655751746395137220137744805447790318,
+            )
+
+        def test_between_latest_observation_and_just_before_latest_observation_after_the_latest_observation(
+            self, oracle_5_observations
+        ):
+            """
+            Between latest observation and just before latest observation after the latest observation
+            """
+            prefix, oracle = oracle_5_observations
+            oracle.advanceTime(5, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 8) == (
+                -33,
+                1593655751746395137220137744805447790318,
+            )
+
+        def test_older_than_oldest_reverts(self, oracle_5_observations):
+            """
+            Older than oldest reverts
+            """
+            prefix, oracle = oracle_5_observations
+            with must_revert(Error("OLD")):
+                observe_single(oracle, 15)
+            oracle.advanceTime(5, from_=default_chain.accounts[0])
+            with must_revert(Error("OLD")):
+                observe_single(oracle, 20)
+
+        def test_oldest_observation(self, oracle_5_observations):
+            """
+            Oldest observation
+            """
+            prefix, oracle = oracle_5_observations
+            assert observe_single(oracle, 14) == (
+                -13,
+                544451787073501541541399371890829138329,
+            )
+
+        def test_oldest_observation_after_some_time(self, oracle_5_observations):
+            """
+            Oldest observation after some time
+            """
+            prefix, oracle = oracle_5_observations
+            oracle.advanceTime(6, from_=default_chain.accounts[0])
+            assert observe_single(oracle, 20) == (
+                -13,
+                544451787073501541541399371890829138329,
+            )
+
+        def test_fetch_many_values(self, oracle_5_observations):
+            """
+            Fetch many values
+            """
+            prefix, oracle = oracle_5_observations
+            oracle.advanceTime(6, from_=default_chain.accounts[0])
+            (
+                tick_cumulatives,
+                seconds_per_liquidity_cumulative_x128s,
+            ) = oracle.observe([20, 17, 13, 10, 5, 1, 0])
+            match_object_snapshot(
+                {
+                    "secondsPerLiquidityCumulativeX128s": [
+                        str(value) for value in seconds_per_liquidity_cumulative_x128s
+                    ],
+                    "tickCumulatives": list(tick_cumulatives),
+                },
+                __file__,
+                f"{prefix}_fetch_many_values",
+            )
+
+        @gas_test
+        def test_gas_all_of_last_20_seconds(self, oracle_5_observations):
+            """
+            Gas all of last 20 seconds
+            """
+            prefix, oracle = oracle_5_observations
+            oracle.advanceTime(6, from_=default_chain.accounts[0])
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve(list(range(20, -1, -1))),
+                __file__,
+                f"{prefix}_gas_all_of_last_20_seconds",
+            )
+
+        @gas_test
+        def test_gas_latest_equal(self, oracle_5_observations):
+            """
+            Gas latest equal
+            """
+            prefix, oracle = oracle_5_observations
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve([0]),
+                __file__,
+                f"{prefix}_gas_latest_equal",
+            )
+
+        @gas_test
+        def test_gas_latest_transform(self, oracle_5_observations):
+            """
+            Gas latest transform
+            """
+            prefix, oracle = oracle_5_observations
+            oracle.advanceTime(5, from_=default_chain.accounts[0])
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve([0]),
+                __file__,
+                f"{prefix}_gas_latest_transform",
+            )
+
+        @gas_test
+        def test_gas_oldest(self, oracle_5_observations):
+            """
+            Gas oldest
+            """
+            prefix, oracle = oracle_5_observations
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve([14]),
+                __file__,
+                f"{prefix}_gas_oldest",
+            )
+
+        @gas_test
+        def test_gas_between_oldest_and_oldest_plus_1(self, oracle_5_observations):
+            """
+            Gas between oldest and oldest + 1
+            """
+            prefix, oracle = oracle_5_observations
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve([13]),
+                __file__,
+                f"{prefix}_gas_between_oldest_and_oldest_plus_1",
+            )
+
+        @gas_test
+        def test_gas_middle(self, oracle_5_observations):
+            """
+            Gas middle
+            """
+            prefix, oracle = oracle_5_observations
+            match_gas_snapshot(
+                oracle.getGasCostOfObserve([5]),
+                __file__,
+                f"{prefix}_gas_middle",
+            )
@@ -3,12 +3,20 @@ from pytypes.contracts.interfaces.IERC20Minimal import IERC20Minimal
 from pytypes.contracts.interfaces.pool.IUniswapV3PoolEvents import \
     IUniswapV3PoolEvents
 from pytypes.contracts.libraries.Oracle import Oracle
+from pytypes.contracts.test.MockTimeUniswapV3Pool import MockTimeUniswapV3Pool
+from pytypes.contracts.test.MockTimeUniswapV3PoolDeployer import \
+    MockTimeUniswapV3PoolDeployer
 from pytypes.contracts.test.TestERC20 import TestERC20
 from pytypes.contracts.test.TestUniswapV3Callee import TestUniswapV3Callee
 from pytypes.contracts.UniswapV3Factory import UniswapV3Factory
 from wake.testing import *
 
 import wake_tests.utils as utils
+from drivers.approvals import approval_cache
+from drivers.batch_setup import BATCH_SETUP_ENABLED
+from wake_tests.batch_setup import batch_setup
+from wake_tests.state_image import (STATE_IMAGE_ENABLED, load_state_image,
+                                    state_image_supported)
 from wake_tests.utils import (MAX_SQRT_RATIO, MAX_UINT_128, MIN_SQRT_RATIO,
                               TEST_POOL_START_TIME)
 
@@ -19,12 +27,15 @@ def chain():
         yield default_chain
 
 
-@pytest.fixture(scope="function")
-def tokens():
-    default_chain.set_default_accounts(default_chain.accounts[0])
-    token0 = TestERC20.deploy(2**255, from_=default_chain.accounts[0])
-    token1 = TestERC20.deploy(2**255, from_=default_chain.accounts[0])
-    token2 = TestERC20.deploy(2**255, from_=default_chain.accounts[0])
+def deploy_tokens():
+    deployer = utils.get_deployer()
+    token0 = TestERC20.deploy(2**255, from_=deployer)
+    token1 = TestERC20.deploy(2**255, from_=deployer)
+    token2 = TestERC20.deploy(2**255, from_=deployer)
+    if utils.DETERMINISTIC_ADDRESSES:
+        # the tests expect the whole supply in the first test account
+        for token in (token0, token1, token2):
+            token.transfer(default_chain.accounts[0], 2**255, from_=deployer)
 
     token0, token1, token2 = sorted(
         [token0, token1, token2], key=lambda token: token.address
@@ -32,27 +43,150 @@ def tokens():
     return token0, token1, token2
 
 
+def deploy_factory():
+    deployer = utils.get_deployer()
+    factory = UniswapV3Factory.deploy(from_=deployer)
+    if utils.DETERMINISTIC_ADDRESSES:
+        factory.setOwner(default_chain.accounts[0], from_=deployer)
+    return factory
+
+
+def deploy_pool(token0, token1, factory):
+    deployer = utils.get_deployer()
+    pool = utils.create_pool(
+        utils.FeeAmount.MEDIUM,
+        utils.TickSpacings.MEDIUM,
+        token0,
+        token1,
+        factory,
+        deployer,
+    )
+    return pool, TestUniswapV3Callee.deploy(from_=deployer)
+
+
+def deploy_fixture_contracts():
+    token0, token1, token2 = deploy_tokens()
+    factory = deploy_factory()
+    pool, swap_target = deploy_pool(token0, token1, factory)
+    return {
+        "token0": token0,
+        "token1": token1,
+        "token2": token2,
+        "factory": factory,
+        "pool": pool,
+        "swap_target": swap_target,
+    }
+
+
 @pytest.fixture(scope="function")
-def factory():
+def state_image():
+    """
+    Addresses of the fixture contracts if the chain is booted from the state image,
+    None if the fixtures deploy them
+    """
+    if not STATE_IMAGE_ENABLED or not state_image_supported():
+        return None
     default_chain.set_default_accounts(default_chain.accounts[0])
-    return UniswapV3Factory.deploy(from_=default_chain.accounts[0])
+    return load_state_image(
+        deploy_fixture_contracts,
+        [
+            TestERC20,
+            UniswapV3Factory,
+            MockTimeUniswapV3PoolDeployer,
+            TestUniswapV3Callee,
+        ],
+    )
 
 
 @pytest.fixture(scope="function")
-def pool_fixture(tokens, factory):
+def fixture_contracts(state_image):
+    """
+    Addresses of the fixture contracts if the chain is booted from the state image or
+    they are deployed in a single block in batch setup mode, None if the fixtures
+    deploy them one by one
+    """
+    if state_image is not None:
+        return state_image
+    # the fixed deployer of DETERMINISTIC_ADDRESSES is not unlocked in the node
+    if not BATCH_SETUP_ENABLED or utils.DETERMINISTIC_ADDRESSES:
+        return None
     default_chain.set_default_accounts(default_chain.accounts[0])
-    token0, token1, token2 = tokens
-    factory = factory
-    pool = utils.create_pool(
-        utils.FeeAmount.MEDIUM, utils.TickSpacings.MEDIUM, token0, token1, factory
+    return batch_setup.deploy_fixture_contracts(
+        str(default_chain.accounts[0].address),
+        {
+            "TestERC20": TestERC20,
+            "UniswapV3Factory": UniswapV3Factory,
+            "MockTimeUniswapV3PoolDeployer": MockTimeUniswapV3PoolDeployer,
+            "MockTimeUniswapV3Pool": MockTimeUniswapV3Pool,
+            "TestUniswapV3Callee": TestUniswapV3Callee,
+        },
+        utils.FeeAmount.MEDIUM,
+        utils.TickSpacings.MEDIUM,
+    )
+
+
+def initialize_pool(pool_helper, sqrt_price_x96, liquidity):
+    """
+    Initializes the pool and mints full range liquidity of the first test account,
+    in a single block in batch setup mode
+    """
+    wallet = default_chain.accounts[0]
+    if not BATCH_SETUP_ENABLED:
+        pool_helper.pool.initialize(sqrt_price_x96, from_=wallet)
+        pool_helper.mint(wallet, pool_helper.min_tick, pool_helper.max_tick, liquidity)
+        return
+    batch_setup.initialize_pool(
+        str(wallet.address),
+        str(pool_helper.pool.address),
+        str(pool_helper.token0.address),
+        str(pool_helper.token1.address),
+        str(pool_helper.swap_target.address),
+        sqrt_price_x96,
+        pool_helper.min_tick,
+        pool_helper.max_tick,
+        liquidity,
     )
+    for token in (pool_helper.token0, pool_helper.token1):
+        approval_cache.grant(
+            token.address, pool_helper.swap_target.address, wallet.address
+        )
+
+
+@pytest.fixture(scope="function")
+def tokens(fixture_contracts):
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    if fixture_contracts is not None:
+        return tuple(
+            TestERC20(fixture_contracts[name])
+            for name in ("token0", "token1", "token2")
+        )
+    return deploy_tokens()
+
+
+@pytest.fixture(scope="function")
+def factory(fixture_contracts):
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    if fixture_contracts is not None:
+        return UniswapV3Factory(fixture_contracts["factory"])
+    return deploy_factory()
+
+
+@pytest.fixture(scope="function")
+def pool_fixture(fixture_contracts, tokens, factory):
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    token0, token1, token2 = tokens
+    if fixture_contracts is not None:
+        pool = MockTimeUniswapV3Pool(fixture_contracts["pool"])
+        swap_target = TestUniswapV3Callee(fixture_contracts["swap_target"])
+    else:
+        pool, swap_target = deploy_pool(token0, token1, factory)
     pool_functions = utils.PoolHelper(
         token0,
         token1,
         factory,
         pool,
         utils.TickSpacings.MEDIUM,
-        TestUniswapV3Callee.deploy(from_=default_chain.accounts[0]),
+        swap_target,
     )
     return token0, token1, factory, pool, pool_functions
 
@@ -236,15 +370,7 @@ class TestMint:
         @pytest.fixture(scope="function")
         def initialized_pool_fixture(self, pool_fixture):
             token0, token1, factory, pool, pool_helper = pool_fixture
-            pool.initialize(
-                utils.encode_price_sqrt(1, 10), from_=default_chain.accounts[0]
-            )
-            pool_helper.mint(
-                default_chain.accounts[0],
-                pool_helper.min_tick,
-                pool_helper.max_tick,
-                3161,
-            )
+            initialize_pool(pool_helper, utils.encode_price_sqrt(1, 10), 3161)
             return token0, token1, factory, pool, pool_helper
 
         class TestFailureCases:
@@ -386,13 +512,15 @@ class TestMint:
                         pool_helper,
                     ) = initialized_pool_fixture
                     tx = pool_helper.mint(default_chain.accounts[0], -22980, 0, 10000)
-                    assert (
-                        IERC20Minimal.Transfer(
-                            from_=default_chain.accounts[0].address,
-                            to=pool.address,
-                            value=21549,
-                        )
-                        in tx.events
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        IERC20Minimal.Transfer,
+                        {
+                            "from": default_chain.accounts[0].address,
+                            "to": pool.address,
+                            "value": 21549,
+                        },
                     )
                     assert token0.balanceOf(pool.address) == 9996 + 21549
                     assert token1.balanceOf(pool.address) == 1000
@@ -433,13 +561,15 @@ class TestMint:
                     tx = pool_helper.mint(
                         default_chain.accounts[0], -22980, max_tick, 10000
                     )
-                    assert (
-                        IERC20Minimal.Transfer(
-                            from_=default_chain.accounts[0].address,
-                            to=pool.address,
-                            value=31549,
-                        )
-                        in tx.events
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        IERC20Minimal.Transfer,
+                        {
+                            "from": default_chain.accounts[0].address,
+                            "to": pool.address,
+                            "value": 31549,
+                        },
                     )
                     assert token0.balanceOf(pool.address) == 9996 + 31549
                     assert token1.balanceOf(pool.address) == 1000
@@ -643,13 +773,15 @@ class TestMint:
                         max_tick - tick_spacing,
                         100,
                     )
-                    assert (
-                        IERC20Minimal.Transfer(
-                            from_=default_chain.accounts[0].address,
-                            to=pool.address,
-                            value=317,
-                        )
-                        in tx.events
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        IERC20Minimal.Transfer,
+                        {
+                            "from": default_chain.accounts[0].address,
+                            "to": pool.address,
+                            "value": 317,
+                        },
                     )
                     assert token0.balanceOf(pool.address) == 9996 + 317
                     assert token1.balanceOf(pool.address) == 1000 + 32
@@ -718,13 +850,15 @@ class TestMint:
                     tx = pool_helper.mint(
                         default_chain.accounts[0], min_tick, max_tick, 10000
                     )
-                    assert (
-                        IERC20Minimal.Transfer(
-                            from_=default_chain.accounts[0].address,
-                            to=pool.address,
-                            value=31623,
-                        )
-                        in tx.events
+                    assert utils.event_emitted(
+                        tx,
+                        token0,
+                        IERC20Minimal.Transfer,
+                        {
+                            "from": default_chain.accounts[0].address,
+                            "to": pool.address,
+                            "value": 31623,
+                        },
                     )
                     assert token0.balanceOf(pool.address) == 9996 + 31623
                     assert token1.balanceOf(pool.address) == 1000 + 3163
@@ -817,13 +951,15 @@ class TestMint:
                     tx = pool_helper.mint(
                         default_chain.accounts[0], -46080, -23040, 10000
                     )
-                    assert (
-                        IERC20Minimal.Transfer(
-                            from_=default_chain.accounts[0].address,
-                            to=pool.address,
-                            value=2162,
-                        )
-                        in tx.events
+                    assert utils.event_emitted(
+                        tx,
+                        token1,
+                        IERC20Minimal.Transfer,
+                        {
+                            "from": default_chain.accounts[0].address,
+                            "to": pool.address,
+                            "value": 2162,
+                        },
                     )
                     assert token0.balanceOf(pool.address) == 9996
                     assert token1.balanceOf(pool.address) == 1000 + 2162
@@ -865,13 +1001,15 @@ class TestMint:
                     tx = pool_helper.mint(
                         default_chain.accounts[0], min_tick, -23040, 10000
                     )
-                    assert (
-                        IERC20Minimal.Transfer(
-                            from_=default_chain.accounts[0].address,
-                            to=pool.address,
-                            value=3161,
-                        )
-                        in tx.events
+                    assert utils.event_emitted(
+                        tx,
+                        token1,
+                        IERC20Minimal.Transfer,
+                        {
+                            "from": default_chain.accounts[0].address,
+                            "to": pool.address,
+                            "value": 3161,
+                        },
                     )
                     assert token0.balanceOf(pool.address) == 9996
                     assert token1.balanceOf(pool.address) == 1000 + 3161
@@ -1069,12 +1207,8 @@ class TestBurn:
     @pytest.fixture(scope="function")
     def initialized_pool_fixture(self, pool_fixture):
         token0, token1, factory, pool, pool_helper = pool_fixture
-        pool.initialize(utils.encode_price_sqrt(1, 1), from_=default_chain.accounts[0])
-        pool_helper.mint(
-            default_chain.accounts[0],
-            pool_helper.min_tick,
-            pool_helper.max_tick,
-            utils.expand_to_18_decimals(2),
+        initialize_pool(
+            pool_helper, utils.encode_price_sqrt(1, 1), utils.expand_to_18_decimals(2)
         )
         return token0, token1, factory, pool, pool_helper
 
@@ -1202,12 +1336,8 @@ class TestObserve:
     @pytest.fixture(scope="function")
     def initialized_pool_fixture(self, pool_fixture):
         token0, token1, factory, pool, pool_helper = pool_fixture
-        pool.initialize(utils.encode_price_sqrt(1, 1), from_=default_chain.accounts[0])
-        pool_helper.mint(
-            default_chain.accounts[0],
-            pool_helper.min_tick,
-            pool_helper.max_tick,
-            utils.expand_to_18_decimals(2),
+        initialize_pool(
+            pool_helper, utils.encode_price_sqrt(1, 1), utils.expand_to_18_decimals(2)
         )
         return token0, token1, factory, pool, pool_helper
 
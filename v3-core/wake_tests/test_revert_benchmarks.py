@@ -0,0 +1,89 @@
+import os
+
+import pytest
+from pytypes.contracts.test.TestERC20 import TestERC20
+from pytypes.contracts.test.TickMathTest import TickMathTest
+from pytypes.contracts.UniswapV3Factory import UniswapV3Factory
+from wake.testing import *
+
+import wake_tests.utils as utils
+from drivers.benchmarks import timings
+from drivers.reverts import assert_reverts
+from wake_tests.driver import send_request
+from wake_tests.utils import FeeAmount, TickSpacings
+
+# Times the revert assertions of the framework against assert_reverts, which decodes the
+# reason from a plain eth_call, REVERT_BENCHMARK_REPEATS times for a reverting
+# transaction (LOK of an uninitialized pool) and a reverting call (T of TickMath).
+# Skipped by default so that the measured suite stays the same.
+REVERT_BENCHMARK_REPEATS = int(os.environ.get("REVERT_BENCHMARK_REPEATS", "0"))
+
+MIN_TICK = -887272
+
+pytestmark = pytest.mark.skipif(
+    REVERT_BENCHMARK_REPEATS < 1,
+    reason="revert benchmarks run only with REVERT_BENCHMARK_REPEATS >= 1",
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def chain():
+    with default_chain.connect():
+        yield default_chain
+
+
+@pytest.fixture(scope="module")
+def contracts(chain):
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    token = TestERC20.deploy(2**255, from_=default_chain.accounts[0])
+    other_token = TestERC20.deploy(2**255, from_=default_chain.accounts[0])
+    factory = UniswapV3Factory.deploy(from_=default_chain.accounts[0])
+    pool = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token, other_token, factory
+    )
+    tick_math = TickMathTest.deploy(from_=default_chain.accounts[0])
+    return pool, tick_math
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolation(contracts):
+    with default_chain.snapshot_and_revert():
+        yield
+
+
+class TestRevertBenchmarks:
+    def test_transaction_revert(self, contracts):
+        pool, _ = contracts
+        sender = default_chain.accounts[0]
+        for _ in range(REVERT_BENCHMARK_REPEATS):
+            with timings.measure("operation framework revert transaction LOK"):
+                with must_revert(Error("LOK")):
+                    pool.increaseObservationCardinalityNext(2, from_=sender)
+            with timings.measure("operation fast revert transaction LOK"):
+                assert_reverts(
+                    send_request,
+                    sender.address,
+                    pool.address,
+                    "increaseObservationCardinalityNext(uint16)",
+                    ["uint16"],
+                    [2],
+                    "LOK",
+                )
+
+    def test_call_revert(self, contracts):
+        _, tick_math = contracts
+        sender = default_chain.accounts[0]
+        for _ in range(REVERT_BENCHMARK_REPEATS):
+            with timings.measure("operation framework revert call T"):
+                with must_revert(Error("T")):
+                    tick_math.getSqrtRatioAtTick(MIN_TICK - 1)
+            with timings.measure("operation fast revert call T"):
+                assert_reverts(
+                    send_request,
+                    sender.address,
+                    tick_math.address,
+                    "getSqrtRatioAtTick(int24)",
+                    ["int24"],
+                    [MIN_TICK - 1],
+                    "T",
+                )
@@ -0,0 +1,133 @@
+import pytest
+from pytypes.contracts.interfaces.IERC20Minimal import IERC20Minimal
+from pytypes.contracts.test.TestERC20 import TestERC20
+from pytypes.contracts.test.TestUniswapV3Callee import TestUniswapV3Callee
+from pytypes.contracts.test.TestUniswapV3Router import TestUniswapV3Router
+from pytypes.contracts.UniswapV3Factory import UniswapV3Factory
+from wake.testing import *
+
+import wake_tests.utils as utils
+from wake_tests.utils import FeeAmount, TickSpacings
+
+pytestmark = pytest.mark.extended
+
+
+@pytest.fixture(scope="function", autouse=True)
+def chain():
+    with default_chain.connect():
+        yield default_chain
+
+
+@pytest.fixture(scope="function")
+def router_fixture():
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    wallet = default_chain.accounts[0]
+    token0 = TestERC20.deploy(2**255, from_=wallet)
+    token1 = TestERC20.deploy(2**255, from_=wallet)
+    token2 = TestERC20.deploy(2**255, from_=wallet)
+    token0, token1, token2 = sorted(
+        [token0, token1, token2], key=lambda token: token.address
+    )
+    factory = UniswapV3Factory.deploy(from_=wallet)
+    swap_target_callee = TestUniswapV3Callee.deploy(from_=wallet)
+    swap_target_router = TestUniswapV3Router.deploy(from_=wallet)
+
+    # default to the 30 bips pool
+    pool0 = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token0, token1, factory
+    )
+    pool1 = utils.create_pool(
+        FeeAmount.MEDIUM, TickSpacings.MEDIUM, token1, token2, factory
+    )
+    pool0_helper = utils.PoolHelper(
+        token0, token1, factory, pool0, TickSpacings.MEDIUM, swap_target_callee
+    )
+    pool1_helper = utils.PoolHelper(
+        token1, token2, factory, pool1, TickSpacings.MEDIUM, swap_target_callee
+    )
+    return (
+        token0,
+        token1,
+        token2,
+        factory,
+        pool0,
+        pool1,
+        pool0_helper,
+        pool1_helper,
+        swap_target_router,
+    )
+
+
+class TestRouter:
+    def test_constructor_initializes_immutables(self, router_fixture):
+        """
+        constructor initializes immutables
+        """
+        token0, token1, token2, factory, pool0, pool1 = router_fixture[:6]
+        assert pool0.factory() == factory.address
+        assert pool0.token0() == token0.address
+        assert pool0.token1() == token1.address
+        assert pool1.factory() == factory.address
+        assert pool1.token0() == token1.address
+        assert pool1.token1() == token2.address
+
+
+class TestMultiSwaps:
+    def test_multi_swap(self, router_fixture):
+        """
+        multi-swap
+        """
+        (
+            token0,
+            token1,
+            token2,
+            factory,
+            pool0,
+            pool1,
+            pool0_helper,
+            pool1_helper,
+            swap_target_router,
+        ) = router_fixture
+        wallet = default_chain.accounts[0]
+        input_token = token0
+        output_token = token2
+
+        # initialize both pools
+        pool0.initialize(utils.encode_price_sqrt(1, 1), from_=wallet)
+        pool1.initialize(utils.encode_price_sqrt(1, 1), from_=wallet)
+        pool0_helper.mint(
+            wallet,
+            pool0_helper.min_tick,
+            pool0_helper.max_tick,
+            utils.expand_to_18_decimals(1),
+        )
+        pool1_helper.mint(
+            wallet,
+            pool1_helper.min_tick,
+            pool1_helper.max_tick,
+            utils.expand_to_18_decimals(1),
+        )
+
+        for_exact_0 = output_token.address == pool1.token0()
+        multi_pool_helper = utils.MultiPoolHelper(
+            input_token, swap_target_router, pool0, pool1
+        )
+        method = (
+            multi_pool_helper.swap_for_exact_0_multi
+            if for_exact_0
+            else multi_pool_helper.swap_for_exact_1_multi
+        )
+
+        tx = method(100, wallet)
+        assert (
+            IERC20Minimal.Transfer(from_=pool1.address, to=wallet.address, value=100)
+            in tx.events
+        )
+        assert (
+            IERC20Minimal.Transfer(from_=pool0.address, to=pool1.address, value=102)
+            in tx.events
+        )
+        assert (
+            IERC20Minimal.Transfer(from_=wallet.address, to=pool0.address, value=104)
+            in tx.events
+        )
@@ -0,0 +1,274 @@
+import pytest
+from pytypes.contracts.test.SqrtPriceMathTest import SqrtPriceMathTest
+from pytypes.contracts.test.SwapMathTest import SwapMathTest
+from wake.testing import *
+
+import wake_tests.utils as utils
+from drivers.gas import GAS_REPORT_ENABLED
+from wake_tests.snapshots import match_gas_snapshot
+
+pytestmark = pytest.mark.extended
+
+gas_test = pytest.mark.skipif(
+    not GAS_REPORT_ENABLED, reason="gas snapshots are checked only with GAS_REPORT=1"
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def chain():
+    with default_chain.connect():
+        yield default_chain
+
+
+@pytest.fixture(scope="module")
+def swap_math():
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    return SwapMathTest.deploy(from_=default_chain.accounts[0])
+
+
+@pytest.fixture(scope="module")
+def sqrt_price_math():
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    return SqrtPriceMathTest.deploy(from_=default_chain.accounts[0])
+
+
+class TestComputeSwapStep:
+    def test_exact_amount_in_capped_at_price_target_one_for_zero(
+        self, swap_math, sqrt_price_math
+    ):
+        """
+        exact amount in that gets capped at price target in one for zero
+        """
+        price = utils.encode_price_sqrt(1, 1)
+        price_target = utils.encode_price_sqrt(101, 100)
+        liquidity = utils.expand_to_18_decimals(2)
+        amount = utils.expand_to_18_decimals(1)
+        fee = 600
+        zero_for_one = False
+
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            price, price_target, liquidity, amount, fee
+        )
+
+        assert amount_in == 9975124224178055
+        assert fee_amount == 5988667735148
+        assert amount_out == 9925619580021728
+        # entire amount is not used
+        assert amount_in + fee_amount < amount
+
+        price_after_whole_input_amount = sqrt_price_math.getNextSqrtPriceFromInput(
+            price, liquidity, amount, zero_for_one
+        )
+
+        # price is capped at price target
+        assert sqrt_q == price_target
+        # price is less than price after whole input amount
+        assert sqrt_q < price_after_whole_input_amount
+
+    def test_exact_amount_out_capped_at_price_target_one_for_zero(
+        self, swap_math, sqrt_price_math
+    ):
+        """
+        exact amount out that gets capped at price target in one for zero
+        """
+        price = utils.encode_price_sqrt(1, 1)
+        price_target = utils.encode_price_sqrt(101, 100)
+        liquidity = utils.expand_to_18_decimals(2)
+        amount = -utils.expand_to_18_decimals(1)
+        fee = 600
+        zero_for_one = False
+
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            price, price_target, liquidity, amount, fee
+        )
+
+        assert amount_in == 9975124224178055
+        assert fee_amount == 5988667735148
+        assert amount_out == 9925619580021728
+        # entire amount out is not returned
+        assert amount_out < -amount
+
+        price_after_whole_output_amount = sqrt_price_math.getNextSqrtPriceFromOutput(
+            price, liquidity, -amount, zero_for_one
+        )
+
+        # price is capped at price target
+        assert sqrt_q == price_target
+        # price is less than price after whole output amount
+        assert sqrt_q < price_after_whole_output_amount
+
+    def test_exact_amount_in_fully_spent_one_for_zero(self, swap_math, sqrt_price_math):
+        """
+        exact amount in that is fully spent in one for zero
+        """
+        price = utils.encode_price_sqrt(1, 1)
+        price_target = utils.encode_price_sqrt(1000, 100)
+        liquidity = utils.expand_to_18_decimals(2)
+        amount = utils.expand_to_18_decimals(1)
+        fee = 600
+        zero_for_one = False
+
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            price, price_target, liquidity, amount, fee
+        )
+
+        assert amount_in == 999400000000000000
+        assert fee_amount == 600000000000000
+        assert amount_out == 666399946655997866
+        # entire amount is used
+        assert amount_in + fee_amount == amount
+
+        price_after_whole_input_amount_less_fee = (
+            sqrt_price_math.getNextSqrtPriceFromInput(
+                price, liquidity, amount - fee_amount, zero_for_one
+            )
+        )
+
+        # price does not reach price target
+        assert sqrt_q < price_target
+        # price is equal to price after whole input amount
+        assert sqrt_q == price_after_whole_input_amount_less_fee
+
+    def test_exact_amount_out_fully_received_one_for_zero(
+        self, swap_math, sqrt_price_math
+    ):
+        """
+        exact amount out that is fully received in one for zero
+        """
+        price = utils.encode_price_sqrt(1, 1)
+        price_target = utils.encode_price_sqrt(10000, 100)
+        liquidity = utils.expand_to_18_decimals(2)
+        amount = -utils.expand_to_18_decimals(1)
+        fee = 600
+        zero_for_one = False
+
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            price, price_target, liquidity, amount, fee
+        )
+
+        assert amount_in == 2000000000000000000
+        assert fee_amount == 1200720432259356
+        assert amount_out == -amount
+
+        price_after_whole_output_amount = sqrt_price_math.getNextSqrtPriceFromOutput(
+            price, liquidity, -amount, zero_for_one
+        )
+
+        # price does not reach price target
+        assert sqrt_q < price_target
+        # price is less than price after whole output amount
+        assert sqrt_q == price_after_whole_output_amount
+
+    def test_amount_out_capped_at_desired_amount_out(self, swap_math):
+        """
+        amount out is capped at the desired amount out
+        """
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            417332158212080721273783715441582,
+            1452870262520218020823638996,
+            159344665391607089467575320103,
+            -1,
+            1,
+        )
+        assert amount_in == 1
+        assert fee_amount == 1
+        # would be 2 if not capped
+        assert amount_out == 1
+        assert sqrt_q == 417332158212080721273783715441581
+
+    def test_target_price_of_1_uses_partial_input_amount(self, swap_math):
+        """
+        target price of 1 uses partial input amount
+        """
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            2, 1, 1, 3915081100057732413702495386755767, 1
+        )
+        assert amount_in == 39614081257132168796771975168
+        assert fee_amount == 39614120871253040049813
+        assert amount_in + fee_amount <= 3915081100057732413702495386755767
+        assert amount_out == 0
+        assert sqrt_q == 1
+
+    def test_entire_input_amount_taken_as_fee(self, swap_math):
+        """
+        entire input amount taken as fee
+        """
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            2413, 79887613182836312, 1985041575832132834610021537970, 10, 1872
+        )
+        assert amount_in == 0
+        assert fee_amount == 10
+        assert amount_out == 0
+        assert sqrt_q == 2413
+
+    def test_intermediate_insufficient_liquidity_zero_for_one_exact_output(
+        self, swap_math
+    ):
+        """
+        handles intermediate insufficient liquidity in zero for one exact output case
+        """
+        sqrt_p = 20282409603651670423947251286016
+        sqrt_p_target = sqrt_p * 11 // 10
+        liquidity = 1024
+        # virtual reserves of one are only 4
+        amount_remaining = -4
+        fee_pips = 3000
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            sqrt_p, sqrt_p_target, liquidity, amount_remaining, fee_pips
+        )
+        assert amount_out == 0
+        assert sqrt_q == sqrt_p_target
+        assert amount_in == 26215
+        assert fee_amount == 79
+
+    def test_intermediate_insufficient_liquidity_one_for_zero_exact_output(
+        self, swap_math
+    ):
+        """
+        handles intermediate insufficient liquidity in one for zero exact output case
+        """
+        sqrt_p = 20282409603651670423947251286016
+        sqrt_p_target = sqrt_p * 9 // 10
+        liquidity = 1024
+        # virtual reserves of zero are only 262144
+        amount_remaining = -263000
+        fee_pips = 3000
+        sqrt_q, amount_in, amount_out, fee_amount = swap_math.computeSwapStep(
+            sqrt_p, sqrt_p_target, liquidity, amount_remaining, fee_pips
+        )
+        assert amount_out == 26214
+        assert sqrt_q == sqrt_p_target
+        assert amount_in == 1
+        assert fee_amount == 1
+
+
+class TestComputeSwapStepGas:
+    @gas_test
+    @pytest.mark.parametrize(
+        "name,price_target,amount",
+        [
+            ("one_for_zero_exact_in_capped", (101, 100), 10**18),
+            ("zero_for_one_exact_in_capped", (99, 100), 10**18),
+            ("one_for_zero_exact_out_capped", (101, 100), -(10**18)),
+            ("zero_for_one_exact_out_capped", (99, 100), -(10**18)),
+            ("one_for_zero_exact_in_partial", (1010, 100), 1000),
+            ("zero_for_one_exact_in_partial", (99, 1000), 1000),
+            ("one_for_zero_exact_out_partial", (1010, 100), 1000),
+            ("zero_for_one_exact_out_partial", (99, 1000), 1000),
+        ],
+    )
+    def test_gas(self, swap_math, name, price_target, amount):
+        """
+        gas
+        """
+        match_gas_snapshot(
+            swap_math.getGasCostOfComputeSwapStep(
+                utils.encode_price_sqrt(1, 1),
+                utils.encode_price_sqrt(*price_target),
+                utils.expand_to_18_decimals(2),
+                amount,
+                600,
+            ),
+            __file__,
+            f"compute_swap_step_gas_swap_{name}",
+        )
@@ -0,0 +1,199 @@
+import itertools
+import os
+
+import pytest
+from pytypes.contracts.test.SwapMathTest import SwapMathTest
+from wake.testing import *
+
+import wake_tests.utils as utils
+from drivers.benchmarks import timings
+
+# Sweeps computeSwapStep over the grid below in batches of SWAP_MATH_SWEEP_BATCH_SIZE
+# calls, the whole sweep is repeated SWAP_MATH_SWEEP_SCALE times.
+# Skipped by default so that the measured suite stays the same.
+SWAP_MATH_SWEEP_SCALE = int(os.environ.get("SWAP_MATH_SWEEP_SCALE", "0"))
+SWAP_MATH_SWEEP_BATCH_SIZE = int(os.environ.get("SWAP_MATH_SWEEP_BATCH_SIZE", "100"))
+
+pytestmark = pytest.mark.skipif(
+    SWAP_MATH_SWEEP_SCALE < 1,
+    reason="swap math sweep runs only with SWAP_MATH_SWEEP_SCALE >= 1",
+)
+
+# (reserve1, reserve0) of the current price
+PRICES = [(1, 1), (1, 100), (100, 1), (1, 10**6), (10**6, 1)]
+# target sqrt price relative to the current one
+PRICE_TARGETS = [(99, 100), (101, 100), (1, 10), (10, 1)]
+LIQUIDITIES = [
+    1024,
+    utils.expand_to_18_decimals(2),
+    utils.expand_to_18_decimals(10**6),
+]
+# positive amounts are exact in, negative exact out
+AMOUNTS = [
+    1000,
+    -1000,
+    utils.expand_to_18_decimals(1),
+    -utils.expand_to_18_decimals(1),
+    utils.expand_to_18_decimals(10**6),
+    -utils.expand_to_18_decimals(10**6),
+]
+FEES = [0, utils.FeeAmount.LOW, utils.FeeAmount.MEDIUM, utils.FeeAmount.HIGH]
+
+
+def swap_step_grid():
+    """
+    Returns computeSwapStep arguments for every point of the grid. None of them reverts.
+    """
+    grid = []
+    for price, price_target, liquidity, amount, fee in itertools.product(
+        PRICES, PRICE_TARGETS, LIQUIDITIES, AMOUNTS, FEES
+    ):
+        sqrt_p = utils.encode_price_sqrt(*price)
+        sqrt_p_target = sqrt_p * price_target[0] // price_target[1]
+        grid.append((sqrt_p, sqrt_p_target, liquidity, amount, int(fee)))
+    return grid
+
+
+GRID = swap_step_grid()
+BATCHES = [
+    GRID[i : i + SWAP_MATH_SWEEP_BATCH_SIZE]
+    for i in range(0, len(GRID), SWAP_MATH_SWEEP_BATCH_SIZE)
+]
+
+Q96 = 2**96
+
+
+def mul_div_rounding_up(a, b, denominator):
+    return -(-a * b // denominator)
+
+
+def div_rounding_up(a, b):
+    return -(-a // b)
+
+
+def get_amount0_delta(sqrt_ratio_a, sqrt_ratio_b, liquidity, round_up):
+    sqrt_ratio_a, sqrt_ratio_b = sorted((sqrt_ratio_a, sqrt_ratio_b))
+    numerator1 = liquidity * Q96
+    numerator2 = sqrt_ratio_b - sqrt_ratio_a
+    if round_up:
+        return div_rounding_up(
+            mul_div_rounding_up(numerator1, numerator2, sqrt_ratio_b), sqrt_ratio_a
+        )
+    return numerator1 * numerator2 // sqrt_ratio_b // sqrt_ratio_a
+
+
+def get_amount1_delta(sqrt_ratio_a, sqrt_ratio_b, liquidity, round_up):
+    sqrt_ratio_a, sqrt_ratio_b = sorted((sqrt_ratio_a, sqrt_ratio_b))
+    if round_up:
+        return mul_div_rounding_up(liquidity, sqrt_ratio_b - sqrt_ratio_a, Q96)
+    return liquidity * (sqrt_ratio_b - sqrt_ratio_a) // Q96
+
+
+def get_next_sqrt_price_from_amount0_rounding_up(sqrt_p, liquidity, amount, add):
+    if amount == 0:
+        return sqrt_p
+    numerator1 = liquidity * Q96
+    product = amount * sqrt_p
+    if add:
+        if numerator1 + product <= utils.MAX_UINT_256:
+            return mul_div_rounding_up(numerator1, sqrt_p, numerator1 + product)
+        return div_rounding_up(numerator1, numerator1 // sqrt_p + amount)
+    return mul_div_rounding_up(numerator1, sqrt_p, numerator1 - product)
+
+
+def get_next_sqrt_price_from_amount1_rounding_down(sqrt_p, liquidity, amount, add):
+    if add:
+        return sqrt_p + (amount * Q96) // liquidity
+    return sqrt_p - div_rounding_up(amount * Q96, liquidity)
+
+
+def compute_swap_step(sqrt_p, sqrt_p_target, liquidity, amount_remaining, fee_pips):
+    """
+    Python reference of SwapMath.computeSwapStep, returns
+    (sqrtQ, amountIn, amountOut, feeAmount). Assumes the step does not revert.
+    """
+    zero_for_one = sqrt_p >= sqrt_p_target
+    exact_in = amount_remaining >= 0
+    amount_in = amount_out = 0
+
+    if exact_in:
+        amount_remaining_less_fee = amount_remaining * (10**6 - fee_pips) // 10**6
+        if zero_for_one:
+            amount_in = get_amount0_delta(sqrt_p_target, sqrt_p, liquidity, True)
+        else:
+            amount_in = get_amount1_delta(sqrt_p, sqrt_p_target, liquidity, True)
+        if amount_remaining_less_fee >= amount_in:
+            sqrt_q = sqrt_p_target
+        elif zero_for_one:
+            sqrt_q = get_next_sqrt_price_from_amount0_rounding_up(
+                sqrt_p, liquidity, amount_remaining_less_fee, True
+            )
+        else:
+            sqrt_q = get_next_sqrt_price_from_amount1_rounding_down(
+                sqrt_p, liquidity, amount_remaining_less_fee, True
+            )
+    else:
+        if zero_for_one:
+            amount_out = get_amount1_delta(sqrt_p_target, sqrt_p, liquidity, False)
+        else:
+            amount_out = get_amount0_delta(sqrt_p, sqrt_p_target, liquidity, False)
+        if -amount_remaining >= amount_out:
+            sqrt_q = sqrt_p_target
+        elif zero_for_one:
+            sqrt_q = get_next_sqrt_price_from_amount1_rounding_down(
+                sqrt_p, liquidity, -amount_remaining, False
+            )
+        else:
+            sqrt_q = get_next_sqrt_price_from_amount0_rounding_up(
+                sqrt_p, liquidity, -amount_remaining, False
+            )
+
+    reached_target = sqrt_p_target == sqrt_q
+    if not (reached_target and exact_in):
+        if zero_for_one:
+            amount_in = get_amount0_delta(sqrt_q, sqrt_p, liquidity, True)
+        else:
+            amount_in = get_amount1_delta(sqrt_p, sqrt_q, liquidity, True)
+    if not (reached_target and not exact_in):
+        if zero_for_one:
+            amount_out = get_amount1_delta(sqrt_q, sqrt_p, liquidity, False)
+        else:
+            amount_out = get_amount0_delta(sqrt_p, sqrt_q, liquidity, False)
+
+    # cap the output amount to not exceed the remaining output amount
+    if not exact_in:
+        amount_out = min(amount_out, -amount_remaining)
+
+    if exact_in and sqrt_q != sqrt_p_target:
+        fee_amount = amount_remaining - amount_in
+    else:
+        fee_amount = mul_div_rounding_up(amount_in, fee_pips, 10**6 - fee_pips)
+    return sqrt_q, amount_in, amount_out, fee_amount
+
+
+@pytest.fixture(scope="module", autouse=True)
+def chain():
+    with default_chain.connect():
+        yield default_chain
+
+
+@pytest.fixture(scope="module")
+def swap_math():
+    default_chain.set_default_accounts(default_chain.accounts[0])
+    return SwapMathTest.deploy(from_=default_chain.accounts[0])
+
+
+class TestComputeSwapStepSweep:
+    @pytest.mark.parametrize("iteration", range(SWAP_MATH_SWEEP_SCALE))
+    @pytest.mark.parametrize("batch", range(len(BATCHES)))
+    def test_compute_swap_step_matches_model(self, swap_math, batch, iteration):
+        """
+        computeSwapStep matches the reference model for a batch of grid points
+        """
+        results = []
+        with timings.measure(f"computeSwapStep batch {SWAP_MATH_SWEEP_BATCH_SIZE}"):
+            for args in BATCHES[batch]:
+                with timings.measure("computeSwapStep"):
+                    results.append(tuple(swap_math.computeSwapStep(*args)))
+        for args, result in zip(BATCHES[batch], results):
+            assert result == compute_swap_step(*args), args
@@ -0,0 +1,27 @@
+import pytest
+from web3 import Web3
+
+from drivers.node import NODE_COMMANDS, launch_node
+from drivers.web3_driver import Web3Driver
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--network",
+        default="anvil",
+        choices=sorted(NODE_COMMANDS),
+        help="development chain to launch",
+    )
+
+
+@pytest.fixture(scope="session")
+def driver(request):
+    with launch_node(request.config.getoption("--network")) as uri:
+        yield Web3Driver(Web3(Web3.HTTPProvider(uri)))
+
+
+@pytest.fixture(scope="function", autouse=True)
+def isolation(driver):
+    snapshot = driver.w3.provider.make_request("evm_snapshot", [])["result"]
+    yield
+    driver.w3.provider.make_request("evm_revert", [snapshot])
@@ -0,0 +1,8 @@
+import pytest
+
+from drivers.scenarios import SCENARIOS
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+def test_scenario(name, driver):
+    SCENARIOS[name](driver)